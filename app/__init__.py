@@ -1,7 +1,10 @@
 
 # app/__init__.py
+import os
 from flask import Flask ,send_from_directory ,current_app
 from .extensions import db, migrate, jwt, cors
+from .json_provider import AppJSONProvider
+from . import cache, compression, jobs, live, replica, scheduler, snapshots, sqlite
 from config import Config,BASE_UPLOAD_FOLDER
 from app.routes.upload import gallery_bp
 from app.routes.events import events_bp
@@ -13,6 +16,9 @@ from . import models
 def create_app(config_class=Config):
     app = Flask(__name__, static_folder=None)
     app.config.from_object(config_class)
+    app.json = AppJSONProvider(app)
+    for folder in ("BASE_UPLOAD_FOLDER", "PROGRAMS_UPLOAD_FOLDER", "CHILDREN_UPLOAD_FOLDER"):
+        os.makedirs(app.config[folder], exist_ok=True)
     
 
     @app.route("/uploads/<path:filename>")
@@ -28,8 +34,16 @@ def create_app(config_class=Config):
 
     # initialize extensions
     db.init_app(app)
+    sqlite.init_app(app)
+    replica.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    compression.init_app(app)
+    cache.init_app(app)
+    snapshots.init_app(app)
+    live.init_app(app)
+    jobs.init_app(app)
+    scheduler.init_app(app)
 
 
 
@@ -72,11 +86,17 @@ def create_app(config_class=Config):
     from app.routes.classes import classes_bp  
     from app.routes.timetable import timetable_bp  
     from app.routes.reports import reports_bp
-    from app.routes.homepage import media_bp 
+    from app.routes.homepage import media_bp, homepage_bp
     from app.routes.visitors import visitors_bp  
     from app.routes.members import members_bp 
     from app.routes.children import children_bp
     from app.routes.programs import programs_bp
+    from app.routes.search import search_bp
+    from app.routes.dashboard import dashboard_bp
+    from app.routes.batch import batch_bp
+    from app.routes.sync import sync_bp
+    from app.routes.live import live_bp
+    from app.routes.jobs import jobs_bp
     
     from .routes.auth import auth_bp
     app.register_blueprint(auth_bp,url_prefix="/api/auth")
@@ -87,6 +107,7 @@ def create_app(config_class=Config):
     app.register_blueprint(homechurch_bp,url_prefix="/api/homechurches")
     app.register_blueprint(visitors_bp,url_prefix="/api/visitors")
     app.register_blueprint(media_bp) 
+    app.register_blueprint(homepage_bp)
     app.register_blueprint(timetable_bp,url_prefix="/api/timetable")
     app.register_blueprint(classes_bp,url_prefix="/api/classes")
     app.register_blueprint(children_bp,url_prefix="/api/children")
@@ -94,8 +115,17 @@ def create_app(config_class=Config):
     app.register_blueprint(programs_bp,url_prefix="/api/programs")
     app.register_blueprint(department_members_bp)
     app.register_blueprint(events_bp, url_prefix="/api")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
+    app.register_blueprint(batch_bp, url_prefix="/api/batch")
+    app.register_blueprint(sync_bp, url_prefix="/api/sync")
+    app.register_blueprint(live_bp, url_prefix="/api/live")
+    app.register_blueprint(jobs_bp, url_prefix="/api/jobs")
 
 
+    from .commands import register_commands
+    register_commands(app)
+
     print("✅ Registered Blueprints:", app.blueprints.keys())
     
 
@@ -0,0 +1,176 @@
+# app/autocomplete.py
+"""
+Per-worker prefix index of child names for the attendance check-in screen.
+
+Names are normalized (case-folded, accents stripped) and every word of a name
+is a key, so "wanj" finds "Mary Wanjiru". Keys live in sorted lists (one per
+class plus one for everybody) and lookups are a bisect plus a short walk.
+
+The index refreshes itself from the `children` change counter (app/changes.py):
+only rows logged since the last refresh are re-read, unless a 'bulk' marker, a
+pruned log or a very long backlog makes a full reload cheaper. The position
+kept is the settled counter, so rows of the last CHANGE_LOG_SETTLE_SECONDS are
+re-read on every refresh and a late-committing id is not stepped over.
+
+A PrefixIndex is never changed once published: a refresh builds a new one (a
+reload from scratch, a patch from copies of the lists it touches) and swaps
+the module reference in one assignment, so lookups need no lock.
+"""
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from flask import current_app
+from .extensions import db
+from .models import Child
+from . import changes
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+FULL_RELOAD_AFTER = 500  # logged changes; past this a reload beats row patches
+
+
+def normalize(value):
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    return " ".join(value.casefold().split())
+
+
+def _keys(name):
+    words = normalize(name).split()
+    # the full name and every suffix starting at a word boundary
+    return {" ".join(words[i:]) for i in range(len(words))}
+
+
+class PrefixIndex:
+    def __init__(self, children=None, lists=None):
+        self._children = children or {}   # child_id -> (name, class_id, keys)
+        self._lists = lists or {}         # class_id (None = all classes) -> sorted [(key, child_id)]
+
+    def __len__(self):
+        return len(self._children)
+
+    @classmethod
+    def build(cls, rows):
+        """A new index of (child_id, name, class_id) rows: append everything, sort each list once."""
+        children, lists = {}, {}
+        for child_id, name, class_id in rows:
+            keys = _keys(name)
+            children[child_id] = (name, class_id, keys)
+            for scope in {None, class_id}:
+                lists.setdefault(scope, []).extend((key, child_id) for key in keys)
+        for entries in lists.values():
+            entries.sort()
+        return cls(children, lists)
+
+    def patched(self, rows, removed=()):
+        """
+        A new index with (child_id, name, class_id) rows upserted and the
+        `removed` ids dropped; only the lists they touch are copied. Returns
+        self when nothing differs.
+        """
+        rows = [r for r in rows if self._children.get(r[0], (None, None))[:2] != tuple(r[1:])]
+        removed = [child_id for child_id in removed if child_id in self._children]
+        if not rows and not removed:
+            return self
+        children, lists = dict(self._children), dict(self._lists)
+        copied = set()
+
+        def entries(scope):
+            if scope not in copied:
+                lists[scope] = list(lists.get(scope, []))
+                copied.add(scope)
+            return lists[scope]
+
+        for child_id in [r[0] for r in rows] + removed:
+            current = children.pop(child_id, None)
+            if current is None:
+                continue
+            _, class_id, keys = current
+            for scope in {None, class_id}:
+                listed = entries(scope)
+                for key in keys:
+                    pos = bisect_left(listed, (key, child_id))
+                    if pos < len(listed) and listed[pos] == (key, child_id):
+                        del listed[pos]
+        for child_id, name, class_id in rows:
+            keys = _keys(name)
+            children[child_id] = (name, class_id, keys)
+            for scope in {None, class_id}:
+                listed = entries(scope)
+                for key in keys:
+                    insort(listed, (key, child_id))
+        return PrefixIndex(children, lists)
+
+    def lookup(self, prefix, class_id=None, limit=DEFAULT_LIMIT):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        entries = self._lists.get(class_id, [])
+        seen, hits = set(), []
+        pos = bisect_left(entries, (prefix,))
+        while pos < len(entries) and len(hits) < limit:
+            key, child_id = entries[pos]
+            if not key.startswith(prefix):
+                break
+            if child_id not in seen:
+                seen.add(child_id)
+                name, cls, _ = self._children[child_id]
+                hits.append({"id": child_id, "name": name, "class_id": cls})
+            pos += 1
+        return hits
+
+
+_index = PrefixIndex()
+_lock = threading.Lock()  # one refresh at a time; lookups never take it
+_state = {"seq": None, "checked_at": 0.0}
+
+
+def _reload():
+    global _index
+    _index = PrefixIndex.build(db.session.query(Child.id, Child.name, Child.class_id))
+
+
+def _apply(logged):
+    global _index
+    ids = {row_id for _, row_id, _ in logged if row_id is not None}
+    if not ids:
+        return
+    rows = db.session.query(Child.id, Child.name, Child.class_id).filter(Child.id.in_(ids)).all()
+    _index = _index.patched([tuple(r) for r in rows], removed=ids - {r.id for r in rows})
+
+
+def refresh(force=False):
+    """Bring the index up to date with the `children` change counter."""
+    interval = current_app.config.get("AUTOCOMPLETE_REFRESH_SECONDS", 1.0)
+    now = time.monotonic()
+    if not force and _state["seq"] is not None and now - _state["checked_at"] < interval:
+        return
+    with _lock:
+        oldest, settled, newest = changes.bounds("children")
+        seq = _state["seq"]
+        if seq is None or force or seq > newest or seq + 1 < oldest:
+            _reload()
+        elif newest > seq:
+            logged = changes.since("children", seq)
+            if len(logged) > FULL_RELOAD_AFTER or any(op == "bulk" for _, _, op in logged):
+                _reload()
+            else:
+                _apply(logged)
+        _state["seq"] = settled
+        _state["checked_at"] = now
+
+
+def lookup(prefix, class_id=None, limit=DEFAULT_LIMIT):
+    refresh()
+    return _index.lookup(prefix, class_id=class_id, limit=max(1, min(limit, MAX_LIMIT)))
+
+
+@changes.on_commit
+def _expire_after_local_write(tables):
+    # writes made by this worker show up on the very next keystroke
+    if "children" in tables:
+        _state["checked_at"] = 0.0
+
+
+changes.track(Child)
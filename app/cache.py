@@ -0,0 +1,235 @@
+# app/cache.py
+"""
+Server-side cache for expensive aggregate endpoints.
+
+    @reports_bp.route("/kpi")
+    @cache.cached("attendance", "offerings")
+    def kpi(): ...
+
+- Entries are keyed by endpoint + normalized query args + the current
+  generation of every table the endpoint reads.
+- A commit that writes to a table bumps that table's generation
+  (changes.on_commit) in a store every process shares, so stale entries are
+  not read again; TTL and LRU eviction clean them up.
+- Writes that bypass the ORM unit of work (Core inserts, Query.update/delete)
+  must call `invalidate(table)` or changes.record_bulk themselves.
+
+Backends (CACHE_BACKEND):
+    memory  per-worker OrderedDict with TTL + LRU (default); generations live
+            in the cache_generations table, which each worker re-reads at
+            most every CACHE_GENERATION_REFRESH_SECONDS. A commit made by
+            another gunicorn worker or by `flask worker` therefore shows up
+            within that interval; the committing worker sees it at once.
+    redis   shared through any Redis-compatible store at CACHE_REDIS_URL;
+            TTL via SET EX, eviction by the server's maxmemory-policy
+    none    caching disabled (benchmarks measure the real work)
+"""
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, has_app_context, request
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from . import changes
+from .extensions import db
+from .models import CacheGeneration
+
+EXTENSION_KEY = "aggregate_cache"
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class DatabaseGenerations:
+    """
+    Generation counters in the cache_generations table, read in one query
+    (from the primary, never a lagging replica) at most every
+    `refresh_seconds`. A bump runs in its own transaction after the write
+    committed; one lost to a crash in between leaves entries to expire by TTL.
+    """
+
+    def __init__(self, refresh_seconds=1.0):
+        self.refresh_seconds = refresh_seconds
+        self._seen = {}
+        self._checked_at = None
+        self._bumps = 0  # a bump during a read keeps that read from counting as fresh
+        self._lock = threading.Lock()
+
+    def generations(self, tables):
+        now = time.monotonic()
+        checked_at, bumps = self._checked_at, self._bumps
+        if checked_at is None or now - checked_at >= self.refresh_seconds:
+            rows = db.session.execute(
+                select(CacheGeneration.table_name, CacheGeneration.generation),
+                bind_arguments={"bind": db.engine},
+            ).all()
+            with self._lock:
+                self._seen = dict(rows)
+                if self._bumps == bumps:
+                    self._checked_at = now
+        seen = self._seen
+        return [seen.get(t, 0) for t in tables]
+
+    def bump(self, table):
+        stmt = UPSERT_DIALECTS[db.engine.dialect.name](CacheGeneration).values(table_name=table, generation=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheGeneration.table_name],
+            set_={"generation": CacheGeneration.generation + 1},
+        )
+        with db.engine.begin() as conn:
+            conn.execute(stmt)
+        with self._lock:
+            self._bumps += 1
+            self._checked_at = None  # this worker reads its own write at once
+
+
+class MemoryBackend:
+    def __init__(self, max_entries=1024, generations=None):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._generations = generations or DatabaseGenerations()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generations(self, tables):
+        return self._generations.generations(tables)
+
+    def bump(self, table):
+        self._generations.bump(table)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Needs only get/set(ex=)/mget/incr, so tests can pass an in-memory fake."""
+
+    def __init__(self, client, prefix="cm:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=int(ttl))
+
+    def generations(self, tables):
+        if not tables:
+            return []
+        return [int(g or 0) for g in self.client.mget([f"{self.prefix}gen:{t}" for t in tables])]
+
+    def bump(self, table):
+        self.client.incr(f"{self.prefix}gen:{table}")
+
+
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def generations(self, tables):
+        return [0] * len(tables)
+
+    def bump(self, table):
+        pass
+
+
+def _build_backend(config):
+    kind = config["CACHE_BACKEND"]
+    if kind == "memory":
+        return MemoryBackend(
+            config["CACHE_MAX_ENTRIES"], DatabaseGenerations(config["CACHE_GENERATION_REFRESH_SECONDS"])
+        )
+    if kind == "redis":
+        import redis  # optional dependency, only needed for a shared cache
+
+        return RedisBackend(redis.Redis.from_url(config["CACHE_REDIS_URL"]))
+    if kind == "none":
+        return NullBackend()
+    raise ValueError(f"Unknown CACHE_BACKEND {kind!r}")
+
+
+def init_app(app, backend=None):
+    app.config.setdefault("CACHE_BACKEND", "memory")
+    app.config.setdefault("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    app.config.setdefault("CACHE_DEFAULT_TTL", 300)
+    app.config.setdefault("CACHE_MAX_ENTRIES", 1024)
+    app.config.setdefault("CACHE_GENERATION_REFRESH_SECONDS", 1.0)
+    app.extensions[EXTENSION_KEY] = backend or _build_backend(app.config)
+
+
+def backend():
+    return current_app.extensions[EXTENSION_KEY]
+
+
+def invalidate(*tables):
+    """Make every cached value that depends on these tables unreachable."""
+    store = backend()
+    for table in tables:
+        store.bump(table)
+
+
+def _normalized_args():
+    # order-insensitive, blank values dropped: ?b=2&a=1&c= == ?a=1&b=2
+    return sorted((k, v) for k, v in request.args.items(multi=True) if v != "")
+
+
+def cached(*tables, ttl=None, vary=None):
+    """
+    Cache a GET view's successful response until one of `tables` is written
+    to or `ttl` seconds pass. `vary` adds a computed part to the key, e.g.
+    today's date for views whose default depends on it.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            store = backend()
+            key = json.dumps([
+                request.endpoint, kwargs, _normalized_args(),
+                dict(zip(tables, store.generations(tables))),
+                vary() if vary else None,
+            ], default=str, sort_keys=True)
+            hit = store.get(key)
+            if hit is not None:
+                body, status, headers = hit
+                return current_app.response_class(body, status=status, headers=headers)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.direct_passthrough = False  # send_file bodies are buffered once here
+                store.set(
+                    key,
+                    (response.get_data(), response.status_code, list(response.headers.items())),
+                    ttl or current_app.config["CACHE_DEFAULT_TTL"],
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+@changes.on_commit
+def _invalidate_written_tables(tables):
+    if has_app_context() and EXTENSION_KEY in current_app.extensions:
+        invalidate(*tables)
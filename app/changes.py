@@ -0,0 +1,168 @@
+# app/changes.py
+"""
+Row-level change tracking for tables that other code keeps derived state for.
+
+- Every flush that touches a tracked model appends (table, row_id, op) rows to
+  `change_log` inside the same transaction, so the log's id is a monotonically
+  increasing change counter that every worker can read.
+- `on_commit` callbacks run in this process after a commit, with the set of
+  tables that the transaction wrote to.
+
+Ids are handed out at flush but become visible at commit, so on Postgres a
+reader can see id 12 while id 11 is still in flight. Readers that remember a
+position in the log therefore keep the *settled* counter from `bounds()`
+(the newest id logged more than CHANGE_LOG_SETTLE_SECONDS ago) and read
+everything after it next time: the last few seconds are read twice, but a
+late commit is never stepped over. Transactions that stay open longer than
+the settle window between flush and commit can still be missed.
+
+`prune()` (the daily `changes.prune` schedule) drops rows older than
+CHANGE_LOG_RETENTION_DAYS. A reader whose position is older than `oldest`
+has lost rows and must start over from a full copy.
+"""
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, event, func, insert, literal, select
+from sqlalchemy.orm import Session
+from .extensions import db
+from .models import ChangeLog
+
+_tracked = set()
+_commit_listeners = []
+
+
+def track(*models):
+    """Start logging row changes for the given models."""
+    for model in models:
+        _tracked.add(model.__tablename__)
+
+
+def on_commit(callback):
+    """Register callback(tables) to run after every commit that wrote to a table."""
+    _commit_listeners.append(callback)
+    return callback
+
+
+def latest(table_name):
+    """Current change counter for a table (0 when nothing was logged yet)."""
+    return db.session.query(func.coalesce(func.max(ChangeLog.id), 0)).filter(
+        ChangeLog.table_name == table_name
+    ).scalar()
+
+
+def bounds(table_name=None):
+    """
+    (oldest, settled, newest) change counters, 0 when nothing qualifies:
+    the oldest id still in the log, and the newest logged more than
+    CHANGE_LOG_SETTLE_SECONDS ago / at all (for one table, when given).
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config["CHANGE_LOG_SETTLE_SECONDS"])
+    newest = select(ChangeLog.id).order_by(ChangeLog.id.desc()).limit(1)
+    if table_name:
+        newest = newest.where(ChangeLog.table_name == table_name)
+    # walk back from the newest row: only the last few seconds are visited
+    settled = newest.where(ChangeLog.changed_at < cutoff)
+    oldest = select(ChangeLog.id).order_by(ChangeLog.id).limit(1)
+    return tuple(
+        db.session.execute(
+            select(*(func.coalesce(q.scalar_subquery(), 0) for q in (oldest, settled, newest)))
+        ).one()
+    )
+
+
+def since(table_name, seq):
+    """(id, row_id, op) rows logged for a table after counter `seq`, oldest first."""
+    return (
+        db.session.query(ChangeLog.id, ChangeLog.row_id, ChangeLog.op)
+        .filter(ChangeLog.table_name == table_name, ChangeLog.id > seq)
+        .order_by(ChangeLog.id)
+        .all()
+    )
+
+
+def record_bulk(table_name):
+    """
+    Log a 'bulk' marker for writes that bypass the ORM (Core inserts, set-based
+    UPDATEs). Readers treat it as "reload everything". Runs in the caller's transaction.
+    """
+    db.session.execute(insert(ChangeLog), [{"table_name": table_name, "op": "bulk"}])
+    db.session.info.setdefault("changed_tables", set()).add(table_name)
+
+
+def record_rows(table_name, row_ids):
+    """
+    Log an 'update' row for every id `row_ids` (a SELECT of ids) yields, in
+    one INSERT ... SELECT. For set-based UPDATEs that touch a known subset:
+    call it before the UPDATE, while the WHERE still matches.
+    """
+    ids = row_ids.subquery()
+    db.session.execute(
+        insert(ChangeLog).from_select(
+            ["table_name", "row_id", "op", "changed_at"],
+            select(literal(table_name), ids.c[0], literal("update"), literal(datetime.utcnow())),
+        )
+    )
+    db.session.info.setdefault("changed_tables", set()).add(table_name)
+
+
+def record_ids(table_name, row_ids, op="update"):
+    """
+    Log `op` for known ids, e.g. the ids a Core INSERT/DELETE ... RETURNING gave
+    back. Returns the new change_log ids in the order of `row_ids`.
+    """
+    logged = []
+    if row_ids:
+        logged = db.session.execute(
+            insert(ChangeLog).returning(ChangeLog.id, sort_by_parameter_order=True),
+            [{"table_name": table_name, "row_id": row_id, "op": op, "changed_at": datetime.utcnow()}
+             for row_id in row_ids],
+        ).scalars().all()
+    db.session.info.setdefault("changed_tables", set()).add(table_name)
+    return logged
+
+
+def prune(before):
+    """
+    Delete log rows older than `before` (a UTC datetime), except the newest of
+    them: it stays as the oldest row, so `bounds()` still tells readers where
+    the gap ends and ids are never handed out twice. Returns the rows deleted.
+    """
+    boundary = db.session.execute(select(func.max(ChangeLog.id)).where(ChangeLog.changed_at < before)).scalar()
+    if boundary is None:
+        return 0
+    return db.session.execute(delete(ChangeLog).where(ChangeLog.id < boundary)).rowcount
+
+
+# ------------------------
+# Session hooks
+# ------------------------
+@event.listens_for(Session, "after_flush")
+def _log_flush(session, flush_context):
+    changed = session.info.setdefault("changed_tables", set())
+    rows = []
+    for op, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            table = getattr(obj, "__tablename__", None)
+            if table is None:
+                continue
+            if op == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            changed.add(table)
+            if table in _tracked:
+                rows.append({"table_name": table, "row_id": obj.id, "op": op})
+    if rows:
+        session.connection().execute(insert(ChangeLog), rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_commit(session):
+    tables = session.info.pop("changed_tables", None)
+    if not tables:
+        return
+    for callback in _commit_listeners:
+        callback(frozenset(tables))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("changed_tables", None)
@@ -0,0 +1,163 @@
+# app/class_bands.py
+"""
+Set-based age-band class reassignment, driven by sunday_classes.min_age/max_age.
+
+    report = reassign()            # or `flask reassign-classes`, POST /api/classes/reassign
+    {"moved": 12, "classes": [{"class_id": 2, "name": "Beginners", "joined": 7, "left": 5}, ...]}
+
+Three statements whatever the roster size: read the bands, count the moves
+grouped by (from, to), and one `UPDATE children SET class_id = CASE ...` over
+the children whose band changed. A child whose age is unknown or outside
+every band keeps the class it has.
+
+Children with a date_of_birth age on their own: the daily `children.promote`
+schedule calls promote(), which finds the children who had a birthday since
+the previous run with one date_of_birth range per age (an index range scan
+each, e.g. turning 6 during (since, through] <=> born in
+(since - 6 years, through - 6 years]), bumps their stored age, and reassigns
+only those whose new age sits on a band edge.
+"""
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, case, false, func, or_, select, update
+from . import changes
+from .extensions import db
+from .models import Child, SundayClass, age_on
+
+
+def band_case(classes, age=Child.age):
+    """CASE mapping an age to the first class (by min_age) whose band holds it."""
+    whens = [
+        (and_(age >= c.min_age, age < c.max_age), c.id)
+        for c in classes
+        if c.min_age is not None and c.max_age is not None
+    ]
+    return case(*whens, else_=None) if whens else None
+
+
+def _bands():
+    return SundayClass.query.order_by(SundayClass.min_age, SundayClass.id).all()
+
+
+def reassign(dry_run=False, among=None, detail=False):
+    """
+    Move every child whose class differs from its band's. `among` narrows the
+    candidates to a condition on Child; with `detail` the report also lists
+    each moved child ({"id", "name", "age", "from_class_id", "to_class_id"}).
+    """
+    classes = _bands()
+    target = band_case(classes)
+    report = {"moved": 0, "classes": []}
+    if detail:
+        report["children"] = []
+    if target is None:
+        return report
+
+    moving = and_(Child.age.is_not(None), target.is_not(None), Child.class_id.is_distinct_from(target))
+    if among is not None:
+        moving = and_(among, moving)
+    moves = db.session.execute(
+        select(Child.class_id, target.label("to_id"), func.count())
+        .where(moving)
+        .group_by(Child.class_id, target)
+    ).all()
+
+    names = {c.id: c.name for c in classes}
+    per_class = {}
+    for from_id, to_id, count in moves:
+        report["moved"] += count
+        if from_id is not None:
+            per_class.setdefault(from_id, {"joined": 0, "left": 0})["left"] += count
+        per_class.setdefault(to_id, {"joined": 0, "left": 0})["joined"] += count
+    report["classes"] = [
+        {"class_id": cid, "name": names.get(cid), **counts}
+        for cid, counts in sorted(per_class.items(), key=lambda item: (item[0] is None, item[0]))
+    ]
+
+    if detail and report["moved"]:
+        report["children"] = [
+            dict(row._mapping)
+            for row in db.session.execute(
+                select(Child.id, Child.name, Child.age, Child.class_id.label("from_class_id"),
+                       target.label("to_class_id"))
+                .where(moving)
+                .order_by(Child.id)
+            )
+        ]
+
+    if report["moved"] and not dry_run:
+        changes.record_rows("children", select(Child.id).where(moving))
+        db.session.execute(
+            update(Child)
+            .where(moving)
+            .values(class_id=target, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    return report
+
+
+# ------------------------
+# Birthdays
+# ------------------------
+def years_before(day, years):
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:  # 29 February in a common year
+        return day.replace(year=day.year - years, day=28)
+
+
+def turning(age, since, through):
+    """Children whose `age`-th birthday falls in (since, through]: one index range on date_of_birth."""
+    return and_(Child.date_of_birth > years_before(since, age), Child.date_of_birth <= years_before(through, age))
+
+
+def band_edges(classes):
+    return sorted({a for c in classes for a in (c.min_age, c.max_age) if a is not None})
+
+
+def _refresh_all_ages(through):
+    # first run, or the schedule was off for over a year: windows would overlap
+    rows = db.session.execute(
+        select(Child.id, Child.date_of_birth, Child.age).where(Child.date_of_birth.is_not(None))
+    ).all()
+    stale = [{"id": cid, "age": age_on(born, through)} for cid, born, age in rows if age != age_on(born, through)]
+    if stale:
+        changes.record_bulk("children")
+        db.session.execute(update(Child), stale)
+    return len(stale)
+
+
+def promote(since=None, through=None):
+    """
+    Age the children whose birthday falls in (since, through] (default: since
+    yesterday) and move those that crossed a band edge. Returns a change
+    report; with no `since`, or one over a year back, every child with a
+    date_of_birth is re-aged and checked instead.
+    """
+    through = through or date.today()
+    report = {"since": since.isoformat() if since else None, "through": through.isoformat(), "aged": 0}
+
+    if since is None or through - since > timedelta(days=365):
+        report["aged"] = _refresh_all_ages(through)
+        among = Child.date_of_birth.is_not(None)
+    elif since >= through:
+        among = false()
+    else:
+        birthdays = {age: turning(age, since, through) for age in range(current_app.config["PROMOTION_MAX_AGE"] + 1)}
+        had_birthday = or_(*birthdays.values())
+        changes.record_rows("children", select(Child.id).where(had_birthday))
+        report["aged"] = db.session.execute(
+            update(Child)
+            .where(had_birthday)
+            .values(age=case(*[(cond, age) for age, cond in birthdays.items()], else_=Child.age),
+                    updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        # only a birthday onto a band edge can change a child's class
+        edges = [birthdays[age] for age in band_edges(_bands()) if age in birthdays]
+        among = or_(*edges) if edges else false()
+
+    report.update(reassign(among=among, detail=True))
+    db.session.commit()
+    return report
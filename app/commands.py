@@ -0,0 +1,170 @@
+# app/commands.py
+"""Flask CLI commands (run with `flask --app manage <command>`)."""
+import time
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from .extensions import db
+
+
+def _target_url():
+    return db.engine.url.render_as_string(hide_password=True)
+
+
+@click.command("seed-synthetic")
+@click.option("--children", default=1000, show_default=True, help="Children across the SundayClass age bands.")
+@click.option("--years", default=2.0, show_default=True, help="Years of weekly attendance/offerings/finance.")
+@click.option("--teachers", default=10, show_default=True)
+@click.option("--visitors", default=500, show_default=True)
+@click.option("--members", default=500, show_default=True)
+@click.option("--new-members", default=100, show_default=True)
+@click.option("--events", default=50, show_default=True, help="Events, each with 1-4 media items.")
+@click.option("--seed", default=42, show_default=True, help="Random seed; same seed and end, same data.")
+@click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Last day of the data (YYYY-MM-DD)  [default: app.synthetic.END]")
+@click.option("--yes", is_flag=True, help="Do not ask for confirmation.")
+@with_appcontext
+def seed_synthetic(children, years, teachers, visitors, members, new_members, events, seed, end, yes):
+    """Bulk-insert a realistic, reproducible dataset for load/benchmark work."""
+    from .synthetic import END, generate
+
+    end = end.date() if end else END
+    if not yes:
+        click.confirm(f"Insert synthetic data into {_target_url()}?", abort=True)
+
+    started = time.perf_counter()
+    click.echo(f"Generating synthetic data (seed={seed}, end={end}) into {_target_url()}")
+    counts = generate(
+        children=children, years=years, teachers=teachers, visitors=visitors,
+        members=members, new_members=new_members, events=events, seed=seed,
+        end=end, echo=click.echo,
+    )
+    click.echo(f"Done: {sum(counts.values()):,} rows in {time.perf_counter() - started:.2f}s")
+
+
+@click.command("import-times")
+@click.option("--limit", default=25, show_default=True, help="How many modules to list.")
+@click.option("--sort", type=click.Choice(["cumulative", "self"]), default="cumulative", show_default=True)
+@click.option("--budget-ms", type=float, default=None, help="Exit non-zero when create_app() is slower than this.")
+def import_times(limit, sort, budget_ms):
+    """Boot the app in a fresh interpreter and list the slowest imports."""
+    from .diagnostics import import_times as measure
+
+    startup_ms, modules = measure()
+    key = f"{sort}_us"
+    click.echo(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for m in sorted(modules, key=lambda m: m[key], reverse=True)[:limit]:
+        click.echo(f"{m['cumulative_us'] / 1000:>14.1f} {m['self_us'] / 1000:>8.1f}  {m['module']}")
+    click.echo(f"\nimport + create_app(): {startup_ms:.1f} ms")
+    if budget_ms is not None and startup_ms > budget_ms:
+        click.echo(f"Over the startup budget of {budget_ms:.0f} ms", err=True)
+        raise SystemExit(1)
+
+
+@click.command("reassign-classes")
+@click.option("--dry-run", is_flag=True, help="Only report who would move.")
+@with_appcontext
+def reassign_classes(dry_run):
+    """Put every child in its age band's class (bands come from sunday_classes)."""
+    from .class_bands import reassign
+
+    started = time.perf_counter()
+    report = reassign(dry_run=dry_run)
+    for row in report["classes"]:
+        click.echo(f"{row['name'] or row['class_id']:<20} +{row['joined']:<5} -{row['left']}")
+    verb = "would move" if dry_run else "moved"
+    click.echo(f"{report['moved']} children {verb} in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+@click.command("worker")
+@click.option("--threads", default=2, show_default=True, help="Worker threads per process.")
+@click.option("--processes", default=1, show_default=True, help="Forked worker processes.")
+@click.option("--burst", is_flag=True, help="Exit once the queue is empty instead of polling.")
+@click.option("--scheduler/--no-scheduler", default=True, show_default=True,
+              help="Also fire periodic maintenance (app/scheduler.py).")
+@with_appcontext
+def worker(threads, processes, burst, scheduler):
+    """Run background jobs from the jobs table (see app/jobs.py)."""
+    from .jobs import TASKS, run_worker
+    from .scheduler import Scheduler, active_schedules
+
+    app = current_app._get_current_object()
+    click.echo(f"Worker on {_target_url()}: {processes} process(es) x {threads} thread(s); "
+               f"tasks: {', '.join(sorted(TASKS))}")
+    loop = Scheduler(app).start() if scheduler and not burst else None
+    active = active_schedules(app)
+    if loop is None and active:
+        click.echo(f"Warning: {len(active)} schedule(s) active but this worker does not run them "
+                   f"({'--burst' if burst else '--no-scheduler'}); start a `flask worker` without it "
+                   f"or they never fire.", err=True)
+    try:
+        run_worker(app, threads=threads, processes=processes, burst=burst)
+    finally:
+        if loop is not None:
+            loop.stop()
+
+
+@click.group("schedule")
+def schedule():
+    """Periodic maintenance jobs: list, run now, history."""
+
+
+@schedule.command("list")
+@with_appcontext
+def schedule_list():
+    from datetime import datetime
+    from .models import ScheduledRun
+    from .scheduler import SCHEDULES, active_schedules
+
+    active = active_schedules(current_app)
+    now = datetime.utcnow()
+    click.echo(f"{'name':<24} {'cron (UTC)':<16} {'next run':<17} last run")
+    for name in sorted(SCHEDULES):
+        last = ScheduledRun.query.filter_by(name=name).order_by(ScheduledRun.started_at.desc()).first()
+        cron = active.get(name)
+        click.echo(
+            f"{name:<24} {cron.expression if cron else 'off':<16} "
+            f"{cron.next_after(now).strftime('%Y-%m-%d %H:%M') if cron else '-':<17} "
+            f"{f'{last.status} at {last.started_at:%Y-%m-%d %H:%M}' if last else '-'}"
+        )
+
+
+@schedule.command("run")
+@click.argument("name")
+@with_appcontext
+def schedule_run(name):
+    """Run one job now (recorded in the history as a manual run)."""
+    from .scheduler import SCHEDULES, run_job
+
+    if name not in SCHEDULES:
+        raise click.BadParameter(f"choose from {', '.join(sorted(SCHEDULES))}", param_hint="NAME")
+    run = run_job(name, trigger="manual")
+    if run is None:
+        raise click.ClickException(f"{name} was started by another process this instant; try again")
+    click.echo(f"{name}: {run.status} {run.error or run.result}")
+    if run.status != "done":
+        raise SystemExit(1)
+
+
+@schedule.command("history")
+@click.option("--name", default=None, help="Only this job.")
+@click.option("--limit", default=20, show_default=True)
+@with_appcontext
+def schedule_history(name, limit):
+    from .models import ScheduledRun
+
+    query = ScheduledRun.query.order_by(ScheduledRun.started_at.desc())
+    if name:
+        query = query.filter_by(name=name)
+    for run in query.limit(limit):
+        took = f"{(run.finished_at - run.started_at).total_seconds():.1f}s" if run.finished_at else "-"
+        click.echo(f"{run.started_at:%Y-%m-%d %H:%M:%S}  {run.name:<24} {run.trigger:<8} "
+                   f"{run.status:<8} {took:>7}  {run.error or run.result or ''}")
+
+
+def register_commands(app):
+    app.cli.add_command(seed_synthetic)
+    app.cli.add_command(import_times)
+    app.cli.add_command(reassign_classes)
+    app.cli.add_command(worker)
+    app.cli.add_command(schedule)
@@ -0,0 +1,61 @@
+# app/compression.py
+"""
+Negotiated response compression: brotli when the client accepts it and the
+`brotli` package is installed, otherwise gzip, for text/JSON bodies of at
+least COMPRESS_MIN_SIZE bytes.
+"""
+import gzip
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def choose_encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def compress_response(response):
+    if (
+        request.method == "HEAD"
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not (response.mimetype or "").startswith(COMPRESSIBLE)
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    encoding = choose_encoding()
+    if encoding == "br":
+        data = brotli.compress(data, quality=current_app.config["COMPRESS_BR_QUALITY"])
+    elif encoding == "gzip":
+        data = gzip.compress(data, compresslevel=current_app.config["COMPRESS_LEVEL"])
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # the bytes changed, so a strong validator no longer matches them
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+    app.config.setdefault("COMPRESS_LEVEL", 6)
+    app.config.setdefault("COMPRESS_BR_QUALITY", 5)
+    app.after_request(compress_response)
@@ -0,0 +1,113 @@
+# app/diagnostics.py
+"""
+Measurement helpers shared by the benchmark suite and the regression tests.
+"""
+import os
+import re
+import subprocess
+import sys
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    Records every SQL statement (and its parameters) any engine executes while active.
+
+        with QueryCounter() as queries:
+            client.get("/api/children/")
+        assert queries.count <= 3
+    """
+
+    def __init__(self):
+        self.executed = []
+
+    @property
+    def count(self):
+        return len(self.executed)
+
+    @property
+    def statements(self):
+        return [statement for statement, _ in self.executed]
+
+    def matching(self, *fragments):
+        """(statement, parameters) pairs whose SQL contains every fragment."""
+        return [
+            (statement, params) for statement, params in self.executed
+            if all(f.lower() in statement.lower() for f in fragments)
+        ]
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.executed.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self._record)
+        return False
+
+
+def explain(connection, statement, parameters=()):
+    """
+    Query plan lines for a driver-level statement, as the database would run it.
+    On Postgres sequential scans are disabled for the check, so the plan shows
+    whether a usable index exists rather than what is cheapest on a tiny table.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+        return [row[0] for row in rows]
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def uses_index(plan, table):
+    """True when the plan reads `table` through an index instead of a full scan."""
+    on_table = re.compile(rf"\bon {re.escape(table)}\b")
+    found = False
+    for line in plan:
+        line = line.strip(" ->")
+        if line.startswith(f"SCAN {table}") or ("Seq Scan" in line and on_table.search(line)):
+            return False
+        if line.startswith(f"SEARCH {table} USING"):
+            found = True
+        elif on_table.search(line) and ("Index" in line or "Bitmap Heap Scan" in line):
+            found = True
+    return found
+
+
+# ------------------------
+# Startup cost
+# ------------------------
+_STARTUP_SNIPPET = (
+    "import time; started = time.perf_counter(); "
+    "from app import create_app; create_app(); "
+    "print('create_app_ms=%.1f' % ((time.perf_counter() - started) * 1000))"
+)
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_times(cwd=None):
+    """
+    Boot the app in a fresh interpreter under `python -X importtime`.
+    Returns (create_app milliseconds, [{module, self_us, cumulative_us, depth}]).
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STARTUP_SNIPPET],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    )
+    match = re.search(r"create_app_ms=([\d.]+)", proc.stdout)
+    modules = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_LINE.match(line)
+        if m:
+            modules.append({
+                "module": m.group(4),
+                "self_us": int(m.group(1)),
+                "cumulative_us": int(m.group(2)),
+                "depth": len(m.group(3)) // 2,
+            })
+    return (float(match.group(1)) if match else None), modules
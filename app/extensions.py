@@ -1,22 +1,78 @@
 # app/extensions.py
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, TextClause
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
-import cloudinary
-import os
+from flask import current_app, g, has_app_context
 
-db = SQLAlchemy()
+REPLICA_BIND = "replica"
+
+
+class BatchJWTManager(JWTManager):
+    """
+    JWTManager whose signature check can be shared: /api/batch verifies the
+    caller's token once and lists it in g.verified_jwts, and its sub-requests
+    reuse those claims instead of decoding the same token again.
+
+    No public hook can skip the decode (decode_token and the blocklist loader
+    run after it), so this overrides the private method every decode goes
+    through. Flask-JWT-Extended is pinned in requirements.txt and
+    tests/test_batch.py fails if the method's name or parameters change.
+    """
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        verified = g.get("verified_jwts")
+        if verified and encoded_token in verified:
+            return verified[encoded_token]
+        return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+
+class RoutingSession(Session):
+    """
+    db.session that can send plain reads to a read replica: the "replica"
+    entry of SQLALCHEMY_BINDS, used only while g.read_replica is set (see
+    app/replica.py). Writes, flushes, and every read after this session has
+    written go to the primary, so a request always sees its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and REPLICA_BIND in self._db.engines:
+            if self._flushing or (clause is not None and not _is_read(clause)):
+                self.info["wrote"] = True
+            elif clause is not None and not self.info.get("wrote") and has_app_context() and g.get("read_replica"):
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _is_read(clause):
+    if isinstance(clause, Select):
+        return True
+    return isinstance(clause, TextClause) and clause.text.split(None, 1)[0].upper() in ("SELECT", "WITH")
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
-jwt = JWTManager()
+jwt = BatchJWTManager()
 cors = CORS()
 
 
 
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
\ No newline at end of file
+def cloudinary_uploader():
+    """
+    cloudinary.uploader, imported and configured on first use so that worker
+    boot does not pay for it (only upload/delete endpoints need it).
+    """
+    import cloudinary
+    import cloudinary.uploader
+
+    if not cloudinary.config().cloud_name:
+        cloudinary.config(
+            cloud_name=current_app.config["CLOUDINARY_CLOUD_NAME"],
+            api_key=current_app.config["CLOUDINARY_API_KEY"],
+            api_secret=current_app.config["CLOUDINARY_API_SECRET"],
+            secure=True
+        )
+    return cloudinary.uploader
\ No newline at end of file
@@ -0,0 +1,250 @@
+# app/jobs.py
+"""
+Background jobs stored in the `jobs` table; no broker needed.
+
+    @jobs.task("children.import", max_attempts=3)
+    def import_children(path, user_id): ...
+
+    job = jobs.enqueue("children.import", path=path, user_id=uid)
+    db.session.commit()        # the job exists only if the request's writes do
+    -> 202 {"job_id": job.id, "status_url": "/api/jobs/<id>"}
+
+`flask --app manage worker --threads 4` runs them. A worker claims a job with
+a guarded UPDATE (only one worker's UPDATE matches), marks it running until
+now + JOBS_VISIBILITY_TIMEOUT and calls the task in a fresh app context.
+- success: status 'done', the task's return value stored as `result`
+- exception: back to 'queued' with run_at pushed out exponentially
+  (JOBS_RETRY_DELAY * 2^(attempt-1)), or 'failed' after max_attempts
+- a worker that dies mid-job: the lock expires and another worker retries it
+
+Tasks must tolerate running twice (a slow job can outlive its lock).
+They are registered at import time, so define them in modules create_app()
+imports (next to the routes that enqueue them).
+
+GET views can be offloaded with @offloadable: ?async=1 renders the view in a
+job and the caller downloads the stored response from /api/jobs/<id>/download.
+"""
+import multiprocessing
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, g, jsonify, request, url_for
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import and_, or_, select, update
+from .extensions import db
+from .models import Job
+from .replica import replica_reads
+
+TASKS = {}
+MAX_RETRY_DELAY = 3600
+
+
+def task(name, max_attempts=None, timeout=None):
+    """Register `func` as the job called `name`."""
+    def decorator(func):
+        TASKS[name] = {"func": func, "max_attempts": max_attempts, "timeout": timeout}
+        return func
+    return decorator
+
+
+def init_app(app):
+    app.config.setdefault("JOBS_VISIBILITY_TIMEOUT", 300)
+    app.config.setdefault("JOBS_MAX_ATTEMPTS", 5)
+    app.config.setdefault("JOBS_RETRY_DELAY", 10)
+    app.config.setdefault("JOBS_POLL_INTERVAL", 1.0)
+    app.config.setdefault("JOB_RESULTS_FOLDER", os.path.join(app.instance_path, "job_results"))
+
+
+def enqueue(name, delay=0, **payload):
+    """Add a job to the current session; it is queued when the caller commits."""
+    if name not in TASKS:
+        raise KeyError(f"Unknown job {name!r}")
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        identity = None  # CLI, scheduler or an unauthenticated request
+    job = Job(
+        name=name,
+        payload=payload,
+        max_attempts=TASKS[name]["max_attempts"] or current_app.config["JOBS_MAX_ATTEMPTS"],
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+        created_by=int(identity) if identity else None,
+    )
+    db.session.add(job)
+    return job
+
+
+def accepted(job):
+    """202 response pointing the client at the job's status."""
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": url_for("jobs_bp.job_status", job_id=job.id),
+    }), 202
+
+
+# ------------------------
+# Claiming and running
+# ------------------------
+def _due(now):
+    return or_(
+        and_(Job.status == "queued", Job.run_at <= now),
+        and_(Job.status == "running", Job.locked_until < now),  # visibility timeout expired
+    )
+
+
+def claim(worker_id):
+    """Lock the next due job for this worker, or return None."""
+    now = datetime.utcnow()
+    candidates = db.session.execute(
+        select(Job.id, Job.name).where(_due(now)).order_by(Job.run_at, Job.id).limit(5)
+    ).all()
+    for job_id, name in candidates:
+        timeout = (TASKS.get(name) or {}).get("timeout") or current_app.config["JOBS_VISIBILITY_TIMEOUT"]
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, _due(now))
+            .values(status="running", attempts=Job.attempts + 1, locked_by=worker_id,
+                    locked_until=now + timedelta(seconds=timeout))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id, populate_existing=True)
+    db.session.rollback()
+    return None
+
+
+def _finish(job, worker_id, **values):
+    # a job reclaimed after its lock expired belongs to the other worker now
+    db.session.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.locked_by == worker_id, Job.attempts == job.attempts)
+        .values(locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def execute(job, worker_id):
+    spec = TASKS.get(job.name)
+    try:
+        if spec is None:
+            raise KeyError(f"Unknown job {job.name!r}")
+        g.job = job  # tasks that store files name them after the job
+        result = spec["func"](**(job.payload or {}))
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.exception("Job %s (%s) failed on attempt %d", job.id, job.name, job.attempts)
+        error = f"{type(exc).__name__}: {exc}"
+        if spec is None or job.attempts >= job.max_attempts:
+            _finish(job, worker_id, status="failed", error=error, finished_at=datetime.utcnow())
+        else:
+            delay = min(current_app.config["JOBS_RETRY_DELAY"] * 2 ** (job.attempts - 1), MAX_RETRY_DELAY)
+            _finish(job, worker_id, status="queued", error=error,
+                    run_at=datetime.utcnow() + timedelta(seconds=delay))
+        return False
+    _finish(job, worker_id, status="done", result=result, error=None, finished_at=datetime.utcnow())
+    return True
+
+
+def work(app, worker_id=None, burst=False, stop=None):
+    """Claim and run jobs until `stop` is set (or, with burst, the queue is empty)."""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    processed = 0
+    while not (stop and stop.is_set()):
+        with app.app_context():
+            job = claim(worker_id)
+            if job is not None:
+                execute(job, worker_id)
+                processed += 1
+                continue
+        if burst:
+            break
+        (stop or threading.Event()).wait(app.config["JOBS_POLL_INTERVAL"])
+    return processed
+
+
+def _run_threads(app, threads, burst, stop):
+    workers = [
+        threading.Thread(target=work, args=(app,), kwargs={"burst": burst, "stop": stop},
+                         name=f"job-worker-{n}", daemon=True)
+        for n in range(threads)
+    ]
+    for w in workers:
+        w.start()
+    try:
+        while any(w.is_alive() for w in workers):
+            for w in workers:
+                w.join(timeout=0.5)
+    except KeyboardInterrupt:
+        stop.set()
+        for w in workers:
+            w.join()
+
+
+def _child_process(app, threads, burst):
+    # connections inherited across fork must not be shared with the parent
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    _run_threads(app, threads, burst, threading.Event())
+
+
+def run_worker(app, threads=1, processes=1, burst=False):
+    if processes <= 1:
+        _run_threads(app, threads, burst, threading.Event())
+        return
+    ctx = multiprocessing.get_context("fork")
+    children = [ctx.Process(target=_child_process, args=(app, threads, burst)) for _ in range(processes)]
+    for child in children:
+        child.start()
+    try:
+        for child in children:
+            child.join()
+    except KeyboardInterrupt:
+        for child in children:
+            child.join()  # each child got the same SIGINT and drains its threads
+
+
+# ------------------------
+# Offloaded GET views
+# ------------------------
+def offloadable(view):
+    """With ?async=1, render this (public) GET view in a job instead of inline."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.args.get("async") not in ("1", "true"):
+            return view(*args, **kwargs)
+        query = [(k, v) for k, v in request.args.items(multi=True) if k != "async"]
+        job = enqueue("views.render", path=request.path, query=query)
+        db.session.commit()
+        return accepted(job)
+    return wrapper
+
+
+def result_path(job):
+    folder = current_app.config["JOB_RESULTS_FOLDER"]
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"job-{job.id}")
+
+
+@task("views.render", max_attempts=3)
+def render_view(path, query):
+    """Run the GET in a request context and keep the body for /download."""
+    app = current_app._get_current_object()
+    with app.test_request_context(path, method="GET", query_string=query), replica_reads():
+        response = app.full_dispatch_request()
+    response.direct_passthrough = False
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} answered {response.status_code}")
+    with open(result_path(g.job), "wb") as fh:
+        fh.write(response.get_data())
+    return {
+        "mimetype": response.mimetype,
+        "filename": response.headers.get("Content-Disposition", "").partition("filename=")[2].strip('"') or None,
+    }
@@ -0,0 +1,60 @@
+# app/json_provider.py
+"""
+JSON provider used by jsonify() and every JSON response.
+
+- Decimal (Numeric columns) and Money (app/money.py, via __json__) become
+  JSON numbers; date/datetime become ISO 8601 strings, so routes can hand
+  model values over without float()/isoformat().
+- orjson does the encoding when it is installed; the stdlib encoder (with the
+  same conversions) is the fallback.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+def _default(o):
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, UUID):
+        return str(o)
+    if hasattr(o, "__json__"):
+        return o.__json__()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class AppJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+    def _orjson_options(self, pretty):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and set(kwargs) <= {"separators", "indent"}:
+            pretty = bool(kwargs.get("indent"))
+            return orjson.dumps(obj, default=_default, option=self._orjson_options(pretty)).decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is not None:
+            # straight to bytes, no str round-trip
+            body = orjson.dumps(obj, default=_default, option=self._orjson_options(pretty)) + b"\n"
+        else:
+            dump_args = {"indent": 2} if pretty else {"separators": (",", ":")}
+            body = f"{self.dumps(obj, **dump_args)}\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,244 @@
+# app/ledger.py
+"""
+Finance ledger: income and expenditure as one signed, dated stream.
+
+The `finance_ledger` view unions finance_entries (main church + children
+ministry, positive) and expenditures (negative) into
+    kind, entry_id, date, description, amount (cents)
+
+    running(start, end)   entries with a running balance: a window
+                          SUM(amount) OVER (ORDER BY date, ...) on top of the
+                          balance before `start`
+    balance_on(day)       last closed period's closing balance + the entries
+                          after it up to `day`
+    close_periods()       write a ledger_periods row for every complete month
+                          not closed yet (monthly `ledger.close` schedule)
+
+Closed months always run unbroken from the first month with entries. Adding,
+editing or deleting an entry dated in a closed month deletes that month's
+row and all later ones; the next close rebuilds them. A balance therefore
+never sums more than the months since the last close. Two Session hooks
+below do the reopening:
+    before_flush      ORM objects added, changed or deleted
+    do_orm_execute    insert()/update()/delete() run through the session
+                      (the earliest date is read with the statement's WHERE)
+Writes neither hook sees (raw SQL, a Connection outside the session) must
+call reopen(earliest date written) in the same transaction.
+"""
+from datetime import date, datetime, timedelta
+from itertools import chain
+from sqlalchemy import Date, Integer, String, case, column, delete, event, extract, func, inspect, select, table
+from sqlalchemy.orm import Session
+from .extensions import db
+from .models import Expenditure, FinanceEntry, LedgerPeriod
+from .money import Money, MoneyType
+
+VIEW = "finance_ledger"
+VIEW_SQL = f"""
+CREATE VIEW {VIEW} AS
+SELECT 'income' AS kind, id AS entry_id, date, service_type AS description,
+       COALESCE(main_church, 0) + COALESCE(children_ministry, 0) AS amount
+FROM finance_entries
+UNION ALL
+SELECT 'expenditure' AS kind, id AS entry_id, date, details AS description, -amount AS amount
+FROM expenditures
+"""
+
+ledger = table(
+    VIEW,
+    column("kind", String),
+    column("entry_id", Integer),
+    column("date", Date),
+    column("description", String),
+    column("amount", MoneyType),
+)
+# same day: income before expenditure, then in entry order
+ORDER = (ledger.c.date, ledger.c.kind.desc(), ledger.c.entry_id)
+
+
+def install(connection):
+    connection.exec_driver_sql(f"DROP VIEW IF EXISTS {VIEW}")
+    connection.exec_driver_sql(VIEW_SQL)
+
+
+def uninstall(connection):
+    connection.exec_driver_sql(f"DROP VIEW IF EXISTS {VIEW}")
+
+
+@event.listens_for(db.metadata, "after_create")
+def _install_after_create(target, connection, **kw):
+    install(connection)
+
+
+@event.listens_for(db.metadata, "before_drop")
+def _uninstall_before_drop(target, connection, **kw):
+    # Postgres will not drop a table a view still reads
+    uninstall(connection)
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _month_end(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+# ------------------------
+# Balances
+# ------------------------
+def last_closed(on_or_before=None):
+    query = LedgerPeriod.query
+    if on_or_before is not None:
+        query = query.filter(LedgerPeriod.period_end <= on_or_before)
+    return query.order_by(LedgerPeriod.period_end.desc()).first()
+
+
+def balance_on(day):
+    """Balance after every entry dated `day` or earlier."""
+    period = last_closed(day)
+    tail = select(func.coalesce(func.sum(ledger.c.amount), 0), func.count()).where(ledger.c.date <= day)
+    if period is not None:
+        tail = tail.where(ledger.c.date > period.period_end)
+    amount, entries = db.session.execute(tail).one()
+    opening = period.closing_balance if period else Money()
+    return {
+        "date": day,
+        "balance": opening + amount,
+        "closed_through": period.period_end if period else None,
+        "tail_entries": entries,
+    }
+
+
+def running(start=None, end=None):
+    """(opening balance, ledger rows with "balance" after each) for [start, end]."""
+    opening = balance_on(start - timedelta(days=1))["balance"] if start else Money()
+    stmt = select(
+        ledger.c.date, ledger.c.kind, ledger.c.entry_id, ledger.c.description, ledger.c.amount,
+        func.sum(ledger.c.amount).over(order_by=ORDER, rows=(None, 0)).label("balance"),
+    ).order_by(*ORDER)
+    if start:
+        stmt = stmt.where(ledger.c.date >= start)
+    if end:
+        stmt = stmt.where(ledger.c.date <= end)
+    rows = []
+    for row in db.session.execute(stmt):
+        entry = dict(row._mapping)
+        entry["balance"] = opening + entry["balance"]
+        rows.append(entry)
+    return opening, rows
+
+
+# ------------------------
+# Period close
+# ------------------------
+def close_periods(through=None, closed_by=None):
+    """
+    Close every complete month up to `through` (default: the end of last
+    month) that is not closed yet. Returns the new periods as dicts.
+    """
+    through = through or date.today().replace(day=1) - timedelta(days=1)
+    previous = last_closed()
+    if previous is not None:
+        start = previous.period_end + timedelta(days=1)
+    else:
+        first = db.session.execute(select(func.min(ledger.c.date))).scalar()
+        if first is None:
+            return []
+        start = _as_date(first).replace(day=1)
+    if _month_end(start) > through:
+        return []
+
+    year, month = extract("year", ledger.c.date), extract("month", ledger.c.date)
+    totals = {
+        (int(y), int(m)): (income, expenditure, entries)
+        for y, m, income, expenditure, entries in db.session.execute(
+            select(
+                year, month,
+                func.sum(case((ledger.c.kind == "income", ledger.c.amount), else_=0)),
+                func.sum(case((ledger.c.kind == "expenditure", -ledger.c.amount), else_=0)),
+                func.count(),
+            )
+            .where(ledger.c.date >= start, ledger.c.date <= through)
+            .group_by(year, month)
+        )
+    }
+
+    balance = previous.closing_balance if previous else Money()
+    closed = []
+    month_start = start
+    while _month_end(month_start) <= through:
+        income, expenditure, entries = totals.get((month_start.year, month_start.month), (Money(), Money(), 0))
+        balance = balance + income - expenditure
+        period = LedgerPeriod(
+            period_start=month_start, period_end=_month_end(month_start), income=income,
+            expenditure=expenditure, closing_balance=balance, entries=entries, closed_by=closed_by,
+        )
+        db.session.add(period)
+        closed.append(period)
+        month_start = _month_end(month_start) + timedelta(days=1)
+    db.session.commit()
+    return [p.to_dict() for p in closed]
+
+
+def reopen(from_day, session=None):
+    """
+    Delete the closed periods ending on or after `from_day` (None = every
+    period), and any loaded copies of them, in the caller's transaction.
+    """
+    stmt = delete(LedgerPeriod)
+    if from_day is not None:
+        stmt = stmt.where(LedgerPeriod.period_end >= _as_date(from_day))
+    (session or db.session).execute(stmt, execution_options={"synchronize_session": "evaluate"})
+
+
+def _plain_date(value):
+    value = getattr(value, "value", value)  # a bindparam's value
+    return _as_date(value) if isinstance(value, date) else None
+
+
+def _earliest_written(state, model):
+    """Earliest ledger date a Core INSERT/UPDATE/DELETE on `model` may touch; None = cannot tell."""
+    stmt = state.statement
+    params = state.parameters if isinstance(state.parameters, list) else [state.parameters or {}]
+    values = getattr(stmt, "_values", None) or {}
+    new = [row["date"] for row in params if "date" in row]
+    new += [value for key, value in values.items() if getattr(key, "key", key) == "date"]
+    new_dates = [_plain_date(value) for value in new]
+    if None in new_dates or (state.is_insert and not new_dates):
+        return None  # a date expression or a multi-VALUES insert: reopen everything
+    candidates = new_dates
+    if not state.is_insert:
+        old = select(func.min(model.date))
+        if stmt.whereclause is not None:
+            old = old.where(stmt.whereclause)
+        first = state.session.execute(old).scalar()
+        if first is None and not new_dates:
+            return date.max  # no rows matched
+        candidates = candidates + [_as_date(first)] if first is not None else candidates
+    return min(candidates)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _reopen_after_bulk_writes(state):
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    model = {"finance_entries": FinanceEntry, "expenditures": Expenditure}.get(
+        getattr(state.statement.table, "name", None))
+    if model is None:
+        return
+    earliest = _earliest_written(state, model)
+    if earliest != date.max:
+        reopen(earliest, state.session)
+
+
+@event.listens_for(Session, "before_flush")
+def _reopen_edited_periods(session, flush_context, instances):
+    dates = []
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (FinanceEntry, Expenditure)):
+            dates.append(obj.date)
+            dates.extend(inspect(obj).attrs.date.history.deleted)  # the date it moved away from
+    dates = [_as_date(d) for d in dates if d is not None]
+    if dates:
+        reopen(min(dates), session)
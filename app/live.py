@@ -0,0 +1,162 @@
+# app/live.py
+"""
+Live KPI updates for dashboards kept open during service (Server-Sent Events).
+
+    route:  live.queue_event("attendance", date=d, class_id=3, delta=+1)
+            live.queue_event("offering", date=d, class_id=3, amount=150, version=812)
+            db.session.commit()            -> published only if the commit succeeds
+    broker: every open /api/live/kpi stream of this worker gets the event
+
+Publishing goes through a bus:
+    local   (default) straight into this worker's broker
+    redis   PUBLISH on LIVE_REDIS_CHANNEL; a listener thread in every worker
+            feeds its own broker, so a write on one worker reaches all streams
+
+Each stream is a bounded queue; an idle stream costs a blocked thread and a
+heartbeat comment every LIVE_HEARTBEAT_SECONDS. Serve with threaded or async
+workers (gunicorn.conf.py defaults to gthread and refuses sync workers), since
+a sync worker would give up a whole process per dashboard. A client that falls more than
+LIVE_QUEUE_SIZE events behind gets a "resync" event and reloads the totals.
+
+Attendance events add a delta. Offering events carry the class's stored total
+for the day and its version (see app/offerings.py); clients replace the total
+when the version is newer than the one they hold, since concurrent saves make
+differences between reads unreliable.
+"""
+import itertools
+import queue
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from flask import current_app, has_app_context
+from .extensions import db
+
+EXTENSION_KEY = "live"
+RESYNC = object()
+
+
+class Broker:
+    """In-process fan-out to subscriber queues."""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def fanout(self, message):
+        event_id = next(self._ids)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait((event_id, message))
+            except queue.Full:
+                # slow consumer: drop its backlog and tell it to reload instead
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait((event_id, RESYNC))
+
+
+class LocalBus:
+    def __init__(self, broker):
+        self.broker = broker
+
+    def publish(self, message):
+        self.broker.fanout(message)
+
+    def start(self):
+        pass
+
+
+class RedisBus:
+    """Cross-worker bus over Redis pub/sub (any client with publish() and pubsub())."""
+
+    def __init__(self, broker, client, channel):
+        self.broker = broker
+        self.client = client
+        self.channel = channel
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def publish(self, message):
+        self.client.publish(self.channel, message)
+
+    def start(self):
+        # one listener thread per worker, started by the first stream
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="live-bus", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        for item in pubsub.listen():
+            data = item.get("data")
+            if isinstance(data, bytes):
+                data = data.decode()
+            if isinstance(data, str):
+                self.broker.fanout(data)
+
+
+def init_app(app, bus=None):
+    app.config.setdefault("LIVE_BUS", "local")
+    app.config.setdefault("LIVE_REDIS_URL", "redis://localhost:6379/0")
+    app.config.setdefault("LIVE_REDIS_CHANNEL", "cm:live")
+    app.config.setdefault("LIVE_QUEUE_SIZE", 100)
+    app.config.setdefault("LIVE_HEARTBEAT_SECONDS", 15)
+    broker = Broker(app.config["LIVE_QUEUE_SIZE"])
+    if bus is None:
+        if app.config["LIVE_BUS"] == "redis":
+            import redis  # optional dependency, only needed across workers
+
+            bus = RedisBus(broker, redis.Redis.from_url(app.config["LIVE_REDIS_URL"]),
+                           app.config["LIVE_REDIS_CHANNEL"])
+        else:
+            bus = LocalBus(broker)
+    app.extensions[EXTENSION_KEY] = bus
+
+
+def bus():
+    return current_app.extensions[EXTENSION_KEY]
+
+
+def queue_event(kind, **payload):
+    """Publish {kind, ...payload} once the current transaction commits."""
+    db.session.info.setdefault("live_events", []).append({"kind": kind, **payload})
+
+
+# ------------------------
+# Session hooks
+# ------------------------
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session):
+    pending = session.info.pop("live_events", None)
+    if not pending or not has_app_context() or EXTENSION_KEY not in current_app.extensions:
+        return
+    target = bus()
+    for payload in pending:
+        try:
+            target.publish(current_app.json.dumps(payload))
+        except Exception:
+            # the write already committed; a lost delta only costs a poll
+            current_app.logger.exception("Live event publish failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session):
+    session.info.pop("live_events", None)
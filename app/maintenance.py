@@ -0,0 +1,116 @@
+# app/maintenance.py
+"""Built-in periodic jobs (see app/scheduler.py for the schedule syntax)."""
+import os
+import shutil
+import time
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, select
+from . import changes, class_bands, ledger, snapshots
+from .extensions import db
+from .jobs import result_path
+from .models import Job, MediaItem, ProgramFile, ScheduledRun
+from .scheduler import periodic
+
+
+@periodic("history.prune", "15 3 * * *")
+def prune_history():
+    """Drop finished jobs (and their stored files) and run history past HISTORY_RETENTION_DAYS."""
+    cutoff = datetime.utcnow() - timedelta(days=current_app.config["HISTORY_RETENTION_DAYS"])
+    finished = Job.status.in_(("done", "failed")) & (Job.finished_at < cutoff)
+    jobs = db.session.execute(select(Job).where(finished)).scalars().all()
+    for job in jobs:
+        path = result_path(job)
+        if os.path.exists(path):
+            os.remove(path)
+    db.session.execute(delete(Job).where(finished))
+    runs = db.session.execute(
+        delete(ScheduledRun).where(ScheduledRun.status != "running", ScheduledRun.finished_at < cutoff)
+    ).rowcount
+    db.session.commit()
+    return {"jobs": len(jobs), "runs": runs}
+
+
+@periodic("changes.prune", "45 3 * * *")
+def prune_change_log():
+    """Drop change_log rows past CHANGE_LOG_RETENTION_DAYS; older sync tokens get a full copy."""
+    cutoff = datetime.utcnow() - timedelta(days=current_app.config["CHANGE_LOG_RETENTION_DAYS"])
+    deleted = changes.prune(cutoff)
+    db.session.commit()
+    return {"change_log": deleted}
+
+
+@periodic("uploads.prune_orphans", None)  # opt in: SCHEDULES = {"uploads.prune_orphans": "30 3 * * 1"}
+def prune_orphan_uploads():
+    """
+    Find local uploads no row points at: files in BASE_UPLOAD_FOLDER that
+    are not an event media URL or a program file, and rosters left in
+    CHILDREN_UPLOAD_FOLDER with no import job waiting. Files younger than
+    UPLOADS_ORPHAN_GRACE_HOURS are kept; their row may not be committed yet.
+
+    UPLOADS_ORPHAN_ACTION "report" (the default) only lists them in the run's
+    result. "quarantine" moves them to UPLOADS_QUARANTINE_FOLDER/<run time>/,
+    from where a file still in use can be moved back; nothing is deleted.
+    """
+    action = current_app.config["UPLOADS_ORPHAN_ACTION"]
+    if action not in ("report", "quarantine"):
+        raise ValueError(f"UPLOADS_ORPHAN_ACTION must be 'report' or 'quarantine', not {action!r}")
+    grace = current_app.config["UPLOADS_ORPHAN_GRACE_HOURS"] * 3600
+    referenced = {url.rsplit("/", 1)[-1] for (url,) in db.session.query(MediaItem.url) if url}
+    referenced.update(name for (name,) in db.session.query(ProgramFile.filename) if name)
+    pending_rosters = {
+        os.path.basename(job.payload.get("file_path", ""))
+        for job in Job.query.filter(Job.name == "children.import", Job.status.in_(("queued", "running")))
+    }
+    quarantine = os.path.join(
+        current_app.config["UPLOADS_QUARANTINE_FOLDER"], datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    )
+
+    orphans = []
+    for label, folder, keep in (
+        ("", current_app.config["BASE_UPLOAD_FOLDER"], referenced),
+        ("children", current_app.config["CHILDREN_UPLOAD_FOLDER"], pending_rosters),
+    ):
+        if not os.path.isdir(folder):
+            continue
+        for entry in os.scandir(folder):
+            if entry.is_file() and entry.name not in keep and time.time() - entry.stat().st_mtime > grace:
+                name = os.path.join(label, entry.name)
+                if action == "quarantine":
+                    os.makedirs(os.path.join(quarantine, label), exist_ok=True)
+                    shutil.move(entry.path, os.path.join(quarantine, name))
+                orphans.append(name)
+    result = {"action": action, "orphans": sorted(orphans)}
+    if action == "quarantine" and orphans:
+        result["moved_to"] = quarantine
+    return result
+
+
+@periodic("homepage.rebuild", "0 * * * *")
+def rebuild_homepage():
+    """Keep the precomputed homepage warm (e.g. on a fresh disk after a deploy)."""
+    return {"etag": snapshots.build_homepage()}
+
+
+@periodic("classes.reassign", "0 4 * * 0")
+def reassign_classes():
+    """Re-apply the age bands before Sunday service (see app/class_bands.py)."""
+    return class_bands.reassign()
+
+
+@periodic("ledger.close", "30 2 1 * *")
+def close_ledger():
+    """Close last month (and any earlier month still open) in the finance ledger."""
+    return {"closed": [p["period_start"] for p in ledger.close_periods()]}
+
+
+@periodic("children.promote", "5 0 * * *")
+def promote_children():
+    """Age birthday children since the last promotion and move those that left their band."""
+    last = (
+        ScheduledRun.query.filter_by(name="children.promote", status="done")
+        .order_by(ScheduledRun.scheduled_for.desc())
+        .first()
+    )
+    since = (last.result or {}).get("through") if last else None
+    return class_bands.promote(since=date.fromisoformat(since) if since else None)
@@ -1,8 +1,10 @@
 # app/models.py
-from datetime import datetime
+from datetime import date, datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from .extensions import db
-from sqlalchemy import event
+from .money import MoneyType
+from .serializers import dump, iso
+from sqlalchemy import event, func, inspect, select
 
 
 # Association table for many-to-many: Event <-> Media (optional)
@@ -64,19 +66,23 @@ class User(db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "username": self.username,
-            "name": self.name,
-            "phone": self.phone,
-            "email": self.email,
-            "role": self.role,
-            "bio": self.bio,
-            "profile_pic": self.profile_pic,
-            "must_change_password": self.must_change_password,
-            "is_active": self.is_active,
-        }
+    FIELDS = {
+        "id": "id",
+        "username": "username",
+        "name": "name",
+        "phone": "phone",
+        "email": "email",
+        "role": "role",
+        "bio": "bio",
+        "profile_pic": "profile_pic",
+        "must_change_password": "must_change_password",
+        "is_active": "is_active",
+    }
+    # what the teachers table shows; bio stays on the single-teacher view
+    LIST_FIELDS = ["id", "name", "username", "phone", "profile_pic", "must_change_password"]
+
+    def to_dict(self, fields=None):
+        return dump(self, fields)
 
 class SundayClass(db.Model):
     """
@@ -89,6 +95,7 @@ class SundayClass(db.Model):
     min_age = db.Column(db.Integer, nullable=True)
     max_age = db.Column(db.Integer, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     children = db.relationship("Child", backref="sunday_class", lazy="dynamic")
     timetable_entries = db.relationship("TimetableEntry", backref="sunday_class", lazy="dynamic")
@@ -115,32 +122,38 @@ class Child(db.Model):
     __tablename__ = "children"
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
-    age = db.Column(db.Integer)
+    age = db.Column(db.Integer)  # kept current from date_of_birth when that is known
+    date_of_birth = db.Column(db.Date, index=True)
     gender = db.Column(db.String(20))
     parent_name = db.Column(db.String(150))
     parent_contact = db.Column(db.String(60))
     added_by_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)  # admin/teacher who added
     class_id = db.Column(db.Integer, db.ForeignKey("sunday_classes.id"), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
     attendance_records = db.relationship("Attendance", backref="child", lazy=True, cascade="all,delete-orphan",passive_deletes=True)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "age": self.age,
-            "gender": self.gender,
-            "parent_name": self.parent_name,
-            "parent_contact": self.parent_contact,
-            "class_id": self.class_id,
-            "created_at": self.created_at.isoformat(),
-        }
+    FIELDS = {
+        "id": "id",
+        "name": "name",
+        "age": "age",
+        "date_of_birth": ("date_of_birth", iso),
+        "gender": "gender",
+        "parent_name": "parent_name",
+        "parent_contact": "parent_contact",
+        "class_id": "class_id",
+        "created_at": "created_at",
+    }
+
+    def to_dict(self, fields=None):
+        return dump(self, fields)
 
 
 
 
+# default bands for seeding sunday_classes; assignment itself reads the table
 AGE_RANGES = {
     "Gifted Brains": (0, 3),
     "Beginners": (3, 6),
@@ -149,27 +162,59 @@ AGE_RANGES = {
     "Teens": (13, 18),
 }
 
+
+def band_class_id(age):
+    """
+    SQL for the id of the class whose band holds `age` (min_age <= age < max_age,
+    lowest band first); NULL when none does. `age` may be a value or a column.
+    """
+    return (
+        select(SundayClass.id)
+        .where(SundayClass.min_age <= age, SundayClass.max_age > age)
+        .order_by(SundayClass.min_age, SundayClass.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def age_on(date_of_birth, day):
+    """Whole years old on `day` (someone born on 29 February turns a year older on 1 March)."""
+    return day.year - date_of_birth.year - ((day.month, day.day) < (date_of_birth.month, date_of_birth.day))
+
+
 def assign_class(target):
+    """
+    Put the child in its age band's class. The lookup is embedded in the
+    INSERT/UPDATE itself (no extra query); an age outside every band keeps
+    the class the child was given.
+    """
     if target.age is None:
         return
     try:
         age = int(target.age)
     except (ValueError, TypeError):
         return
-    for class_name, (min_age, max_age) in AGE_RANGES.items():
-        if min_age <= age < max_age:
-            cls = db.session.query(SundayClass).filter_by(name=class_name).first()
-            if cls:
-                target.class_id = cls.id
-            break
+    current = target.class_id
+    target.class_id = func.coalesce(band_class_id(age), current)
+
+def sync_age(target):
+    """A known date of birth wins over whatever age was sent with it."""
+    if target.date_of_birth is not None:
+        target.age = age_on(target.date_of_birth, date.today())
 
 @event.listens_for(Child, "before_insert")
 def auto_assign_class_insert(mapper, connection, target):
+    sync_age(target)
     assign_class(target)
 
 @event.listens_for(Child, "before_update")
 def auto_assign_class_update(mapper, connection, target):
-    assign_class(target)
+    # only an age (or birth date) change can move a child; a manual class change is kept
+    attrs = inspect(target).attrs
+    if attrs.date_of_birth.history.has_changes() or attrs.age.history.has_changes():
+        sync_age(target)
+    if attrs.age.history.has_changes():
+        assign_class(target)
 
     
 
@@ -180,6 +225,10 @@ class Attendance(db.Model):
     - recorded_by: user id (teacher)
     """
     __tablename__ = "attendance"
+    __table_args__ = (
+        db.Index("ix_attendance_child_id_date", "child_id", "date"),  # mark_attendance, matrix
+        db.Index("ix_attendance_date_class_id", "date", "class_id"),  # kpi, date ranges
+    )
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     child_id = db.Column(db.Integer, db.ForeignKey("children.id",ondelete="CASCADE"), nullable=False)
@@ -188,6 +237,7 @@ class Attendance(db.Model):
     recorded_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     remarks = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # relationships
     recorder = db.relationship("User", foreign_keys=[recorded_by])
@@ -196,18 +246,27 @@ class Offering(db.Model):
     """
     Offerings per class per date (totals).
     - class_id: which class gave this offering
-    - amount: integer/float in smallest currency unit or float
+    - amount: Money, stored as integer cents (app/money.py)
     - recorded_by: user who recorded the offering
     - note: optional
     """
     __tablename__ = "offerings"
+    # one total per class and day (and one unassigned total per day, since
+    # NULLs never collide); writes go through app/offerings.py upserts
+    __table_args__ = (
+        db.Index("uq_offerings_class_id_date", "class_id", "date", unique=True),
+        db.Index("uq_offerings_unassigned_date", "date", unique=True,
+                 postgresql_where=db.text("class_id IS NULL"), sqlite_where=db.text("class_id IS NULL")),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False, index=True)
     class_id = db.Column(db.Integer, db.ForeignKey("sunday_classes.id"), nullable=True)
-    amount = db.Column(db.Numeric(12, 2), nullable=False, default=0.0)
+    amount = db.Column(MoneyType, nullable=False, default=0)
     recorded_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     note = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     recorder = db.relationship("User", foreign_keys=[recorded_by])
     sunday_class = db.relationship("SundayClass", foreign_keys=[class_id])
@@ -235,31 +294,24 @@ class TimetableEntry(db.Model):
 
     @property
     def class_name(self):
-        if not self.class_id:
-            return None
-        cls = SundayClass.query.get(self.class_id)
-        return cls.name if cls else None
+        # sunday_class / teacher are the backrefs from SundayClass and User;
+        # listings joinedload them so this never costs a query per row
+        return self.sunday_class.name if self.sunday_class else None
 
     @property
     def teacher_name(self):
-        if not self.teacher_id:
-            return None
-        teacher = User.query.get(self.teacher_id)
-        return teacher.username if teacher else None
+        return self.teacher.username if self.teacher else None
     # Relationships
 
 
     def to_dict(self):
-        cls = SundayClass.query.get(self.class_id) if self.class_id else None
-        teacher = User.query.get(self.teacher_id) if self.teacher_id else None
-
         return {
         "id": self.id,
         "date": self.date.strftime("%Y-%m-%d"),
         "class_id": self.class_id,
-        "class_name": cls.name if cls else None,
+        "class_name": self.class_name,
         "teacher_id": self.teacher_id,
-        "teacher_name": teacher.username if teacher else None,
+        "teacher_name": self.teacher_name,
         "topic": self.topic,
         "bible_reference": self.bible_reference,
         "resources": self.resources,
@@ -287,18 +339,20 @@ class Event(db.Model):
     media = db.relationship("MediaItem", secondary=event_media, backref="events")
 
 
-    def to_dict(self):
+    FIELDS = {
+        "id": "id",
+        "headline": "headline",
+        "message": "message",
+        "start_date": ("start_date", iso),
+        "end_date": ("end_date", iso),
+        "created_by": "created_by",
+        "created_at": ("created_at", iso),
+        "media": ("media", lambda media: [m.to_dict() for m in media]),
+    }
+
+    def to_dict(self, fields=None):
         """Serialize event to dictionary"""
-        return {
-            "id": self.id,
-            "headline": self.headline,
-            "message": self.message,
-            "start_date": self.start_date.isoformat() if self.start_date else None,
-            "end_date": self.end_date.isoformat() if self.end_date else None,
-            "created_by": self.created_by,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "media": [m.to_dict() for m in self.media] if self.media else []
-        }
+        return dump(self, fields)
     
 
 
@@ -345,8 +399,8 @@ class FinanceEntry(db.Model):
     
     # Income-specific fields
     service_type = db.Column(db.String(120), nullable=True)  # Sunday, Midweek, etc.
-    main_church = db.Column(db.Numeric(12, 2), default=0.0)
-    children_ministry = db.Column(db.Numeric(12, 2), default=0.0)
+    main_church = db.Column(MoneyType, default=0)  # Money in cents, like every amount below
+    children_ministry = db.Column(MoneyType, default=0)
     
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -357,13 +411,13 @@ class FinanceEntry(db.Model):
         return {
             "id": self.id,
             "type": "income",
-            "date": self.date.strftime("%Y-%m-%d"),
+            "date": self.date,
             "service_type": self.service_type,
-            "main_church": float(self.main_church),
-            "children_ministry": float(self.children_ministry),
+            "main_church": self.main_church,
+            "children_ministry": self.children_ministry,
             "amount": 0,           # kept for compatibility
             "details": None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at,
         }
 
 
@@ -372,7 +426,7 @@ class Expenditure(db.Model):
     __tablename__ = "expenditures"
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False, index=True)
-    amount = db.Column(db.Numeric(12, 2), nullable=False)
+    amount = db.Column(MoneyType, nullable=False)
     details = db.Column(db.String(255), nullable=False)  # e.g. "Rent – Main Hall"
 
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
@@ -384,13 +438,13 @@ class Expenditure(db.Model):
         return {
             "id": self.id,
             "type": "expenditure",
-            "date": self.date.strftime("%Y-%m-%d"),
+            "date": self.date,
             "service_type": None,
             "main_church": 0,
             "children_ministry": 0,
-            "amount": float(self.amount),
+            "amount": self.amount,
             "details": self.details,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at,
         }
 
 
@@ -471,16 +525,18 @@ class Mission(db.Model):
     # Relationship: one mission has many partners
     partners = db.relationship("MissionPartner", backref="mission", cascade="all, delete-orphan")
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "date": self.date.isoformat() if self.date else None,
-            "location": self.location,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "souls_won":self.souls_won,
-            "partners": [p.to_dict() for p in self.partners]  # include all partners
-        }
+    FIELDS = {
+        "id": "id",
+        "title": "title",
+        "date": ("date", iso),
+        "location": "location",
+        "created_at": ("created_at", iso),
+        "souls_won": "souls_won",
+        "partners": ("partners", lambda partners: [p.to_dict() for p in partners]),
+    }
+
+    def to_dict(self, fields=None):
+        return dump(self, fields)
 
 
 class MissionPartner(db.Model):
@@ -490,7 +546,7 @@ class MissionPartner(db.Model):
     mission_id = db.Column(db.Integer, db.ForeignKey("missions.id"), nullable=False)
 
     name = db.Column(db.String(120), nullable=False)
-    support = db.Column(db.Float, nullable=True)  # numeric support (optional)
+    support = db.Column(MoneyType, nullable=True)  # pledged support in cents (optional)
     contact = db.Column(db.String(120), nullable=True)
 
     def to_dict(self):
@@ -518,6 +574,10 @@ class Department(db.Model):
     # optional: many-to-many with users (teachers, admins, members)
     members = db.relationship("User", backref="department", lazy=True)
 
+    # counted in SQL with the department row instead of loading every member
+    member_count = db.column_property(
+        select(func.count(User.id)).where(User.department_id == id).correlate_except(User).scalar_subquery()
+    )
 
     def to_dict(self):
         return {
@@ -528,7 +588,7 @@ class Department(db.Model):
             "contact_phone": self.contact_phone,
             "contact_email": self.contact_email,
             # optionally include member count
-            "member_count": len(self.members) if self.members else 0
+            "member_count": self.member_count or 0
         }
 
 
@@ -587,17 +647,17 @@ class Member(db.Model):
     home_church = db.relationship("HomeChurch", backref="members_list", lazy=True)
 
 
-    def to_dict(self):
-        return {
-        "id": self.id,
-        "full_name": self.full_name,
-        "phone": self.phone,
-        "residence": self.residence,
-        
-        
-        "department_id": self.department_id
+    FIELDS = {
+        "id": "id",
+        "full_name": "full_name",
+        "phone": "phone",
+        "residence": "residence",
+        "department_id": "department_id",
     }
 
+    def to_dict(self, fields=None):
+        return dump(self, fields)
+
 
 
 
@@ -620,19 +680,21 @@ class Visitor(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "full_name": self.full_name,
-            "name": self.full_name,  # keep 'name' if frontend expects it
-            "phone": self.phone,
-            "email": self.email,
-            "residence": self.residence,
-            "prayer_request": self.prayer_request,
-            "visit_date": self.date_of_visit.isoformat() if self.date_of_visit else None,
-            "follow_up_status": self.follow_up_status
+    FIELDS = {
+        "id": "id",
+        "full_name": "full_name",
+        "name": "full_name",  # keep 'name' if frontend expects it
+        "phone": "phone",
+        "email": "email",
+        "residence": "residence",
+        "prayer_request": "prayer_request",
+        "visit_date": ("date_of_visit", iso),
+        "follow_up_status": "follow_up_status",
     }
 
+    def to_dict(self, fields=None):
+        return dump(self, fields)
+
 
 
 
@@ -740,15 +802,17 @@ class Program(db.Model):
         lazy=True
     )
 
-    def to_dict(self):
-        return {
-        "id": self.id,
-        "description": self.description,
-        "coordinator": self.coordinator,
-        "date": self.date,
-        "files": [file.to_dict() for file in self.files]   # ← FIX
+    FIELDS = {
+        "id": "id",
+        "description": "description",
+        "coordinator": "coordinator",
+        "date": "date",
+        "files": ("files", lambda files: [file.to_dict() for file in files]),
     }
 
+    def to_dict(self, fields=None):
+        return dump(self, fields)
+
 
 class ProgramFile(db.Model):
     __tablename__ = "program_files"
@@ -787,3 +851,159 @@ class DepartmentMember(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
+
+
+
+
+# -------------------------------
+# CHANGE LOG
+# -------------------------------
+
+class ChangeLog(db.Model):
+    """
+    One row per insert/update/delete on a tracked table (see app/changes.py).
+    The id sequence doubles as a change counter for in-memory indexes.
+    - op: 'insert' | 'update' | 'delete' | 'bulk' (bulk = reload everything)
+    """
+    __tablename__ = "change_log"
+    __table_args__ = (db.Index("ix_change_log_table_name_id", "table_name", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(60), nullable=False)
+    row_id = db.Column(db.Integer, nullable=True)
+    op = db.Column(db.String(10), nullable=False)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class CacheGeneration(db.Model):
+    """
+    Per-table counter behind the aggregate cache's keys (see app/cache.py),
+    bumped after every commit that writes the table so every process sees it.
+    """
+    __tablename__ = "cache_generations"
+
+    table_name = db.Column(db.String(60), primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+
+
+# -------------------------------
+# BACKGROUND JOBS
+# -------------------------------
+
+class Job(db.Model):
+    """
+    One unit of background work (see app/jobs.py).
+    - status: 'queued' | 'running' | 'done' | 'failed'
+    - run_at: not claimed before this time (retry backoff)
+    - locked_until: a 'running' job whose worker has not finished by then is
+      claimed again (visibility timeout)
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (db.Index("ix_jobs_status_run_at", "status", "run_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(80), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(10), nullable=False, default="queued")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    locked_by = db.Column(db.String(120), nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_by = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    FIELDS = {
+        "id": "id",
+        "name": "name",
+        "status": "status",
+        "attempts": "attempts",
+        "max_attempts": "max_attempts",
+        "run_at": ("run_at", iso),
+        "result": "result",
+        "error": "error",
+        "created_at": ("created_at", iso),
+        "finished_at": ("finished_at", iso),
+    }
+
+    def to_dict(self, fields=None):
+        return dump(self, fields)
+
+
+class ScheduledRun(db.Model):
+    """
+    History of periodic maintenance runs (see app/scheduler.py).
+    The unique (name, scheduled_for) pair is the lock: every worker's
+    scheduler tries to insert the row for a due tick and only the one whose
+    INSERT succeeds runs it.
+    - trigger: 'schedule' | 'manual'
+    - status: 'running' | 'done' | 'failed'
+    """
+    __tablename__ = "scheduled_runs"
+    __table_args__ = (
+        db.UniqueConstraint("name", "scheduled_for", name="uq_scheduled_runs_name_scheduled_for"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(80), nullable=False)
+    scheduled_for = db.Column(db.DateTime, nullable=False)
+    trigger = db.Column(db.String(10), nullable=False, default="schedule")
+    status = db.Column(db.String(10), nullable=False, default="running")
+    worker = db.Column(db.String(120), nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    FIELDS = {
+        "id": "id",
+        "name": "name",
+        "scheduled_for": ("scheduled_for", iso),
+        "trigger": "trigger",
+        "status": "status",
+        "result": "result",
+        "error": "error",
+        "started_at": ("started_at", iso),
+        "finished_at": ("finished_at", iso),
+    }
+
+    def to_dict(self, fields=None):
+        return dump(self, fields)
+
+
+class LedgerPeriod(db.Model):
+    """
+    Month-end close of the finance ledger (see app/ledger.py). Closed months
+    form an unbroken run from the first month with entries; editing an entry
+    dated in a closed month reopens that month and every later one.
+    - income / expenditure: the month's totals
+    - closing_balance: balance after every entry up to period_end
+    """
+    __tablename__ = "ledger_periods"
+
+    id = db.Column(db.Integer, primary_key=True)
+    period_start = db.Column(db.Date, nullable=False, unique=True)
+    period_end = db.Column(db.Date, nullable=False, index=True)
+    income = db.Column(MoneyType, nullable=False, default=0)
+    expenditure = db.Column(MoneyType, nullable=False, default=0)
+    closing_balance = db.Column(MoneyType, nullable=False)
+    entries = db.Column(db.Integer, nullable=False, default=0)
+    closed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    closed_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+
+    FIELDS = {
+        "period_start": ("period_start", iso),
+        "period_end": ("period_end", iso),
+        "income": "income",
+        "expenditure": "expenditure",
+        "closing_balance": "closing_balance",
+        "entries": "entries",
+        "closed_at": ("closed_at", iso),
+        "closed_by": "closed_by",
+    }
+
+    def to_dict(self, fields=None):
+        return dump(self, fields)
@@ -0,0 +1,142 @@
+# app/money.py
+"""
+Money stored as integer minor units (cents).
+
+    amount = db.Column(MoneyType, nullable=False)     # BIGINT of cents
+    Offering(amount=250)            # major units in: 250 -> 25000 stored
+    offering.amount                 # Money("250.00")
+    select(func.sum(Offering.amount))   # integer SUM in the database -> Money
+
+Columns keep their names and the API keeps sending and receiving major
+units (KSh): a Money serializes as a JSON number (see app/json_provider.py)
+and formats like a Decimal (f"{m:,.2f}"). Inside, every total is an integer
+SUM and every Python sum is int arithmetic, so nothing is rounded on the way.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from functools import total_ordering
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+SCALE = 100  # minor units per major unit
+CENT = Decimal("0.01")
+
+
+def to_cents(value):
+    """Minor units for a Money, or for a major-unit number/string ("12.5" -> 1250)."""
+    if isinstance(value, Money):
+        return value.cents
+    if isinstance(value, bool):
+        raise TypeError("Not an amount of money: bool")
+    if isinstance(value, int):
+        return value * SCALE
+    if isinstance(value, float):
+        value = repr(value)  # 0.1 means 0.10, not 0.1000000000000000055...
+    return int((Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP) * SCALE).to_integral_value())
+
+
+def parse_amount(value):
+    """
+    Money for an amount a client sent (a JSON number or a numeric string);
+    None and "" stay None. Anything else (text, NaN, lists, ...) is a
+    ValueError, for routes to answer with a 400.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return Money(value)
+    except (TypeError, ValueError, ArithmeticError):  # decimal.InvalidOperation is an ArithmeticError
+        raise ValueError(f"Not an amount of money: {value!r}") from None
+
+
+def _number(other):
+    """`other` as something a Decimal compares (and hashes) exactly, or None."""
+    if isinstance(other, Money):
+        return other.decimal
+    if isinstance(other, (int, float, Decimal)) and not isinstance(other, bool):
+        return other
+    return None
+
+
+@total_ordering
+class Money:
+    __slots__ = ("cents",)
+
+    def __init__(self, value=0):
+        self.cents = to_cents(value)
+
+    @classmethod
+    def from_cents(cls, cents):
+        money = cls.__new__(cls)
+        money.cents = int(cents)
+        return money
+
+    @property
+    def decimal(self):
+        return Decimal(self.cents).scaleb(-2)
+
+    # numbers ---------------------------------------------------------------
+    def __add__(self, other):
+        return Money.from_cents(self.cents + to_cents(other))
+
+    __radd__ = __add__  # sum() starts from 0
+
+    def __sub__(self, other):
+        return Money.from_cents(self.cents - to_cents(other))
+
+    def __rsub__(self, other):
+        return Money.from_cents(to_cents(other) - self.cents)
+
+    def __neg__(self):
+        return Money.from_cents(-self.cents)
+
+    def __abs__(self):
+        return Money.from_cents(abs(self.cents))
+
+    def __bool__(self):
+        return self.cents != 0
+
+    # compared as the exact Decimal value, so Money("250") == 250 == Decimal(250)
+    # hash alike; Money("0.10") != 0.1, as with Decimal("0.10")
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        value = _number(other)
+        return NotImplemented if value is None else self.decimal == value
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        value = _number(other)
+        return NotImplemented if value is None else self.decimal < value
+
+    def __hash__(self):
+        return hash(self.decimal)
+
+    def __float__(self):
+        return self.cents / SCALE
+
+    # output ----------------------------------------------------------------
+    def __format__(self, spec):
+        return format(self.decimal, spec or ".2f")
+
+    def __str__(self):
+        return f"{self.decimal:.2f}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __json__(self):
+        return float(self)
+
+
+class MoneyType(TypeDecorator):
+    """BIGINT column of cents that reads and writes Money (major-unit numbers are accepted)."""
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None or value == "" else to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        # SUM(bigint) comes back as NUMERIC on Postgres; it is still whole cents
+        return None if value is None else Money.from_cents(value)
@@ -0,0 +1,97 @@
+# app/offerings.py
+"""
+Per-class offering totals: one row per (class_id, date), enforced by the
+unique index uq_offerings_class_id_date. NULLs never collide in that index,
+so offerings without a class have their own partial unique index on date
+(uq_offerings_unassigned_date) and their own conflict target below.
+
+Every write is a single statement, so two teachers saving the same class at
+the same moment end up with one row (the last save), never two:
+    upsert(rows)             INSERT ... ON CONFLICT (class_id, date) DO UPDATE
+                             SET amount = excluded.amount
+    upsert(rows, add=True)   ... SET amount = offerings.amount + excluded.amount
+    remove(class_id, day)    DELETE ... RETURNING
+
+Postgres and SQLite (3.24+) share the syntax. These are Core statements, so
+the change log rows for sync are written here rather than by the flush hook.
+
+Each write returns the stored amount and a "version": the id of its
+change_log row. A write to a row another transaction holds waits for that
+commit, so the later write to a (class, day) always has the higher version.
+Live dashboards replace a class's total with the newest version rather
+than adding differences read before the write, which concurrent saves
+would get wrong.
+"""
+from datetime import datetime
+from sqlalchemy import delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from . import changes
+from .extensions import db
+from .models import Offering
+
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _insert():
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in UPSERT_DIALECTS:
+        raise NotImplementedError(f"No offering upsert for {dialect!r}")
+    return UPSERT_DIALECTS[dialect](Offering)
+
+
+def upsert(rows, add=False):
+    """
+    Write [{"class_id", "date", "amount", "recorded_by"?, "note"?}, ...] (at
+    most one row per class and date) in one statement, two when rows without
+    a class come along: the day's amount is replaced, or with `add`
+    increased. A note left out keeps the stored one. Returns, per row, the
+    stored {"id", "class_id", "date", "amount", "note", "recorded_by"} plus
+    its "version".
+    """
+    if not rows:
+        return []
+    now = datetime.utcnow()
+    values = [
+        {"recorded_by": None, "note": None, **row, "created_at": now, "updated_at": now}
+        for row in rows
+    ]
+    table = Offering.__table__
+    written = []
+    for unassigned in (False, True):
+        group = [row for row in values if (row["class_id"] is None) == unassigned]
+        if not group:
+            continue
+        stmt = _insert().values(group)
+        if unassigned:
+            target = {"index_elements": [table.c.date], "index_where": table.c.class_id.is_(None)}
+        else:
+            target = {"index_elements": [table.c.class_id, table.c.date]}
+        stmt = stmt.on_conflict_do_update(
+            **target,
+            set_={
+                "amount": table.c.amount + stmt.excluded.amount if add else stmt.excluded.amount,
+                "recorded_by": func.coalesce(stmt.excluded.recorded_by, table.c.recorded_by),
+                "note": func.coalesce(stmt.excluded.note, table.c.note),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(Offering.id, Offering.class_id, Offering.date, Offering.amount, Offering.note,
+                    Offering.recorded_by)
+        written.extend(dict(row._mapping) for row in db.session.execute(stmt))
+
+    versions = changes.record_ids("offerings", [row["id"] for row in written])
+    for row, version in zip(written, versions):
+        row["version"] = version
+    return written
+
+
+def remove(class_id, day):
+    """Delete the class's offering for `day`; returns {"amount" removed, "version"}, or None."""
+    removed = db.session.execute(
+        delete(Offering)
+        .where(Offering.class_id == class_id, Offering.date == day)
+        .returning(Offering.id, Offering.amount)
+    ).first()
+    if removed is None:
+        return None
+    [version] = changes.record_ids("offerings", [removed.id], op="delete")
+    return {"amount": removed.amount, "version": version}
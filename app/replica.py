@@ -0,0 +1,58 @@
+# app/replica.py
+"""
+Read-replica routing, enabled by a "replica" bind:
+
+    SQLALCHEMY_BINDS = {"replica": "postgresql+psycopg2://...replica..."}
+    (or DATABASE_REPLICA_URL in the environment)
+
+- GET/HEAD requests read from the replica; anything else uses the primary.
+- A request that writes switches to the primary for the rest of its reads
+  (RoutingSession in app/extensions.py).
+- After a write the response sets a short-lived cookie, and the
+  same client's GETs go to the primary for REPLICA_STICKY_SECONDS, so it
+  never reads a replica that has not caught up with its own write.
+- Code outside a request (exports, CLI jobs) opts in with `with replica_reads():`.
+
+Without a replica bind none of this is installed and db.session behaves as before.
+"""
+from contextlib import contextmanager
+from flask import current_app, g, request
+from .extensions import REPLICA_BIND, db
+
+STICKY_COOKIE = "cm_primary"
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def init_app(app):
+    app.config.setdefault("REPLICA_STICKY_SECONDS", 10)
+    if REPLICA_BIND not in (app.config.get("SQLALCHEMY_BINDS") or {}):
+        return
+    app.before_request(_route_reads)
+    app.after_request(_stick_after_write)
+
+
+def _route_reads():
+    g.read_replica = request.method in READ_METHODS and STICKY_COOKIE not in request.cookies
+
+
+def _stick_after_write(response):
+    if db.session.info.get("wrote"):
+        response.set_cookie(
+            STICKY_COOKIE, "1",
+            max_age=int(current_app.config["REPLICA_STICKY_SECONDS"]),
+            httponly=True, secure=request.is_secure,
+            # the frontend is on another site; SameSite=None needs HTTPS
+            samesite="None" if request.is_secure else "Lax",
+        )
+    return response
+
+
+@contextmanager
+def replica_reads():
+    """Send this block's reads to the replica (no-op without one)."""
+    previous = g.get("read_replica")
+    g.read_replica = True
+    try:
+        yield
+    finally:
+        g.read_replica = previous
@@ -1,16 +1,14 @@
 from flask import Blueprint, request, jsonify,send_file
 
 from flask_jwt_extended import jwt_required,get_jwt_identity
-from datetime import datetime
-from app.models import  FinanceEntry, Project, Mission, Department, NewMember,Expenditure,MissionPartner,DepartmentMember
+from datetime import date, datetime
+from app.models import  FinanceEntry, Project, Mission, Department, NewMember,Expenditure,MissionPartner,DepartmentMember, LedgerPeriod, User
+from app.serializers import list_fields, load_options
 from app.extensions import db
+from app import cache, jobs, ledger
+from app.money import Money, parse_amount
 from sqlalchemy import and_
 from io import BytesIO
-from docx import Document
-from docx.shared import Inches
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.pdfgen import canvas
 
 
 adults_bp = Blueprint("adults_bp", __name__, url_prefix="/adults")
@@ -23,11 +21,36 @@ adults_bp = Blueprint("adults_bp", __name__, url_prefix="/adults")
 
 
 # ------------ NEW PDF + DOCX EXPORT (supports Income + Expenditure + Net Balance) ------------
+def _finance_totals(incomes, expenditures):
+    """(main church, children ministry, expenditure) totals; Money sums are integer cents."""
+    return (
+        sum((e.main_church or Money() for e in incomes), Money()),
+        sum((e.children_ministry or Money() for e in incomes), Money()),
+        sum((e.amount or Money() for e in expenditures), Money()),
+    )
+
 
+def _amounts(data, *keys):
+    """{key: Money} for the amount keys present in `data`; ValueError names a malformed one."""
+    amounts = {}
+    for key in keys:
+        if key in data:
+            try:
+                amounts[key] = parse_amount(data[key])
+            except ValueError:
+                raise ValueError(f"Invalid {key}: expected a number") from None
+    return amounts
 
 
 @adults_bp.route("/finance/export/pdf", methods=["GET"])
+@jobs.offloadable
+@cache.cached("finance_entries", "expenditures")
 def export_finance_pdf():
+    # reportlab is heavy; import it only when an export actually runs
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas
+
     start_str = request.args.get("start")
     end_str = request.args.get("end")
 
@@ -49,10 +72,8 @@ def export_finance_pdf():
     expenditures = exp_query.all()
 
     # Calculations
-    total_main = sum(float(e.main_church or 0) for e in incomes)
-    total_children = sum(float(e.children_ministry or 0) for e in incomes)
+    total_main, total_children, total_expense = _finance_totals(incomes, expenditures)
     total_income = total_main + total_children
-    total_expense = sum(float(e.amount or 0) for e in expenditures)
     net_balance = total_income - total_expense
 
     buffer = BytesIO()
@@ -111,8 +132,8 @@ def export_finance_pdf():
     p.setFont("Helvetica", 9)
     all_entries = (
         [(e.date, "Income", f"{e.service_type or 'Offering'} (Main)" if e.main_church else f"{e.service_type or 'Offering'} (Children)", 
-          float(e.main_church or e.children_ministry), 0) for e in incomes] +
-        [(e.date, "Expenditure", e.details or "No details", 0, float(e.amount)) for e in expenditures]
+          e.main_church or e.children_ministry or Money(), Money()) for e in incomes] +
+        [(e.date, "Expenditure", e.details or "No details", Money(), e.amount) for e in expenditures]
     )
     all_entries.sort(key=lambda x: x[0], reverse=True)
 
@@ -141,7 +162,13 @@ def export_finance_pdf():
 #------------WORD--------#
 
 @adults_bp.route("/finance/export/docx", methods=["GET"])
+@jobs.offloadable
+@cache.cached("finance_entries", "expenditures")
 def export_finance_docx():
+    # python-docx is heavy; import it only when an export actually runs
+    from docx import Document
+    from docx.shared import RGBColor
+
     start_str = request.args.get("start")
     end_str = request.args.get("end")
 
@@ -161,10 +188,8 @@ def export_finance_docx():
     incomes = income_query.all()
     expenditures = exp_query.all()
 
-    total_main = sum(float(e.main_church or 0) for e in incomes)
-    total_children = sum(float(e.children_ministry or 0) for e in incomes)
+    total_main, total_children, total_expense = _finance_totals(incomes, expenditures)
     total_income = total_main + total_children
-    total_expense = sum(float(e.amount or 0) for e in expenditures)
     net_balance = total_income - total_expense
 
     doc = Document()
@@ -197,7 +222,7 @@ def export_finance_docx():
             row[0].paragraphs[0].runs[0].bold = True
             row[1].paragraphs[0].runs[0].bold = True
             if net_balance < 0:
-                row[1].paragraphs[0].runs[0].font.color.rgb = docx.shared.RGBColor(200, 0, 0)
+                row[1].paragraphs[0].runs[0].font.color.rgb = RGBColor(200, 0, 0)
 
     doc.add_page_break()
 
@@ -212,8 +237,9 @@ def export_finance_docx():
     hdr[4].text = "Expense"
 
     all_entries = (
-        [(e.date, "Income", e.service_type or "Offering", float(e.main_church or e.children_ministry), 0) for e in incomes] +
-        [(e.date, "Expenditure", e.details or "", 0, float(e.amount)) for e in expenditures]
+        [(e.date, "Income", e.service_type or "Offering", e.main_church or e.children_ministry or Money(), Money())
+         for e in incomes] +
+        [(e.date, "Expenditure", e.details or "", Money(), e.amount) for e in expenditures]
     )
     all_entries.sort(key=lambda x: x[0], reverse=True)
 
@@ -254,11 +280,15 @@ def get_all_finances():
 def add_income():
     current_user_id = get_jwt_identity()  # ← this pulls user ID from JWT token
     data = request.get_json()
+    try:
+        amounts = _amounts(data, "main_church", "children_ministry")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     entry = FinanceEntry(
         date=datetime.strptime(data["date"], "%Y-%m-%d"),
         service_type=data.get("service_type"),
-        main_church=data.get("main_church", 0),
-        children_ministry=data.get("children_ministry", 0),
+        main_church=amounts.get("main_church", 0),
+        children_ministry=amounts.get("children_ministry", 0),
         created_by=current_user_id
     )
     db.session.add(entry)
@@ -272,9 +302,15 @@ def add_income():
 def add_expenditure():
     current_user_id = get_jwt_identity()  # ← this pulls user ID from JWT token
     data = request.get_json()
+    try:
+        amount = _amounts(data, "amount").get("amount")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if amount is None:
+        return jsonify({"error": "Amount required"}), 400
     exp = Expenditure(
         date=datetime.strptime(data["date"], "%Y-%m-%d"),
-        amount=data["amount"],
+        amount=amount,
         details=data["details"],
         created_by=current_user_id
     )
@@ -296,21 +332,28 @@ def update_entry(id):\
     if not entry:
         entry = Expenditure.query.get_or_404(id)  # will 404 if not found
 
+    try:
+        amounts = _amounts(data, "main_church", "children_ministry", "amount")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     if isinstance(entry, FinanceEntry):
         if "date" in data:
             entry.date = datetime.strptime(data["date"], "%Y-%m-%d")
         if "service_type" in data:
             entry.service_type = data["service_type"]
         if "main_church" in data:
-            entry.main_church = data["main_church"]
+            entry.main_church = amounts["main_church"]
         if "children_ministry" in data:
-            entry.children_ministry = data["children_ministry"]
+            entry.children_ministry = amounts["children_ministry"]
 
     else:  # Expenditure
         if "date" in data:
             entry.date = datetime.strptime(data["date"], "%Y-%m-%d")
         if "amount" in data:
-            entry.amount = data["amount"]
+            if amounts["amount"] is None:
+                return jsonify({"error": "Amount required"}), 400
+            entry.amount = amounts["amount"]
         if "details" in data:
             entry.details = data["details"]
 
@@ -333,6 +376,60 @@ def delete_finance_entry(id):
     return jsonify({"message": "Deleted"}), 200
 
 
+# ────────────── LEDGER (running balance + month-end closes) ──────────────
+def _parse_day(value):
+    return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+
+
+@adults_bp.route("/finance/ledger", methods=["GET"])
+@jwt_required()
+def get_ledger():
+    try:
+        start = _parse_day(request.args.get("start"))
+        end = _parse_day(request.args.get("end"))
+    except ValueError:
+        return jsonify({"error": "Invalid date format, expected YYYY-MM-DD"}), 400
+    opening, entries = ledger.running(start, end)
+    return jsonify({
+        "opening_balance": opening,
+        "closing_balance": entries[-1]["balance"] if entries else opening,
+        "entries": entries,
+    }), 200
+
+
+@adults_bp.route("/finance/balance", methods=["GET"])
+@jwt_required()
+def get_balance():
+    try:
+        day = _parse_day(request.args.get("date")) or date.today()
+    except ValueError:
+        return jsonify({"error": "Invalid date format, expected YYYY-MM-DD"}), 400
+    return jsonify(ledger.balance_on(day)), 200
+
+
+@adults_bp.route("/finance/periods", methods=["GET"])
+@jwt_required()
+def get_ledger_periods():
+    periods = LedgerPeriod.query.order_by(LedgerPeriod.period_start.desc()).all()
+    return jsonify([p.to_dict() for p in periods]), 200
+
+
+@adults_bp.route("/finance/periods/close", methods=["POST"])
+@jwt_required()
+def close_ledger_periods():
+    user = User.query.get(get_jwt_identity())
+    if not user or user.role != "admin":
+        return jsonify({"error": "Admin required"}), 403
+    data = request.get_json(silent=True) or {}
+    try:
+        through = _parse_day(data.get("through"))
+    except ValueError:
+        return jsonify({"error": "Invalid date format, expected YYYY-MM-DD"}), 400
+    if through and through >= date.today():
+        return jsonify({"error": "Only past months can be closed"}), 400
+    return jsonify(ledger.close_periods(through, closed_by=user.id)), 200
+
+
 # -------------------- PROJECTS --------------------
 @adults_bp.route("/projects", methods=["GET"])
 def get_projects():
@@ -389,8 +486,9 @@ def delete_project(id):
 # -------------------- MISSIONS --------------------
 @adults_bp.route("/missions", methods=["GET"])
 def get_missions():
-    missions = Mission.query.order_by(Mission.date.desc()).all()
-    return jsonify([m.to_dict() for m in missions]), 200
+    fields = list_fields(Mission)
+    missions = Mission.query.options(*load_options(Mission, fields)).order_by(Mission.date.desc()).all()
+    return jsonify([m.to_dict(fields) for m in missions]), 200
 
 
 
@@ -459,11 +557,15 @@ def get_mission_partners(mission_id):
 def add_mission_partner(mission_id):
     Mission.query.get_or_404(mission_id)
     data = request.get_json()
+    try:
+        support = _amounts(data, "support").get("support")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     partner = MissionPartner(
         mission_id=mission_id,
         name=data.get("partner_name"),
-        support=data.get("support"),
+        support=support,
         contact=data.get("contact")
     )
 
@@ -477,11 +579,15 @@ def add_mission_partner(mission_id):
 def update_mission_partner(id):
     partner = MissionPartner.query.get_or_404(id)
     data = request.get_json()
+    try:
+        amounts = _amounts(data, "support")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     if "name" in data:
         partner.name = data["name"]
     if "support" in data:
-        partner.support = data["support"]
+        partner.support = amounts["support"]
     if "contact" in data:
         partner.contact = data["contact"]
 
@@ -500,6 +606,7 @@ def delete_mission_partner(id):
 
 # -------------------- DEPARTMENTS --------------------
 @adults_bp.route("/departments", methods=["GET"])
+@cache.cached("departments", "users")  # member_count
 def get_departments():
     depts = Department.query.all()
     return jsonify([d.to_dict() for d in depts]), 200
@@ -0,0 +1,90 @@
+# app/routes/batch.py
+"""
+POST /api/batch  {"requests": ["/api/reports/kpi", "/api/classes", ...]}
+
+Runs up to BATCH_MAX_REQUESTS relative GETs through the normal blueprints
+inside this one HTTP request and answers
+    {"responses": [{"path": ..., "status": 200, "body": <that endpoint's JSON>}, ...]}
+in the order asked. Sub-requests share this request's app context, so they
+run on one DB session (a repeated User lookup is an identity-map hit), and
+the caller's JWT is verified once here (see BatchJWTManager).
+
+Streams cannot be batched: /api/live/* is refused up front, and any other
+sub-request that answers with a streamed or text/event-stream response is
+closed unread and reported as a 501 item (reading it would never finish).
+"""
+from flask import Blueprint, current_app, g, jsonify, request
+from flask_jwt_extended import get_jwt, jwt_required
+from app.routes.live import live_bp
+
+batch_bp = Blueprint("batch_bp", __name__, url_prefix="/api/batch")
+
+
+def _path(item):
+    path = item.get("path") if isinstance(item, dict) else item
+    if isinstance(item, dict) and item.get("method", "GET").upper() != "GET":
+        return None, "Only GET requests can be batched"
+    if not isinstance(path, str) or not path.startswith("/") or path.startswith("//"):
+        return None, "Each request must be a relative path starting with '/'"
+    if path.split("?", 1)[0].rstrip("/") == request.path.rstrip("/"):
+        return None, "Batches cannot be nested"
+    if (path.split("?", 1)[0].rstrip("/") + "/").startswith(live_bp.url_prefix + "/"):
+        return None, "Live streams cannot be batched"
+    return path, None
+
+
+def _dispatch(path, headers):
+    app = current_app._get_current_object()
+    with app.test_request_context(path, method="GET", headers=headers):
+        try:
+            response = app.full_dispatch_request()
+        except Exception:
+            app.logger.exception("Batched request %s failed", path)
+            return 500, app.json.dumps({"error": "Internal server error"}).encode()
+        # send_file answers are finite (direct_passthrough); a generator may never end
+        if response.mimetype == "text/event-stream" or (response.is_streamed and not response.direct_passthrough):
+            response.close()
+            return 501, app.json.dumps({"error": "Streamed responses cannot be batched"}).encode()
+        response.direct_passthrough = False
+        if response.is_json:
+            return response.status_code, response.get_data()  # spliced in as-is
+        if response.mimetype.startswith("text/"):
+            return response.status_code, app.json.dumps(response.get_data(as_text=True)).encode()
+        return response.status_code, b"null"
+
+
+@batch_bp.route("", methods=["POST"])
+@jwt_required(optional=True)
+def batch():
+    items = (request.get_json(silent=True) or {}).get("requests")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "'requests' must be a non-empty list of paths"}), 400
+    limit = current_app.config["BATCH_MAX_REQUESTS"]
+    if len(items) > limit:
+        return jsonify({"error": f"At most {limit} requests per batch"}), 400
+
+    paths = []
+    for item in items:
+        path, error = _path(item)
+        if error:
+            return jsonify({"error": error, "request": item}), 400
+        paths.append(path)
+
+    headers = {}
+    auth = request.headers.get("Authorization")
+    if auth and get_jwt():
+        headers["Authorization"] = auth
+        g.verified_jwts = {auth.split(None, 1)[-1]: get_jwt()}
+
+    dumps = current_app.json.dumps
+    parts = []
+    try:
+        for path in paths:
+            status, body = _dispatch(path, headers)
+            parts.append(b'{"path":%s,"status":%d,"body":%s}' % (dumps(path).encode(), status, body))
+    finally:
+        g.pop("verified_jwts", None)
+
+    return current_app.response_class(
+        b'{"responses":[' + b",".join(parts) + b"]}", status=200, mimetype="application/json"
+    )
@@ -4,15 +4,21 @@
 # routes/children_routes.py
 from flask import Blueprint, request, jsonify,current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from datetime import datetime, date, timedelta
 from app.models import Child, Attendance, Offering, SundayClass
 from app.extensions import db
+from app import search as search_index
+from app import autocomplete
+from app import jobs, live, offerings
+from app.sqlite import retry_when_locked
+from app.money import parse_amount
+from app.serializers import rows_payload
 from sqlalchemy import text
 import os
+import uuid
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
-from docx import Document
-from openpyxl import load_workbook
 
 
 children_bp = Blueprint("children_bp", __name__, url_prefix="/api/children")
@@ -34,6 +40,8 @@ def get_sundays_between(start_date, end_date):
 # CHILD CRUD
 # ------------------------
 def parse_docx(file_path):
+    from docx import Document  # heavy; only the upload endpoint needs it
+
     doc = Document(file_path)
     rows = []
 
@@ -48,6 +56,8 @@ def parse_docx(file_path):
 
 
 def parse_xlsx(file_path):
+    from openpyxl import load_workbook  # heavy; only the upload endpoint needs it
+
     wb = load_workbook(file_path)
     sheet = wb.active
     rows = []
@@ -61,9 +71,52 @@ def parse_xlsx(file_path):
 
 
 
+@jobs.task("children.import", max_attempts=3)
+def import_children(file_path, user_id):
+    """Add every child listed in an uploaded roster; the file is removed once committed."""
+    if not os.path.exists(file_path):
+        return {"created": 0, "skipped": 0}  # an earlier attempt already committed it
+
+    if file_path.endswith(".docx"):
+        rows = parse_docx(file_path)
+    else:
+        rows = parse_xlsx(file_path)
+
+    created = 0
+    skipped = 0
+    for row in rows:
+        try:
+            name, age, gender, parent_name, parent_contact = row[:5]
+
+            if not name:
+                skipped += 1
+                continue
+
+            child = Child(
+                name=name,
+                age=int(age) if age else None,
+                gender=gender,
+                parent_name=parent_name,
+                parent_contact=parent_contact,
+                added_by_id=user_id,
+            )
+
+            db.session.add(child)
+            created += 1
+
+        except Exception:
+            skipped += 1
+
+    db.session.commit()
+    # 🔥 AUTO DELETE FILE
+    os.remove(file_path)
+    return {"created": created, "skipped": skipped}
+
+
 @children_bp.route("/upload", methods=["POST"])
 @jwt_required()
 def upload_children():
+    """Save the roster and import it in the background; poll the returned job."""
     user_id = get_jwt_identity()
 
     if "file" not in request.files:
@@ -74,58 +127,17 @@ def upload_children():
         return jsonify({"error": "Empty filename"}), 400
 
     filename = secure_filename(file.filename)
-    upload_dir = current_app.config["CHILDREN_UPLOAD_FOLDER"]
-    file_path = os.path.join(upload_dir, filename)
+    if not filename.endswith((".docx", ".xlsx")):
+        return jsonify({"error": "Unsupported file type"}), 400
 
+    # unique name: two uploads of "class.xlsx" must not overwrite each other
+    upload_dir = current_app.config["CHILDREN_UPLOAD_FOLDER"]
+    file_path = os.path.join(upload_dir, f"{uuid.uuid4().hex}_{filename}")
     file.save(file_path)
 
-    created = 0
-    skipped = 0
-
-    try:
-        # -------- Parse file --------
-        if filename.endswith(".docx"):
-            rows = parse_docx(file_path)
-        elif filename.endswith(".xlsx"):
-            rows = parse_xlsx(file_path)
-        else:
-            return jsonify({"error": "Unsupported file type"}), 400
-
-        # -------- Insert rows --------
-        for row in rows:
-            try:
-                name, age, gender, parent_name, parent_contact = row[:5]
-
-                if not name:
-                    skipped += 1
-                    continue
-
-                child = Child(
-                    name=name,
-                    age=int(age) if age else None,
-                    gender=gender,
-                    parent_name=parent_name,
-                    parent_contact=parent_contact,
-                    added_by_id=user_id,
-                )
-
-                db.session.add(child)
-                created += 1
-
-            except Exception:
-                skipped += 1
-
-        db.session.commit()
-
-        return jsonify({
-            "created": created,
-            "skipped": skipped
-        }), 201
-
-    finally:
-        # 🔥 AUTO DELETE FILE
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    job = jobs.enqueue("children.import", file_path=file_path, user_id=user_id)
+    db.session.commit()
+    return jobs.accepted(job)
 
 # GET all children (optionally by class or search)
 @children_bp.route("/", methods=["GET"])
@@ -133,36 +145,33 @@ def list_children():
     search = request.args.get("search", "").strip()
     class_filter = request.args.get("class")
 
-    q = Child.query
+    # one joined select; rows go straight to JSON without building Child objects
+    stmt = (
+        select(
+            Child.id, Child.name, Child.age, Child.date_of_birth, Child.gender, Child.parent_name,
+            Child.parent_contact, Child.class_id, SundayClass.name.label("class_name"),
+        )
+        .select_from(Child)
+        .outerjoin(SundayClass, SundayClass.id == Child.class_id)
+        .order_by(Child.id.desc())
+    )
     if search:
-        q = q.filter(Child.name.ilike(f"%{search}%"))
-
-    children = q.order_by(Child.id.desc()).all()
+        stmt = stmt.where(search_index.name_filter("child", Child, search))
+    if class_filter:
+        stmt = stmt.where(SundayClass.name == class_filter)
 
-    # Fetch all classes once
-    classes = {c.id: c.name for c in SundayClass.query.all()}
+    return jsonify(rows_payload(stmt)), 200
 
-    result = []
-    for c in children:
-        # Use stored class_id instead of dynamic age calculation
-        class_name = classes.get(c.class_id)
 
-        # Apply class filter if provided
-        if class_filter and class_name != class_filter:
-            continue
-
-        result.append({
-            "id": c.id,
-            "name": c.name,
-            "age": c.age,
-            "gender": c.gender,
-            "parent_name": c.parent_name,
-            "parent_contact": c.parent_contact,
-            "class_id": c.class_id,
-            "class_name": class_name
-        })
-
-    return jsonify(result), 200
+# GET name autocomplete for the check-in screen (served from the in-memory prefix index)
+@children_bp.route("/autocomplete", methods=["GET"])
+def autocomplete_children():
+    prefix = request.args.get("q", "").strip()
+    class_id = request.args.get("class_id", type=int)
+    limit = request.args.get("limit", autocomplete.DEFAULT_LIMIT, type=int)
+    if not prefix:
+        return jsonify([]), 200
+    return jsonify(autocomplete.lookup(prefix, class_id=class_id, limit=limit)), 200
 
 
 #---------------DISPLAY ATTENDANCE-------#
@@ -185,12 +194,11 @@ def get_attendance_range():
             ORDER BY date DESC
         """)
 
-        result = db.session.execute(sql, {"start": start_date, "end": end_date}).fetchall()
-        # Convert rows to list of dicts
-        rows = [dict(r._mapping) for r in result]
-
+        rows = rows_payload(sql, {"start": start_date, "end": end_date})
         return jsonify(rows), 200
 
+    except HTTPException:
+        raise  # e.g. the 400 for an unknown ?fields= name
     except Exception as e:
         print("Attendance range error:", e)
         return jsonify({"error": "Server error"}), 500
@@ -198,6 +206,14 @@ def get_attendance_range():
 
 
 
+def _date_of_birth(data, default=None):
+    """date_of_birth from the payload (YYYY-MM-DD, null clears it); ValueError if malformed."""
+    if "date_of_birth" not in data:
+        return default
+    raw = data["date_of_birth"]
+    return datetime.strptime(raw, "%Y-%m-%d").date() if raw else None
+
+
 # POST add a new child
 @children_bp.route("/", methods=["POST"])
 @jwt_required(optional=True)
@@ -206,29 +222,22 @@ def add_child():
     name = data.get("name")
     if not name:
         return jsonify({"error": "Name required"}), 400
+    try:
+        date_of_birth = _date_of_birth(data)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid date_of_birth, expected YYYY-MM-DD"}), 400
 
     child = Child(
         name=name,
         age=data.get("age"),
+        date_of_birth=date_of_birth,
         gender=data.get("gender"),
         parent_name=data.get("parent_name") or data.get("parent"),
         parent_contact=data.get("parent_contact") or data.get("contact"),
         class_id=data.get("class_id"),
         added_by_id=get_jwt_identity()
     )
-    # --- AUTOMATIC CLASS ASSIGNMENT ---
-    if child.age is not None:
-        sunday_classes = SundayClass.query.all()
-    assigned_class = None
-    for sc in sunday_classes:
-        if sc.min_age is not None and sc.max_age is not None:
-            if sc.min_age <= child.age <= sc.max_age:
-                assigned_class = sc
-                break
-    if assigned_class:
-        child.class_id = assigned_class.id
-
-    # ----------------------------------
+    # age follows date_of_birth and class the age band (listeners in app/models.py)
     db.session.add(child)
     db.session.commit()
     return jsonify({"id": child.id}), 201
@@ -239,6 +248,10 @@ def add_child():
 def update_child(id):
     child = Child.query.get_or_404(id)
     data = request.get_json() or {}
+    try:
+        child.date_of_birth = _date_of_birth(data, child.date_of_birth)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid date_of_birth, expected YYYY-MM-DD"}), 400
     child.name = data.get("name", child.name)
     child.age = data.get("age", child.age)
     child.gender = data.get("gender", child.gender)
@@ -264,6 +277,7 @@ def delete_child(id):
 # POST mark attendance for a child
 @children_bp.route("/<int:child_id>/attendance", methods=["POST"])
 @jwt_required()
+@retry_when_locked
 def mark_attendance(child_id):
     child = Child.query.get_or_404(child_id)
     data = request.get_json() or {}
@@ -280,6 +294,7 @@ def mark_attendance(child_id):
     remarks = data.get("remarks")
 
     rec = Attendance.query.filter_by(child_id=child.id, date=dt).first()
+    was_present = bool(rec and rec.present)
     if rec:
         rec.present = present
         rec.remarks = remarks
@@ -294,6 +309,8 @@ def mark_attendance(child_id):
             remarks=remarks
         )
         db.session.add(rec)
+    if present != was_present:
+        live.queue_event("attendance", date=dt, class_id=rec.class_id, delta=1 if present else -1)
     db.session.commit()
     return jsonify({"id": rec.id, "child_id": rec.child_id, "date": rec.date.isoformat(), "present": rec.present}), 201
 
@@ -363,6 +380,7 @@ def attendance_matrix(child_id):
 # POST add offering
 @children_bp.route("/offerings", methods=["POST"])
 @jwt_required()
+@retry_when_locked
 def add_offering():
     data = request.get_json() or {}
     dt_str = data.get("date")
@@ -374,20 +392,28 @@ def add_offering():
             return jsonify({"error": "Invalid date format"}), 400
 
     class_id = data.get("class_id")
-    amount = data.get("amount")
+    try:
+        amount = parse_amount(data.get("amount"))
+    except ValueError:
+        return jsonify({"error": "Invalid amount"}), 400
     if amount is None:
         return jsonify({"error": "Amount required"}), 400
-
-    offering = Offering(
-        date=dt,
-        class_id=class_id,
-        amount=amount,
-        recorded_by=get_jwt_identity(),
-        note=data.get("note")
-    )
-    db.session.add(offering)
+    try:
+        class_id = int(class_id) if class_id is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid class_id"}), 400
+
+    # adds to the class's total for the day (one row per class and date)
+    [offering] = offerings.upsert([{
+        "date": dt, "class_id": class_id, "amount": amount,
+        "recorded_by": get_jwt_identity(), "note": data.get("note"),
+    }], add=True)
+    live.queue_event("offering", date=dt, class_id=offering["class_id"],
+                     amount=offering["amount"], version=offering["version"])
     db.session.commit()
-    return jsonify({"id": offering.id, "date": offering.date.isoformat(),"class_id":offering.class_id, "amount": float(offering.amount),"note":offering.note,"recorded_by":offering.recorded_by}), 201
+    return jsonify({"id": offering["id"], "date": offering["date"].isoformat(), "class_id": offering["class_id"],
+                    "amount": offering["amount"], "note": offering["note"],
+                    "recorded_by": offering["recorded_by"]}), 201
 
 # GET offerings
 @children_bp.route("/offerings", methods=["GET"])
@@ -396,32 +422,26 @@ def list_offerings():
     start = request.args.get("start")
     end = request.args.get("end")
     class_id = request.args.get("class_id")
-    q = Offering.query
+    q = select(
+        Offering.id, Offering.date, Offering.class_id, Offering.amount,
+        Offering.note, Offering.recorded_by,
+    )
     if start:
         try:
             s = datetime.strptime(start, "%Y-%m-%d").date()
-            q = q.filter(Offering.date >= s)
+            q = q.where(Offering.date >= s)
         except:
             pass
     if end:
         try:
             e = datetime.strptime(end, "%Y-%m-%d").date()
-            q = q.filter(Offering.date <= e)
+            q = q.where(Offering.date <= e)
         except:
             pass
     if class_id:
-        q = q.filter(Offering.class_id == class_id)
+        q = q.where(Offering.class_id == class_id)
 
-    items = q.order_by(Offering.date.desc()).all()
-    out = [{
-        "id": o.id,
-        "date": o.date.isoformat(),
-        "class_id": o.class_id,
-        "amount": float(o.amount),
-        "note": o.note,
-        "recorded_by": o.recorded_by
-    } for o in items]
-    return jsonify(out), 200
+    return jsonify(rows_payload(q.order_by(Offering.date.desc()))), 200
 
 
 
@@ -429,59 +449,104 @@ def list_offerings():
 
 
 # PATCH update today's offering for a class
-@children_bp.route("/offerings/<string:class_id>/today", methods=["PATCH"])
+@children_bp.route("/offerings/<int:class_id>/today", methods=["PATCH"])
 # @jwt_required()
+@retry_when_locked
 def update_today_offering(class_id):
     data = request.get_json() or {}
-    amount = data.get("amount")
+    try:
+        amount = parse_amount(data.get("amount"))
+    except ValueError:
+        return jsonify({"error": "Invalid amount"}), 400
 
     if amount is None:
         return jsonify({"error": "Amount required"}), 400
 
     today = date.today()
-
-    offering = Offering.query.filter_by(
-        class_id=class_id,
-        date=today
-    ).first()
-
-    if not offering:
-        # create new offering if it doesn't exist
-        offering = Offering(class_id=class_id, date=today, amount=amount)
-        db.session.add(offering)
-    else:
-        # update existing
-        offering.amount = amount
-
+    # one INSERT ... ON CONFLICT: concurrent saves can't create a second row
+    [offering] = offerings.upsert([{"class_id": class_id, "date": today, "amount": amount}])
+    live.queue_event("offering", date=today, class_id=class_id,
+                     amount=offering["amount"], version=offering["version"])
     db.session.commit()
 
     return jsonify({
-        "id": offering.id,
-        "class_id": offering.class_id,
-        "date": offering.date.isoformat(),
-        "amount": float(offering.amount)
+        "id": offering["id"],
+        "class_id": offering["class_id"],
+        "date": offering["date"].isoformat(),
+        "amount": offering["amount"]
     }), 200
 
 
+# PUT record offerings for several classes at once
+@children_bp.route("/offerings/bulk", methods=["PUT"])
+@jwt_required()
+@retry_when_locked
+def record_offerings():
+    """
+    {"date": "YYYY-MM-DD" (default today), "offerings": [{"class_id": 1, "amount": 250, "note": ...}, ...]}
+    sets each listed class's total for the day in a single upsert.
+    """
+    data = request.get_json() or {}
+    dt = date.today()
+    if data.get("date"):
+        try:
+            dt = datetime.strptime(data["date"], "%Y-%m-%d").date()
+        except ValueError:
+            return jsonify({"error": "Invalid date format"}), 400
 
-
+    entries = data.get("offerings") or []
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"error": "offerings must be a non-empty list"}), 400
+    if any(not isinstance(e, dict) or e.get("class_id") is None or e.get("amount") is None for e in entries):
+        return jsonify({"error": "Every offering needs class_id and amount"}), 400
+    try:
+        class_ids = [int(e["class_id"]) for e in entries]
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid class_id"}), 400
+    if len(set(class_ids)) != len(class_ids):
+        return jsonify({"error": "Each class may appear once"}), 400
+    try:
+        amounts = [parse_amount(e["amount"]) for e in entries]
+    except ValueError:
+        return jsonify({"error": "Invalid amount"}), 400
+    if any(amount is None for amount in amounts):
+        return jsonify({"error": "Every offering needs class_id and amount"}), 400
+
+    written = offerings.upsert([
+        {"date": dt, "class_id": class_id, "amount": amount,
+         "recorded_by": get_jwt_identity(), "note": e.get("note")}
+        for class_id, amount, e in zip(class_ids, amounts, entries)
+    ])
+    for row in written:
+        live.queue_event("offering", date=dt, class_id=row["class_id"],
+                         amount=row["amount"], version=row["version"])
+    db.session.commit()
+    return jsonify([
+        {"id": row["id"], "class_id": row["class_id"], "date": row["date"].isoformat(), "amount": row["amount"]}
+        for row in sorted(written, key=lambda row: row["class_id"])
+    ]), 200
 
 
 # DELETE offering
 @children_bp.route("/offerings", methods=["DELETE"])
 def delete_offering():
-    data = request.get_json()
+    data = request.get_json() or {}
     class_id = data.get("class_id")
     date_str = data.get("date")
     
     if not class_id or not date_str:
         return jsonify({"message": "class_id and date required"}), 400
+    try:
+        class_id = int(class_id)
+        dt = datetime.strptime(date_str, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return jsonify({"message": "Invalid class_id or date"}), 400
 
-    offering = Offering.query.filter_by(class_id=class_id, date=date_str).first()
-    if not offering:
+    removed = offerings.remove(class_id, dt)
+    if removed is None:
         return jsonify({"message": "Offering not found"}), 404
 
-    db.session.delete(offering)
+    live.queue_event("offering", date=dt, class_id=class_id, amount=0, version=removed["version"])
     db.session.commit()
     return jsonify({"message": "Offering deleted successfully"}), 200
 
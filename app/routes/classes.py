@@ -3,6 +3,7 @@ from flask import Blueprint, request, jsonify
 from app.models import  SundayClass, User
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
+from app import class_bands
 
 classes_bp = Blueprint("classes_bp", __name__, url_prefix="/api/classes")
 
@@ -62,4 +63,16 @@ def delete_class(id):
     c = SundayClass.query.get_or_404(id)
     db.session.delete(c)
     db.session.commit()
-    return jsonify({"message": "Deleted"}), 200
\ No newline at end of file
+    return jsonify({"message": "Deleted"}), 200
+
+@classes_bp.post("/reassign")
+@jwt_required()
+def reassign_classes():
+    """Move every child into its age band's class in one UPDATE; ?dry_run=1 only reports."""
+    user_id = get_jwt_identity()
+    user = User.query.get(user_id)
+    if not user or user.role != "admin":
+        return jsonify({"error": "Admin required"}), 403
+    dry_run = request.args.get("dry_run") in ("1", "true")
+    report = class_bands.reassign(dry_run=dry_run)
+    return jsonify({**report, "dry_run": dry_run}), 200
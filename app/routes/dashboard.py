@@ -0,0 +1,130 @@
+# app/routes/dashboard.py
+from datetime import date, datetime, timedelta
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import case, func, select
+from app.extensions import db
+from app.models import (
+    User, SundayClass, Child, Attendance, Offering, Visitor, Event, FinanceEntry, Expenditure,
+)
+from app.routes.reports import parse_date
+
+dashboard_bp = Blueprint("dashboard_bp", __name__, url_prefix="/api/dashboard")
+
+UPCOMING_EVENTS = 5
+
+
+def _month(d):
+    first = d.replace(day=1)
+    return first, (first + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+
+
+# Each section is one grouped query. ?sections=a,b recomputes only those.
+def attendance_section(d):
+    first, last = _month(d)
+    today, month = db.session.execute(
+        select(
+            func.coalesce(func.sum(case((Attendance.date == d, 1), else_=0)), 0),
+            func.count(Attendance.id),
+        ).where(Attendance.date.between(first, last), Attendance.present == True)
+    ).one()
+    return {"today": today, "month": month}
+
+
+def offerings_section(d):
+    first, last = _month(d)
+    today, month = db.session.execute(
+        select(
+            func.coalesce(func.sum(case((Offering.date == d, Offering.amount), else_=0)), 0),
+            func.coalesce(func.sum(Offering.amount), 0),
+        ).where(Offering.date.between(first, last))
+    ).one()
+    return {"today": today, "month": month}
+
+
+def classes_section(d):
+    children = (
+        select(func.count(Child.id)).where(Child.class_id == SundayClass.id)
+        .correlate(SundayClass).scalar_subquery()
+    )
+    present = (
+        select(func.count(Attendance.id))
+        .where(Attendance.class_id == SundayClass.id, Attendance.date == d, Attendance.present == True)
+        .correlate(SundayClass).scalar_subquery()
+    )
+    rows = db.session.execute(
+        select(SundayClass.id, SundayClass.name, children.label("children"), present.label("present_today"))
+        .order_by(SundayClass.min_age, SundayClass.name)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def visitors_section(d):
+    pending, total = db.session.execute(
+        select(
+            func.coalesce(func.sum(case((Visitor.follow_up_status == "pending", 1), else_=0)), 0),
+            func.count(Visitor.id),
+        )
+    ).one()
+    return {"pending": pending, "total": total}
+
+
+def events_section(d):
+    # count(*) OVER () gives the total alongside the first few rows
+    rows = db.session.execute(
+        select(Event.id, Event.headline, Event.start_date, Event.end_date, func.count().over().label("total"))
+        .where(Event.start_date >= datetime.combine(d, datetime.min.time()))
+        .order_by(Event.start_date)
+        .limit(UPCOMING_EVENTS)
+    ).all()
+    return {
+        "count": rows[0].total if rows else 0,
+        "next": [
+            {"id": r.id, "headline": r.headline, "start_date": r.start_date, "end_date": r.end_date}
+            for r in rows
+        ],
+    }
+
+
+def finance_section(d):
+    income = select(
+        func.coalesce(func.sum(FinanceEntry.main_church), 0) + func.coalesce(func.sum(FinanceEntry.children_ministry), 0)
+    ).where(FinanceEntry.date <= d).scalar_subquery()
+    expense = select(func.coalesce(func.sum(Expenditure.amount), 0)).where(Expenditure.date <= d).scalar_subquery()
+    total_income, total_expense = db.session.execute(select(income, expense)).one()
+    return {
+        "total_income": total_income,
+        "total_expense": total_expense,
+        "net_balance": total_income - total_expense,
+    }
+
+
+SECTIONS = {
+    "attendance": attendance_section,
+    "offerings": offerings_section,
+    "classes": classes_section,
+    "visitors": visitors_section,
+    "events": events_section,
+    "finance": finance_section,
+}
+
+
+@dashboard_bp.route("", methods=["GET"])
+@jwt_required()
+def dashboard():
+    """All admin dashboard numbers in one response; ?sections= for partial refresh."""
+    user = User.query.get(get_jwt_identity())
+    if not user or user.role != "admin":
+        return jsonify({"error": "Unauthorized - Admin access required"}), 403
+
+    requested = [s.strip() for s in request.args.get("sections", "").split(",") if s.strip()]
+    unknown = sorted(set(requested) - set(SECTIONS))
+    if unknown:
+        return jsonify({"error": f"Unknown sections: {', '.join(unknown)}"}), 400
+
+    d = parse_date(request.args.get("date"), date.today())
+    payload = {"date": d.isoformat()}
+    for name, compute in SECTIONS.items():
+        if not requested or name in requested:
+            payload[name] = compute(d)
+    return jsonify(payload), 200
@@ -3,6 +3,8 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models import Event, MediaItem, User
+from app.serializers import list_fields, load_options
+from app import jobs
 from datetime import datetime
 import os
 from werkzeug.utils import secure_filename
@@ -16,16 +18,31 @@ def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+
+@jobs.task("files.delete")
+def delete_files(paths):
+    """Remove uploaded files; ones already gone are fine (the job may run twice)."""
+    removed = 0
+    for filepath in paths:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+            print(f"✅ File deleted: {filepath}")
+            removed += 1
+        else:
+            print(f"⚠️  File not found: {filepath}")
+    return {"removed": removed}
+
 # ==================== GET ALL EVENTS ====================
 @events_bp.route("/events", methods=["GET", "OPTIONS"])
 def get_events():
     """Fetch all events (public endpoint)"""
     if request.method == "OPTIONS":
         return "", 200
-    
+
+    fields = list_fields(Event)  # an unknown ?fields= name is a 400, not the 500 below
     try:
-        events = Event.query.all()
-        return jsonify([event.to_dict() for event in events]), 200
+        events = Event.query.options(*load_options(Event, fields)).all()
+        return jsonify([event.to_dict(fields) for event in events]), 200
     except Exception as e:
         print(f"❌ Error fetching events: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -186,26 +203,13 @@ def delete_event(event_id):
         if user.role != "admin" and event.created_by != current_user_id:
             return jsonify({"error": "Unauthorized"}), 403
         
-        # Delete associated media files
+        # Associated media files are removed by a background job once the delete commits
         upload_folder = current_app.config.get("BASE_UPLOAD_FOLDER")
-        
-        for media in event.media:
-            try:
-                # Extract filename from URL (e.g., "1234567890_image.jpg")
-                filename = media.url.split("/")[-1]  # ✅ Better extraction
-                filepath = os.path.join(upload_folder, filename)
-                
-                print(f"🗑️  Attempting to delete: {filepath}")
-                
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                    print(f"✅ File deleted: {filepath}")
-                else:
-                    print(f"⚠️  File not found: {filepath}")
-                    
-            except Exception as file_err:
-                print(f"⚠️  Warning: Could not delete file {media.url}: {str(file_err)}")
-        
+        # Extract filename from URL (e.g., "1234567890_image.jpg")
+        paths = [os.path.join(upload_folder, media.url.split("/")[-1]) for media in event.media]
+        if paths:
+            jobs.enqueue("files.delete", paths=paths)
+
         db.session.delete(event)
         db.session.commit()
         
@@ -1,11 +1,40 @@
 # app/routes/media_routes.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify, send_file
 from app.models import HomeMedia
-from app.extensions import db
+from app.extensions import db, cloudinary_uploader
+from app import jobs, snapshots
+from app.compression import choose_encoding
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import cloudinary.uploader
 
 media_bp = Blueprint("media_bp", __name__, url_prefix="/api/media")
+homepage_bp = Blueprint("homepage_bp", __name__)
+
+
+@jobs.task("cloudinary.destroy")
+def destroy_remote_media(public_id, resource_type):
+    return cloudinary_uploader().destroy(public_id, resource_type=resource_type)
+
+
+# ✅ Whole public homepage in one precomputed document (see app/snapshots.py)
+@homepage_bp.get("/api/homepage")
+def homepage_snapshot():
+    path, etag, encoding = snapshots.current_homepage(choose_encoding())
+    # one tag per encoding ("<sha>-br"), so a shared cache never pairs a 304
+    # with another encoding's body; any of them revalidates while the sha is current
+    tag = f"{etag}-{encoding}" if encoding else etag
+    held = next((t for t in (tag, etag, *(f"{etag}-{e}" for e in snapshots.ENCODINGS))
+                 if request.if_none_match.contains_weak(t)), None)
+    if held:
+        response = current_app.response_class(status=304)
+        tag = held  # the client keeps the representation it already has
+    else:
+        response = send_file(path, mimetype="application/json", etag=False, conditional=False, max_age=0)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+    response.set_etag(tag)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.no_cache = True  # always revalidate; 304s are cheap
+    return response
 
 @media_bp.post("/")
 @jwt_required()
@@ -19,7 +48,7 @@ def upload_media():
         return jsonify({"error": "File is required"}), 400
 
     # Upload directly to Cloudinary
-    upload_result = cloudinary.uploader.upload(file, resource_type="auto")
+    upload_result = cloudinary_uploader().upload(file, resource_type="auto")
 
     media_type = "video" if upload_result["resource_type"] == "video" else "image"
     file_url = upload_result["secure_url"]
@@ -88,12 +117,9 @@ def delete_media(id):
     # if user.role != "admin" and media.uploaded_by != user_id:
     #     return jsonify({"error": "Not authorized"}), 403
 
-    # Extract Cloudinary public ID from URL before deleting
-    try:
-        public_id = media.file_url.split("/")[-1].split(".")[0]
-        cloudinary.uploader.destroy(public_id, resource_type=media.media_type)
-    except Exception as e:
-        print(f"Cloudinary delete error: {e}")
+    # Extract Cloudinary public ID from URL; the remote delete runs (and retries) in a job
+    public_id = media.file_url.split("/")[-1].split(".")[0]
+    jobs.enqueue("cloudinary.destroy", public_id=public_id, resource_type=media.media_type)
 
     # Delete from database
     db.session.delete(media)
@@ -0,0 +1,95 @@
+# app/routes/jobs.py
+import os
+from datetime import datetime
+from flask import Blueprint, current_app, jsonify, request, send_file
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import jobs, scheduler
+from app.models import Job, ScheduledRun, User
+
+jobs_bp = Blueprint("jobs_bp", __name__, url_prefix="/api/jobs")
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+def _visible_job(job_id):
+    """The job if the caller may see it: admins see all, others their own and anonymous ones."""
+    job = Job.query.get(job_id)
+    if job is None:
+        return None, (jsonify({"error": "Job not found"}), 404)
+    user = User.query.get(get_jwt_identity())
+    if not user:
+        return None, (jsonify({"error": "User not found"}), 404)
+    if user.role != "admin" and job.created_by not in (None, user.id):
+        return None, (jsonify({"error": "Unauthorized"}), 403)
+    return job, None
+
+
+@jobs_bp.route("", methods=["GET"])
+@jwt_required()
+def list_jobs():
+    """Recent jobs, newest first (admin only); ?status= filters."""
+    user = User.query.get(get_jwt_identity())
+    if not user or user.role != "admin":
+        return jsonify({"error": "Unauthorized - Admin access required"}), 403
+
+    query = Job.query.order_by(Job.id.desc())
+    status = request.args.get("status")
+    if status:
+        if status not in JOB_STATUSES:
+            return jsonify({"error": f"status must be one of {', '.join(JOB_STATUSES)}"}), 400
+        query = query.filter(Job.status == status)
+    limit = min(request.args.get("limit", 50, type=int), 200)
+    return jsonify([job.to_dict() for job in query.limit(limit)]), 200
+
+
+@jobs_bp.route("/schedules", methods=["GET"])
+@jwt_required()
+def list_schedules():
+    """Periodic jobs with their next run and latest runs (admin only)."""
+    user = User.query.get(get_jwt_identity())
+    if not user or user.role != "admin":
+        return jsonify({"error": "Unauthorized - Admin access required"}), 403
+
+    active = scheduler.active_schedules(current_app)
+    now = datetime.utcnow()
+    recent = {}
+    for run in ScheduledRun.query.order_by(ScheduledRun.started_at.desc()).limit(200):
+        runs = recent.setdefault(run.name, [])
+        if len(runs) < 5:
+            runs.append(run.to_dict())
+    return jsonify([
+        {
+            "name": name,
+            "cron": active[name].expression if name in active else None,
+            "next_run": active[name].next_after(now).isoformat() if name in active else None,
+            "runs": recent.get(name, []),
+        }
+        for name in sorted(scheduler.SCHEDULES)
+    ]), 200
+
+
+@jobs_bp.route("/<int:job_id>", methods=["GET"])
+@jwt_required()
+def job_status(job_id):
+    job, error = _visible_job(job_id)
+    if error:
+        return error
+    return jsonify(job.to_dict()), 200
+
+
+@jobs_bp.route("/<int:job_id>/download", methods=["GET"])
+@jwt_required()
+def download_result(job_id):
+    """The response an offloaded view (?async=1) produced."""
+    job, error = _visible_job(job_id)
+    if error:
+        return error
+    if job.status != "done" or not job.result or "mimetype" not in job.result:
+        return jsonify({"error": "No file for this job", "status": job.status}), 409
+    path = jobs.result_path(job)
+    if not os.path.exists(path):
+        return jsonify({"error": "Result file no longer available"}), 410
+    return send_file(
+        path, mimetype=job.result["mimetype"],
+        as_attachment=bool(job.result.get("filename")), download_name=job.result.get("filename"),
+    )
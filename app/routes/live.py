@@ -0,0 +1,93 @@
+# app/routes/live.py
+import json
+import queue
+from datetime import date
+from flask import Blueprint, Response, current_app, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy import func
+from app.extensions import db
+from app.models import Attendance, ChangeLog, Offering
+from app import live
+
+live_bp = Blueprint("live_bp", __name__, url_prefix="/api/live")
+
+
+def _blank(class_id):
+    return {"class_id": class_id, "attendance": 0, "offering": 0, "offering_version": 0}
+
+
+def _todays_totals(today, class_id=None):
+    attendance = db.session.query(Attendance.class_id, func.count(Attendance.id)).filter(
+        Attendance.date == today, Attendance.present == True
+    )
+    # one offering row per class and day; its latest change_log id is the version events compare against
+    offerings = db.session.query(Offering.class_id, Offering.amount, func.max(ChangeLog.id)).outerjoin(
+        ChangeLog, (ChangeLog.table_name == "offerings") & (ChangeLog.row_id == Offering.id)
+    ).filter(Offering.date == today)
+    if class_id is not None:
+        attendance = attendance.filter(Attendance.class_id == class_id)
+        offerings = offerings.filter(Offering.class_id == class_id)
+    totals = {}
+    for cid, count in attendance.group_by(Attendance.class_id):
+        totals.setdefault(cid, _blank(cid))["attendance"] = count
+    for cid, amount, version in offerings.group_by(Offering.id, Offering.class_id, Offering.amount):
+        totals.setdefault(cid, _blank(cid)).update(offering=amount, offering_version=version or 0)
+    return list(totals.values())
+
+
+# EventSource cannot send headers, so the token may also come as ?jwt=
+@live_bp.route("/kpi", methods=["GET"])
+@jwt_required(locations=["headers", "query_string"])
+def kpi_stream():
+    """
+    Today's per-class totals once, then attendance deltas and offering totals
+    as they commit.
+
+    The stream subscribes before it reads the totals, so nothing committed in
+    between is lost (an attendance delta committed while the totals are read
+    may be in both; offering events older than the snapshot's
+    "offering_version" are stale and should be dropped). Deltas for other dates are skipped, and at midnight the stream
+    sends "resync" and ends so the client reloads the new day's totals.
+    """
+    class_id = request.args.get("class_id", type=int)
+    heartbeat = current_app.config["LIVE_HEARTBEAT_SECONDS"]
+
+    bus = live.bus()
+    bus.start()
+    subscription = bus.broker.subscribe()
+    try:
+        today = date.today()
+        snapshot = current_app.json.dumps({"date": today.isoformat(), "classes": _todays_totals(today, class_id)})
+    except Exception:
+        bus.broker.unsubscribe(subscription)
+        raise
+
+    def stream():
+        try:
+            yield f"event: snapshot\ndata: {snapshot}\n\n"
+            while True:
+                try:
+                    event_id, message = subscription.get(timeout=heartbeat)
+                except queue.Empty:
+                    event_id, message = None, None
+                if date.today() != today:
+                    yield f"event: resync\ndata: {{}}\n\n"
+                    return
+                if message is None:
+                    yield ": keep-alive\n\n"
+                elif message is live.RESYNC:
+                    yield f"id: {event_id}\nevent: resync\ndata: {{}}\n\n"
+                else:
+                    delta = json.loads(message)
+                    if delta.get("date") == today.isoformat() and class_id in (None, delta.get("class_id")):
+                        yield f"id: {event_id}\nevent: delta\ndata: {message}\n\n"
+        finally:
+            bus.broker.unsubscribe(subscription)
+
+    response = Response(stream(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # nginx: flush each event
+    })
+    # a generator closed before its first chunk never runs its finally
+    response.call_on_close(lambda: bus.broker.unsubscribe(subscription))
+    return response
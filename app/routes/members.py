@@ -2,14 +2,17 @@ from flask import Blueprint, request, jsonify
 from app.extensions import db
 from app.models import Member
 from datetime import datetime
+from sqlalchemy import select
+from app.serializers import rows_payload
 
 members_bp = Blueprint("members_bp", __name__ ,url_prefix="/api/members")
 
 @members_bp.get("")
 def get_members():
     print("GET /members reached")
-    members = Member.query.all()
-    return jsonify([m.to_dict() for m in members]), 200
+    # same keys as Member.to_dict, read straight from result rows
+    stmt = select(Member.id, Member.full_name, Member.phone, Member.residence, Member.department_id)
+    return jsonify(rows_payload(stmt)), 200
 
 
 
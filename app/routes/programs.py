@@ -2,6 +2,7 @@ import os
 from flask import Blueprint, request, jsonify, send_from_directory, current_app
 from app.extensions import db
 from app.models import Program, ProgramFile
+from app.serializers import list_fields, load_options
 
 programs_bp = Blueprint("programs", __name__, url_prefix="/api/programs")
 
@@ -10,8 +11,9 @@ programs_bp = Blueprint("programs", __name__, url_prefix="/api/programs")
 # -------------------------------------------
 @programs_bp.route("/", methods=["GET"])
 def list_programs():
-    programs = Program.query.order_by(Program.id.desc()).all()
-    return jsonify([p.to_dict() for p in programs]), 200
+    fields = list_fields(Program)
+    programs = Program.query.options(*load_options(Program, fields)).order_by(Program.id.desc()).all()
+    return jsonify([p.to_dict(fields) for p in programs]), 200
 
 
 
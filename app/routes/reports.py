@@ -9,6 +9,7 @@ from datetime import datetime, date, timedelta
 from sqlalchemy import func
 from app.models import Attendance, Offering, Report
 from app.extensions import db
+from app import cache
 
 reports_bp = Blueprint("reports_bp", __name__, url_prefix="/api/reports")
 
@@ -23,6 +24,7 @@ def parse_date(s, default=None):
 # --- KPI endpoint ---
 @reports_bp.route("/kpi", methods=["GET"])
 @jwt_required(optional=True)
+@cache.cached("attendance", "offerings", vary=date.today)  # no ?date= means today
 def kpi():
     d = parse_date(request.args.get("date"), date.today())
     class_id = request.args.get("class_id")
@@ -50,9 +52,9 @@ def kpi():
     return jsonify({
         "date": d.isoformat(),
         "todays_attendance": todays_attendance,
-        "todays_offering": float(todays_offering),
+        "todays_offering": todays_offering,
         "month_attendance": month_attendance,
-        "month_offering": float(month_offering)
+        "month_offering": month_offering
     }), 200
 
 # --- Weekly reports ---
@@ -0,0 +1,30 @@
+# app/routes/search.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app import search as search_index
+
+search_bp = Blueprint("search_bp", __name__, url_prefix="/api/search")
+
+
+# GET /api/search?q=<term>&types=child,visitor&limit=20
+# signed-in users only: hits carry phone numbers and parents' contacts as `detail`
+@search_bp.get("")
+@jwt_required()
+def unified_search():
+    term = request.args.get("q", "").strip()
+    if not term:
+        return jsonify({"error": "q is required"}), 400
+
+    types = request.args.get("types")
+    types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    unknown = [t for t in types or [] if t not in search_index.SOURCES]
+    if unknown:
+        return jsonify({"error": f"Unknown types: {', '.join(unknown)}"}), 400
+
+    try:
+        limit = int(request.args.get("limit", search_index.DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    hits = search_index.search(term, types=types, limit=limit)
+    return jsonify({"query": term, "count": len(hits), "items": hits}), 200
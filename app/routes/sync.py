@@ -0,0 +1,27 @@
+# app/routes/sync.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app import sync
+
+sync_bp = Blueprint("sync_bp", __name__, url_prefix="/api/sync")
+
+
+@sync_bp.route("", methods=["GET"])
+@jwt_required()
+def delta_sync():
+    """Rows changed since ?since=<token> (omit it for a full copy) plus the next token."""
+    since = request.args.get("since")
+    if since:
+        if not since.isdigit():
+            return jsonify({"error": "Invalid sync token"}), 400
+        since = int(since)
+    else:
+        since = None
+
+    tables = [t.strip() for t in request.args.get("tables", "").split(",") if t.strip()]
+    unknown = sorted(set(tables) - set(sync.MODELS))
+    if unknown:
+        return jsonify({"error": f"Unknown tables: {', '.join(unknown)}"}), 400
+
+    token, changed = sync.changes_since(since, tables or None)
+    return jsonify({"token": str(token), "changes": changed}), 200
@@ -1,11 +1,11 @@
 
 # app/routes/teacher.py
 from flask import Blueprint, request, jsonify
-from app.extensions import db
+from app.extensions import db, cloudinary_uploader
 from app.models import User
+from app.serializers import list_fields, load_options
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.security import generate_password_hash
-import cloudinary.uploader
 
 teachers_bp = Blueprint("teachers", __name__, url_prefix="/api/teachers")
 
@@ -19,18 +19,9 @@ def get_teachers():
     if not admin or admin.role != "admin":
         return jsonify({"error": "Unauthorized - Admin access required"}), 403
 
-    teachers = User.query.filter_by(role="teacher").all()
-    return jsonify([
-        {
-            "id": t.id,
-            "name": t.name,
-            "username": t.username,
-            "phone": t.phone,
-            "bio": t.bio,
-            "profile_pic": t.profile_pic,
-            "must_change_password": t.must_change_password,
-        } for t in teachers
-    ]), 200
+    fields = list_fields(User)  # User.LIST_FIELDS unless ?fields= asks for more
+    teachers = User.query.options(*load_options(User, fields)).filter_by(role="teacher").all()
+    return jsonify([t.to_dict(fields) for t in teachers]), 200
 
 
 
@@ -105,7 +96,7 @@ def create_teacher():
     # handle profile picture
     profile_pic_url = None
     if "profile_pic" in request.files:
-        upload_result = cloudinary.uploader.upload(request.files["profile_pic"])
+        upload_result = cloudinary_uploader().upload(request.files["profile_pic"])
         profile_pic_url = upload_result.get("secure_url")
 
     new_teacher = User(
@@ -149,7 +140,7 @@ def update_teacher(teacher_id):
     teacher.bio = data.get("bio", teacher.bio)
 
     if "profile_pic" in request.files:
-        upload_result = cloudinary.uploader.upload(request.files["profile_pic"])
+        upload_result = cloudinary_uploader().upload(request.files["profile_pic"])
         teacher.profile_pic = upload_result.get("secure_url")
 
     db.session.commit()
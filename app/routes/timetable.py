@@ -4,13 +4,16 @@ from app.models import  TimetableEntry, SundayClass, User
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from app.extensions import db
+from sqlalchemy.orm import joinedload
 
 timetable_bp = Blueprint("timetable_bp", __name__, url_prefix="/api/timetable")
 
 @timetable_bp.get("")
 def list_timetable():
     search = request.args.get("search", "")
-    query = TimetableEntry.query
+    query = TimetableEntry.query.options(
+        joinedload(TimetableEntry.sunday_class), joinedload(TimetableEntry.teacher)
+    )
     if search:
         query = query.filter(TimetableEntry.date.like(f"%{search}%"))
     items = [e.to_dict() for e in query.order_by(TimetableEntry.date.desc()).all()]
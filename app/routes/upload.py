@@ -4,8 +4,8 @@
 # app/galleryroutes.py
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import cloudinary.uploader
 from app.models import db, MediaItem, User
+from app.extensions import cloudinary_uploader
 
 gallery_bp = Blueprint("gallery", __name__, url_prefix="/api/gallery")
 
@@ -53,7 +53,7 @@ def upload_media():
 
     # Upload to Cloudinary
     try:
-        result = cloudinary.uploader.upload(file, folder=folder, resource_type="auto")
+        result = cloudinary_uploader().upload(file, folder=folder, resource_type="auto")
         url = result.get("secure_url")
     except Exception as e:
         return jsonify({"error": "Upload failed", "details": str(e)}), 500
@@ -171,7 +171,7 @@ def delete_media(item_id):
         full_id = f"{folder}/{public_id}"
 
         # Delete from Cloudinary
-        cloudinary.uploader.destroy(full_id, resource_type="video" if media_item.mimetype.startswith("video") else "image")
+        cloudinary_uploader().destroy(full_id, resource_type="video" if media_item.mimetype.startswith("video") else "image")
     except Exception as e:
         return jsonify({"error": "Failed to delete from Cloudinary", "details": str(e)}), 500
 
@@ -5,6 +5,8 @@ from app.models import Visitor, User
 from app.extensions import db
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
+from sqlalchemy import select
+from app.serializers import rows_payload
 
 visitors_bp = Blueprint("visitors_bp", __name__, url_prefix="/api/visitors")
 
@@ -12,8 +14,13 @@ visitors_bp = Blueprint("visitors_bp", __name__, url_prefix="/api/visitors")
 @visitors_bp.get("")
 @jwt_required(optional=True)
 def get_visitors():
-    visitors = Visitor.query.order_by(Visitor.id.desc()).all()
-    return jsonify([v.to_dict() for v in visitors])
+    # same keys as Visitor.to_dict, read straight from result rows
+    stmt = select(
+        Visitor.id, Visitor.full_name, Visitor.full_name.label("name"), Visitor.phone,
+        Visitor.email, Visitor.residence, Visitor.prayer_request,
+        Visitor.date_of_visit.label("visit_date"), Visitor.follow_up_status,
+    ).order_by(Visitor.id.desc())
+    return jsonify(rows_payload(stmt))
 
 # -------------------- ADD NEW VISITOR --------------------
 @visitors_bp.post("")
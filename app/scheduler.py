@@ -0,0 +1,192 @@
+# app/scheduler.py
+"""
+Periodic maintenance on cron-style schedules (UTC).
+
+    @scheduler.periodic("history.prune", "15 3 * * *")
+    def prune_history(): ...
+
+Only `flask worker` runs the scheduler loop, next to its job threads (not
+with --burst or --no-scheduler; web processes never do). With no such worker
+running, nothing fires: the worker command warns when it starts without the
+loop while schedules are active. The built-in schedules live in
+app/maintenance.py and SCHEDULES in config can move one ("name": "0 5 * * *")
+or switch it off ("name": None). One registered without a cron is off until
+SCHEDULES gives it one.
+
+Several workers (processes or hosts) may each run a scheduler. For each due
+tick they all try to insert a scheduled_runs row with the same (name,
+scheduled_for); the unique constraint lets exactly one INSERT win, and only
+that worker runs the job. The same rows are the run history (`flask schedule history`), and
+`flask schedule run <name>` triggers a job by hand.
+
+Cron syntax: minute hour day-of-month month day-of-week (0 = Sunday), each
+`*`, `n`, `a-b`, `*/step`, `a-b/step` or a comma list of those. As in cron, a
+day matches either day field when both are restricted.
+"""
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from .extensions import db
+from .models import ScheduledRun
+
+SCHEDULES = {}
+IDLE_SECONDS = 30
+
+
+class Cron:
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(part, lo, hi) for part, (lo, hi) in zip(parts, self.RANGES)
+        )
+        self._either_day = parts[2] != "*" and parts[4] != "*"
+
+    @staticmethod
+    def _parse(field, lo, hi):
+        values = set()
+        for part in field.split(","):
+            span, _, step = part.partition("/")
+            step = int(step) if step else 1
+            if span == "*":
+                start, end = lo, hi
+            elif "-" in span:
+                start, end = (int(v) for v in span.split("-", 1))
+            else:
+                start = int(span)
+                end = hi if step > 1 else start
+            if not lo <= start <= end <= hi or step < 1:
+                raise ValueError(f"Cron field {field!r} is outside {lo}-{hi}")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _day_matches(self, t):
+        in_days = t.day in self.days
+        in_weekdays = (t.weekday() + 1) % 7 in self.weekdays  # Python Monday=0, cron Sunday=0
+        return (in_days or in_weekdays) if self._either_day else (in_days and in_weekdays)
+
+    def next_after(self, when):
+        """First matching minute strictly after `when`."""
+        t = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+def periodic(name, cron):
+    """Register `func` to run on the `cron` schedule (None: only when SCHEDULES sets one)."""
+    if cron:
+        Cron(cron)  # fail at import time on a bad expression
+
+    def decorator(func):
+        SCHEDULES[name] = {"func": func, "cron": cron}
+        return func
+    return decorator
+
+
+def init_app(app):
+    app.config.setdefault("SCHEDULES", {})
+    app.config.setdefault("HISTORY_RETENTION_DAYS", 30)
+    app.config.setdefault("UPLOADS_ORPHAN_GRACE_HOURS", 24)
+    app.config.setdefault("UPLOADS_ORPHAN_ACTION", "report")
+    app.config.setdefault("UPLOADS_QUARANTINE_FOLDER", os.path.join(app.instance_path, "upload_quarantine"))
+    app.config.setdefault("PROMOTION_MAX_AGE", 21)
+    from . import maintenance  # noqa: F401  registers the built-in schedules
+
+
+def active_schedules(app):
+    """name -> Cron for every schedule not switched off in config."""
+    overrides = app.config["SCHEDULES"]
+    active = {}
+    for name, spec in SCHEDULES.items():
+        cron = overrides.get(name, spec["cron"])
+        if cron:
+            active[name] = Cron(cron)
+    return active
+
+
+def _worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_job(name, scheduled_for=None, trigger="schedule"):
+    """
+    Run one schedule for the tick `scheduled_for` (default: now) and record it.
+    Returns the ScheduledRun, or None when another process already took the tick.
+    """
+    if name not in SCHEDULES:
+        raise KeyError(f"Unknown schedule {name!r}")
+    run = ScheduledRun(
+        name=name, scheduled_for=scheduled_for or datetime.utcnow(), trigger=trigger,
+        status="running", worker=_worker_id(), started_at=datetime.utcnow(),
+    )
+    db.session.add(run)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+
+    try:
+        result = SCHEDULES[name]["func"]()
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.exception("Scheduled job %s failed", name)
+        run.status, run.error = "failed", f"{type(exc).__name__}: {exc}"
+    else:
+        run.status, run.result = "done", result
+    run.finished_at = datetime.utcnow()
+    db.session.commit()
+    return run
+
+
+class Scheduler:
+    """Loop that fires due schedules; stop() ends it after the current job."""
+
+    def __init__(self, app):
+        self.app = app
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def run(self):
+        schedules = active_schedules(self.app)
+        now = datetime.utcnow()
+        due = {name: cron.next_after(now) for name, cron in schedules.items()}
+        while not self._stop.is_set():
+            now = datetime.utcnow()
+            for name, tick in sorted(due.items(), key=lambda item: item[1]):
+                if tick <= now and not self._stop.is_set():
+                    with self.app.app_context():
+                        run_job(name, tick)
+                    # missed ticks (long job, paused process) are skipped, not replayed
+                    due[name] = schedules[name].next_after(max(tick, datetime.utcnow()))
+            wait = min([IDLE_SECONDS] + [(t - datetime.utcnow()).total_seconds() for t in due.values()])
+            self._stop.wait(max(wait, 0.5))
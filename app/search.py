@@ -0,0 +1,206 @@
+# app/search.py
+"""
+Fuzzy name search across children, members, visitors and new members.
+
+- Postgres: pg_trgm GIN indexes on the name columns. Postgres keeps them
+  current on every write, and both `%` (similarity) and ILIKE use them.
+- SQLite: one FTS5 table (trigram tokenizer, SQLite >= 3.34) fed by triggers
+  on the source tables, so ORM writes, bulk inserts and raw SQL all stay in sync.
+
+FTS rowids encode the source row as `id * 8 + type code`, which lets the
+triggers update a single index row without scanning the virtual table.
+"""
+from sqlalchemy import event, text
+from .extensions import db
+
+
+# entity type -> where its rows live
+SOURCES = {
+    "child": {"code": 1, "table": "children", "name": "name", "detail": "parent_contact"},
+    "member": {"code": 2, "table": "members", "name": "full_name", "detail": "phone"},
+    "visitor": {"code": 3, "table": "visitors", "name": "full_name", "detail": "phone"},
+    "new_member": {"code": 4, "table": "new_members", "name": "name", "detail": "phone"},
+}
+CODES = {src["code"]: entity for entity, src in SOURCES.items()}
+
+FTS_TABLE = "search_index"
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+# ------------------------
+# DDL
+# ------------------------
+def _sqlite_statements():
+    stmts = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(name, detail UNINDEXED, entity UNINDEXED, tokenize='trigram')"
+    ]
+    for entity, src in SOURCES.items():
+        table, name, detail, code = src["table"], src["name"], src["detail"], src["code"]
+        insert_new = (
+            f"INSERT INTO {FTS_TABLE}(rowid, name, detail, entity) "
+            f"VALUES (new.id * 8 + {code}, new.{name}, new.{detail}, '{entity}');"
+        )
+        delete_old = f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 8 + {code};"
+        stmts += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} "
+            f"BEGIN {insert_new} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} "
+            f"BEGIN {delete_old} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {name}, {detail} ON {table} "
+            f"BEGIN {delete_old} {insert_new} END",
+        ]
+    return stmts
+
+
+def _postgres_statements():
+    stmts = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    for src in SOURCES.values():
+        table, name = src["table"], src["name"]
+        stmts.append(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_{name}_trgm "
+            f"ON {table} USING gin ({name} gin_trgm_ops)"
+        )
+    return stmts
+
+
+def install(connection, rebuild_index=False):
+    """Create the search indexes for this connection's dialect (idempotent)."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        for stmt in _sqlite_statements():
+            connection.exec_driver_sql(stmt)
+        if rebuild_index:
+            rebuild(connection)
+    elif dialect == "postgresql":
+        for stmt in _postgres_statements():
+            connection.exec_driver_sql(stmt)
+
+
+def uninstall(connection):
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        for src in SOURCES.values():
+            for suffix in ("ai", "ad", "au"):
+                connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {src['table']}_search_{suffix}")
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif dialect == "postgresql":
+        for src in SOURCES.values():
+            connection.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{src['table']}_{src['name']}_trgm")
+
+
+def rebuild(connection):
+    """Repopulate the SQLite FTS table from the source tables."""
+    if connection.dialect.name != "sqlite":
+        return
+    connection.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+    for entity, src in SOURCES.items():
+        connection.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, detail, entity) "
+            f"SELECT id * 8 + {src['code']}, {src['name']}, {src['detail']}, '{entity}' "
+            f"FROM {src['table']}"
+        )
+
+
+@event.listens_for(db.metadata, "after_create")
+def _install_after_create(target, connection, **kw):
+    # db.create_all() (tests, fresh dev databases) gets the indexes too
+    install(connection)
+
+
+# ------------------------
+# Queries
+# ------------------------
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def _fts_query(term):
+    # every word becomes a quoted trigram phrase; words are ANDed
+    return " ".join('"' + word.replace('"', '""') + '"' for word in term.split())
+
+
+def _short_words(term):
+    # the trigram tokenizer cannot MATCH words under three characters
+    return any(len(word) < 3 for word in term.split())
+
+
+def search(term, types=None, limit=DEFAULT_LIMIT):
+    """Return ranked hits ({type, id, name, detail, score}) for `term`."""
+    term = " ".join(term.split())
+    if not term:
+        return []
+    types = [t for t in (types or SOURCES) if t in SOURCES]
+    if not types:
+        return []
+    limit = max(1, min(int(limit), MAX_LIMIT))
+
+    if _dialect() == "postgresql":
+        rows = _search_postgres(term, types, limit)
+    else:
+        rows = _search_sqlite(term, types, limit)
+
+    return [
+        {
+            "type": r.entity,
+            "id": r.entity_id,
+            "name": r.name,
+            "detail": r.detail,
+            "score": round(float(r.score), 4),
+        }
+        for r in rows
+    ]
+
+
+def _search_sqlite(term, types, limit):
+    codes = ", ".join(str(SOURCES[t]["code"]) for t in types)
+    if _short_words(term):
+        where = "name LIKE :like"
+        score = "1.0 / (1 + length(name))"
+    else:
+        where = f"{FTS_TABLE} MATCH :match"
+        score = f"-bm25({FTS_TABLE})"
+    sql = text(f"""
+        SELECT entity, rowid >> 3 AS entity_id, name, detail, {score} AS score
+        FROM {FTS_TABLE}
+        WHERE {where} AND (rowid & 7) IN ({codes})
+        ORDER BY score DESC
+        LIMIT :limit
+    """)
+    return db.session.execute(sql, {
+        "match": _fts_query(term),
+        "like": f"%{term}%",
+        "limit": limit,
+    }).fetchall()
+
+
+def _search_postgres(term, types, limit):
+    parts = []
+    for entity in types:
+        src = SOURCES[entity]
+        name = src["name"]
+        parts.append(f"""
+            SELECT '{entity}' AS entity, id AS entity_id, {name} AS name, {src['detail']} AS detail,
+                   GREATEST(similarity({name}, :q), word_similarity(:q, {name})) AS score
+            FROM {src['table']}
+            WHERE {name} % :q OR {name} ILIKE :like
+        """)
+    sql = text(" UNION ALL ".join(parts) + " ORDER BY score DESC LIMIT :limit")
+    return db.session.execute(sql, {"q": term, "like": f"%{term}%", "limit": limit}).fetchall()
+
+
+def name_filter(entity, model, term):
+    """
+    Index-backed filter for an ORM query on `entity` rows whose name contains `term`.
+    Postgres answers ILIKE from the trigram index; SQLite goes through FTS5.
+    """
+    src = SOURCES[entity]
+    column = getattr(model, src["name"])
+    if _dialect() != "sqlite" or _short_words(term):
+        return column.ilike(f"%{term}%")
+    ids = text(
+        f"SELECT rowid >> 3 FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH :match AND (rowid & 7) = {src['code']}"
+    ).bindparams(match=_fts_query(term)).columns(model.id)
+    return model.id.in_(ids)
@@ -0,0 +1,103 @@
+# app/serializers.py
+"""
+Shared response serialization for list endpoints.
+
+Shapes (Core selects, see rows_payload):
+    default          -> [{column: value, ...}, ...]
+    ?format=columns  -> {"columns": [...], "rows": [[...], ...]}
+
+Sparse fieldsets (?fields=id,name,...):
+    - Core selects are narrowed to the requested columns before they run.
+    - ORM models declare FIELDS ({output key: attribute or (attribute, convert)});
+      `load_options` turns the requested keys into load_only()/selectinload()
+      and `dump` (what to_dict calls) emits only those keys.
+    - Models may declare LIST_FIELDS, the default for list views (e.g. User
+      leaves out `bio`); any declared field can still be asked for explicitly.
+"""
+from flask import abort, jsonify, make_response, request
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+from .extensions import db
+
+
+def iso(value):
+    return value.isoformat() if value else None
+
+
+def wants_columns():
+    return request.args.get("format", "").lower() == "columns"
+
+
+def requested_fields(available):
+    """
+    ?fields= names in the order of `available`, or None when the parameter is
+    absent/empty. Unknown names are a 400 rather than silently empty objects.
+    """
+    raw = request.args.get("fields", "")
+    wanted = {f.strip() for f in raw.split(",") if f.strip()}
+    if not wanted:
+        return None
+    unknown = wanted.difference(available)
+    if unknown:
+        abort(make_response(jsonify({"error": f"Unknown fields: {', '.join(sorted(unknown))}"}), 400))
+    return [f for f in available if f in wanted]
+
+
+def list_fields(model):
+    """Fields for a list view: ?fields= if given, else the model's LIST_FIELDS (None = all)."""
+    return requested_fields(model.FIELDS) or getattr(model, "LIST_FIELDS", None)
+
+
+def _source(spec):
+    return spec[0] if isinstance(spec, tuple) else spec
+
+
+def load_options(model, fields):
+    """
+    Loader options that read only what `fields` needs (the primary key always
+    comes along). Collections that will be serialized are selectinloaded: one
+    extra query per relationship instead of one per row.
+    """
+    mapper = inspect(model)
+    sources = {_source(model.FIELDS[f]) for f in fields or model.FIELDS}
+    if fields is None:
+        return [selectinload(getattr(model, key)) for key in sorted(sources & set(mapper.relationships.keys()))]
+    columns = {c.key for c in mapper.primary_key} | (sources & set(mapper.column_attrs.keys()))
+    options = [load_only(*(getattr(model, key) for key in sorted(columns)))]
+    options += [selectinload(getattr(model, key)) for key in sorted(sources & set(mapper.relationships.keys()))]
+    return options
+
+
+def dump(obj, fields=None):
+    """Serialize `obj` through its model's FIELDS, limited to `fields` when given."""
+    spec = type(obj).FIELDS
+    out = {}
+    for name in fields or spec:
+        source = spec[name]
+        if isinstance(source, tuple):
+            attr, convert = source
+            out[name] = convert(getattr(obj, attr))
+        else:
+            out[name] = getattr(obj, source)
+    return out
+
+
+def rows_payload(stmt, params=None):
+    """Execute a Core select (or text()) and shape the rows for the response."""
+    if hasattr(stmt, "with_only_columns"):
+        fields = requested_fields([c.key for c in stmt.selected_columns])
+        if fields:
+            stmt = stmt.with_only_columns(*(c for c in stmt.selected_columns if c.key in fields))
+        result = db.session.execute(stmt, params or {})
+        columns = list(result.keys())
+        rows = [list(row) for row in result]
+    else:
+        # text() has no column list to narrow up front; trim the result instead
+        result = db.session.execute(stmt, params or {})
+        fields = requested_fields(list(result.keys()))
+        keep = [i for i, key in enumerate(result.keys()) if fields is None or key in fields]
+        columns = [list(result.keys())[i] for i in keep]
+        rows = [[row[i] for i in keep] for row in result]
+    if wants_columns():
+        return {"columns": columns, "rows": rows}
+    return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,136 @@
+# app/snapshots.py
+"""
+Precomputed homepage document.
+
+The public homepage needs events, featured gallery items, featured HomeMedia
+and programs. Instead of four API calls per visit, a write to any of those
+tables rebuilds one JSON document on disk (plus .gz/.br copies), and
+GET /api/homepage serves the file as-is with an ETag.
+
+On-disk layout in SNAPSHOT_FOLDER:
+    homepage-<etag>.json[.gz|.br]   immutable, named by content hash
+    homepage.current                the live etag; replaced atomically
+A reader resolves the pointer once and then opens files that never change, so
+it can never mix two versions. Older versions are pruned (the previous one is
+kept for readers that resolved the pointer just before the swap).
+"""
+import gzip
+import hashlib
+import os
+import tempfile
+from flask import current_app, g, has_app_context
+from . import changes
+from .compression import brotli
+
+HOMEPAGE_TABLES = frozenset({"events", "media_items", "home_media", "programs", "program_files"})
+
+# document key -> endpoint whose JSON it embeds, so the snapshot always
+# matches what the individual APIs return
+HOMEPAGE_SECTIONS = {
+    "events": "events.get_events",
+    "gallery_featured": "gallery.get_featured_media",
+    "featured_media": "media_bp.get_featured_media",
+    "programs": "programs.list_programs",
+}
+POINTER = "homepage.current"
+ENCODINGS = {"gzip": ".gz", "br": ".br"}
+
+
+def _folder():
+    folder = current_app.config["SNAPSHOT_FOLDER"]
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _write_atomic(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def render_homepage():
+    """The combined document, as the JSON bytes the app would send."""
+    app = current_app._get_current_object()
+    document = {}
+    with app.test_request_context("/"):
+        for key, endpoint in HOMEPAGE_SECTIONS.items():
+            document[key] = app.make_response(app.view_functions[endpoint]()).get_json()
+    return app.json.dumps(document).encode()
+
+
+def build_homepage():
+    """Render, write every encoding, then swap the pointer. Returns the new etag."""
+    folder = _folder()
+    body = render_homepage()
+    etag = hashlib.sha1(body).hexdigest()
+    base = os.path.join(folder, f"homepage-{etag}.json")
+    if not os.path.exists(base):
+        if brotli is not None:
+            _write_atomic(base + ".br", brotli.compress(body, quality=11))
+        _write_atomic(base + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+        _write_atomic(base, body)
+
+    pointer = os.path.join(folder, POINTER)
+    previous = _read_pointer(folder)
+    _write_atomic(pointer, etag.encode())
+    _prune(folder, keep={etag, previous})
+    return etag
+
+
+def _read_pointer(folder):
+    try:
+        with open(os.path.join(folder, POINTER)) as fh:
+            return fh.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _prune(folder, keep):
+    for name in os.listdir(folder):
+        if name.startswith("homepage-") and name.split("-", 1)[1].split(".", 1)[0] not in keep:
+            try:
+                os.unlink(os.path.join(folder, name))
+            except FileNotFoundError:
+                pass  # another worker pruned it first
+
+
+def current_homepage(encoding=None):
+    """
+    (path, etag, encoding actually used) of the live snapshot, building it
+    first if none exists yet. `encoding` is 'br' / 'gzip' / None.
+    """
+    folder = _folder()
+    etag = _read_pointer(folder)
+    if etag is None or not os.path.exists(os.path.join(folder, f"homepage-{etag}.json")):
+        etag = build_homepage()
+    path = os.path.join(folder, f"homepage-{etag}.json")
+    if encoding in ENCODINGS and os.path.exists(path + ENCODINGS[encoding]):
+        return path + ENCODINGS[encoding], etag, encoding
+    return path, etag, None
+
+
+@changes.on_commit
+def _mark_stale(tables):
+    # no SQL may run inside after_commit; rebuild when the app context ends
+    if has_app_context() and tables & HOMEPAGE_TABLES:
+        g.homepage_stale = True
+
+
+def _rebuild_if_stale(exc):
+    if exc is None and g.pop("homepage_stale", False):
+        try:
+            build_homepage()
+        except Exception:
+            # keep serving the previous snapshot; the next write retries
+            current_app.logger.exception("Homepage snapshot rebuild failed")
+
+
+def init_app(app):
+    app.config.setdefault("SNAPSHOT_FOLDER", os.path.join(app.instance_path, "snapshots"))
+    # registered after db.init_app, so it runs before the session is removed
+    app.teardown_appcontext(_rebuild_if_stale)
@@ -0,0 +1,82 @@
+# app/sqlite.py
+"""
+Production profile for deployments that run on the SQLite fallback
+(cm_dev.sqlite) instead of Postgres.
+
+Every new SQLite connection gets SQLITE_PRAGMAS through the engine's connect
+event:
+    journal_mode=WAL       readers no longer block the writer (or vice versa)
+    synchronous=NORMAL     fsync at checkpoints only; safe with WAL
+    busy_timeout           a writer waits for the lock instead of failing at once
+    mmap_size, cache_size  fewer read syscalls for report queries
+
+SQLite still allows one writer at a time. Write views that teachers hit
+together on Sunday morning are wrapped in @retry_when_locked: if the lock
+wait still times out, the transaction is rolled back and the whole view runs
+again after an exponential backoff with jitter.
+
+Postgres engines are left alone; the decorator only reacts to SQLite's
+"database is locked" errors.
+"""
+import random
+import time
+from functools import wraps
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from .extensions import db
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # ms
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # negative = KiB, i.e. 64 MiB per connection
+}
+LOCKED_MESSAGES = ("database is locked", "database table is locked")
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def init_app(app):
+    app.config.setdefault("SQLITE_PROFILE", True)
+    app.config.setdefault("SQLITE_PRAGMAS", PRAGMAS)
+    app.config.setdefault("SQLITE_WRITE_RETRIES", 5)
+    app.config.setdefault("SQLITE_RETRY_DELAY", 0.05)
+    if not app.config["SQLITE_PROFILE"]:
+        return
+    pragmas = dict(app.config["SQLITE_PRAGMAS"])
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", lambda conn, record: apply_pragmas(conn, pragmas))
+
+
+def is_locked(exc):
+    return isinstance(exc, OperationalError) and any(m in str(exc.orig) for m in LOCKED_MESSAGES)
+
+
+def retry_when_locked(view):
+    """Re-run a write view, with backoff, when SQLite reports the database locked."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        retries = current_app.config["SQLITE_WRITE_RETRIES"]
+        delay = current_app.config["SQLITE_RETRY_DELAY"]
+        for attempt in range(retries + 1):
+            try:
+                return view(*args, **kwargs)
+            except OperationalError as exc:
+                db.session.rollback()
+                if attempt == retries or not is_locked(exc):
+                    raise
+                current_app.logger.warning("Database locked, retrying %s (attempt %d)", view.__name__, attempt + 1)
+                time.sleep(delay * 2 ** attempt * random.uniform(0.5, 1.5))
+    return wrapper
@@ -0,0 +1,86 @@
+# app/sync.py
+"""
+Delta sync for the teachers' mobile app.
+
+A sync token is a change_log id (see app/changes.py). For each table the
+client asks for, `changes_since(token)` returns the current version of every
+row logged after the token ("upserts") and the ids that are gone ("deletes";
+change_log 'delete' rows are the tombstones), plus the token to send next.
+The next token is the log's settled counter, not its newest id, so rows of
+the last CHANGE_LOG_SETTLE_SECONDS come again on the next sync and an id
+that commits late is not skipped; upserts and deletes are idempotent.
+
+A table comes back in full ("reset": true) when there is no token, the token
+is from another database (ahead of the log) or older than the pruned part of
+the log, a 'bulk' marker was logged, or so many rows changed that a full
+copy is cheaper. Full attendance copies only
+cover the last SYNC_ATTENDANCE_DAYS days.
+
+Attendance rows of a deleted child go with it through ON DELETE CASCADE,
+without log rows; clients drop them together with the child.
+"""
+from datetime import date, timedelta
+from flask import current_app
+from sqlalchemy import select
+from .extensions import db
+from .models import ChangeLog, SundayClass, Child, Attendance, Offering
+from . import changes
+
+MODELS = {model.__tablename__: model for model in (SundayClass, Child, Attendance, Offering)}
+FULL_RELOAD_AFTER = 2000  # changed rows in one table; past this a full copy is cheaper
+ID_CHUNK = 500
+
+
+def current_token():
+    return changes.bounds()[1]
+
+
+def _rows(model, ids=None):
+    table = model.__table__
+    stmt = select(table).order_by(table.c.id)
+    if ids is None:
+        if model is Attendance:
+            days = current_app.config["SYNC_ATTENDANCE_DAYS"]
+            stmt = stmt.where(table.c.date >= date.today() - timedelta(days=days))
+        return [dict(row._mapping) for row in db.session.execute(stmt)]
+    ids, rows = sorted(ids), []
+    for i in range(0, len(ids), ID_CHUNK):
+        chunk = stmt.where(table.c.id.in_(ids[i:i + ID_CHUNK]))
+        rows.extend(dict(row._mapping) for row in db.session.execute(chunk))
+    return rows
+
+
+def changes_since(since=None, tables=None):
+    """(new token, {table: {"reset", "upserts", "deletes"}}) for `since` (None = everything)."""
+    tables = tables or list(MODELS)
+    # read the counters first: anything committed meanwhile is sent again next time
+    oldest, token, newest = changes.bounds()
+    incremental = since is not None and since <= newest and since + 1 >= oldest
+    if incremental:
+        token = max(token, since)
+
+    logged = {name: [] for name in tables}
+    if incremental:
+        entries = db.session.query(ChangeLog.table_name, ChangeLog.row_id, ChangeLog.op).filter(
+            ChangeLog.id > since, ChangeLog.table_name.in_(tables)
+        )
+        for table_name, row_id, op in entries:
+            logged[table_name].append((row_id, op))
+
+    result = {}
+    for name in tables:
+        entries = logged[name]
+        if not incremental or len(entries) > FULL_RELOAD_AFTER or any(op == "bulk" for _, op in entries):
+            result[name] = {"reset": True, "upserts": _rows(MODELS[name]), "deletes": []}
+            continue
+        ids = {row_id for row_id, _ in entries}
+        rows = _rows(MODELS[name], ids) if ids else []
+        result[name] = {
+            "reset": False,
+            "upserts": rows,
+            "deletes": sorted(ids - {row["id"] for row in rows}),
+        }
+    return token, result
+
+
+changes.track(*MODELS.values())
@@ -0,0 +1,291 @@
+# app/synthetic.py
+"""
+Reproducible large-dataset generator for load and benchmark work.
+
+Everything is inserted with Core-level bulk INSERTs in chunks (no ORM unit of
+work, no per-row events), driven by one seeded random.Random so the same
+arguments always produce the same data. Every date (Sundays, birthdays,
+created_at stamps) counts back from the `end` anchor, which defaults to the
+fixed END rather than today, so a seed gives the same rows on any day; pass
+end=date.today() for data that runs up to now. Works on SQLite and Postgres.
+"""
+import random
+import time
+from datetime import date, datetime, time as clock, timedelta
+from decimal import Decimal
+from sqlalchemy import func, insert
+from werkzeug.security import generate_password_hash
+from .extensions import db
+from .models import (
+    AGE_RANGES, User, SundayClass, Child, Attendance, Offering, FinanceEntry, Expenditure,
+    Event, MediaItem, event_media, Visitor, Member, NewMember, Department, TimetableEntry,
+)
+from . import changes
+from .class_bands import years_before
+
+CHUNK = 5000
+END = date(2026, 10, 18)  # default anchor: the last Sunday of generated data
+
+FIRST_NAMES = [
+    "Achieng", "Amani", "Baraka", "Brian", "Chebet", "Daniel", "Esther", "Faith", "Grace",
+    "Hope", "Imani", "James", "Joy", "Kevin", "Lucy", "Mary", "Mercy", "Neema", "Otieno",
+    "Peter", "Ruth", "Samuel", "Sharon", "Tabitha", "Wanjiru", "Zawadi", "Emmanuel", "Ivy",
+]
+LAST_NAMES = [
+    "Kamau", "Otieno", "Wanjiku", "Mwangi", "Njeri", "Ochieng", "Kiptoo", "Chege", "Akinyi",
+    "Mutua", "Wambui", "Kariuki", "Odhiambo", "Muthoni", "Kiprono", "Nyambura", "Barasa",
+]
+PLACES = ["Karama", "Kasarani", "Roysambu", "Githurai", "Zimmerman", "Kahawa", "Mwiki", "Ruiru"]
+SERVICES = ["Sunday", "Midweek", "Youth", "Overnight"]
+EXPENSES = ["Rent - Main Hall", "Sound system", "Children snacks", "Transport", "Electricity", "Stationery"]
+DEPARTMENTS = ["Ushering", "Praise & Worship", "Media", "Intercessory", "Hospitality", "Missions"]
+
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _phone(rng):
+    return f"07{rng.randint(10000000, 99999999)}"
+
+
+def _money(rng, low, high):
+    return Decimal(f"{rng.uniform(low, high):.2f}")
+
+
+def _sundays(years, end):
+    last = end - timedelta(days=(end.weekday() + 1) % 7)
+    return [last - timedelta(weeks=w) for w in range(int(years * 52))][::-1]
+
+
+def _bulk(model, rows):
+    """Insert an iterable of dicts in CHUNK-sized executemany batches."""
+    table = model if hasattr(model, "c") else model.__table__
+    count, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK:
+            db.session.execute(insert(table), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+
+def _max_id(model):
+    return db.session.query(func.coalesce(func.max(model.id), 0)).scalar()
+
+
+def _ensure_classes():
+    existing = {c.name for c in SundayClass.query.all()}
+    for name, (min_age, max_age) in AGE_RANGES.items():
+        if name not in existing:
+            db.session.add(SundayClass(name=name, min_age=min_age, max_age=max_age))
+    db.session.flush()
+    return SundayClass.query.order_by(SundayClass.min_age).all()
+
+
+def _class_for(classes, age):
+    for c in classes:
+        if c.min_age is not None and c.max_age is not None and c.min_age <= age < c.max_age:
+            return c.id
+    return None
+
+
+def generate(children=1000, years=2, teachers=10, visitors=500, members=500,
+             new_members=100, events=50, seed=42, attendance_rate=0.7, end=END, echo=None):
+    """Generate a dataset ending on `end` and commit it. Returns {table: rows inserted}."""
+    rng = random.Random(seed)
+    echo = echo or (lambda msg: None)
+    counts = {}
+    now = datetime.combine(end, clock(12))  # created_at of every row
+    sundays = _sundays(years, end)
+
+    def step(label, fn):
+        started = time.perf_counter()
+        counts[label] = fn()
+        echo(f"  {label:<16} {counts[label]:>9,} rows  {time.perf_counter() - started:6.2f}s")
+
+    classes = _ensure_classes()
+    class_ids = [c.id for c in classes]
+
+    # one hash for every synthetic account: hashing is deliberately slow
+    password_hash = generate_password_hash("synthetic-password")
+    first_user = _max_id(User) + 1
+    step("users", lambda: _bulk(User, (
+        {
+            "username": f"synthetic_teacher_{first_user + i}",
+            "name": _name(rng),
+            "phone": _phone(rng),
+            "role": "teacher",
+            "password_hash": password_hash,
+            "must_change_password": False,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        } for i in range(teachers)
+    )))
+    user_ids = [u for (u,) in db.session.query(User.id).filter(User.id >= first_user)] or [None]
+
+    first_child = _max_id(Child) + 1
+
+    def child_rows():
+        for _ in range(children):
+            age = rng.randint(0, 17)
+            yield {
+                "name": _name(rng),
+                "age": age,
+                "date_of_birth": years_before(end, age) - timedelta(days=rng.randint(0, 364)),
+                "gender": rng.choice(["Male", "Female"]),
+                "parent_name": _name(rng),
+                "parent_contact": _phone(rng),
+                "class_id": _class_for(classes, age),
+                "added_by_id": rng.choice(user_ids),
+                "created_at": now,
+            }
+
+    step("children", lambda: _bulk(Child, child_rows()))
+    roster = db.session.query(Child.id, Child.class_id).filter(Child.id >= first_child).all()
+
+    def attendance_rows():
+        for day in sundays:
+            for child_id, class_id in roster:
+                if rng.random() < attendance_rate:
+                    yield {
+                        "date": day,
+                        "child_id": child_id,
+                        "present": rng.random() < 0.9,
+                        "class_id": class_id,
+                        "recorded_by": rng.choice(user_ids),
+                        "created_at": now,
+                    }
+
+    step("attendance", lambda: _bulk(Attendance, attendance_rows()))
+
+    step("offerings", lambda: _bulk(Offering, (
+        {
+            "date": day,
+            "class_id": class_id,
+            "amount": _money(rng, 50, 3000),
+            "recorded_by": rng.choice(user_ids),
+            "created_at": now,
+        } for day in sundays for class_id in class_ids
+    )))
+
+    step("finance_entries", lambda: _bulk(FinanceEntry, (
+        {
+            "date": day - timedelta(days=offset),
+            "service_type": service,
+            "main_church": _money(rng, 5000, 80000),
+            "children_ministry": _money(rng, 500, 8000),
+            "created_by": rng.choice(user_ids),
+            "created_at": now,
+        } for day in sundays for offset, service in ((0, "Sunday"), (4, "Midweek"))
+    )))
+
+    step("expenditures", lambda: _bulk(Expenditure, (
+        {
+            "date": day,
+            "amount": _money(rng, 500, 40000),
+            "details": rng.choice(EXPENSES),
+            "created_by": rng.choice(user_ids),
+            "created_at": now,
+        } for day in sundays if rng.random() < 0.6
+    )))
+
+    step("timetable", lambda: _bulk(TimetableEntry, (
+        {
+            "date": day,
+            "class_id": class_id,
+            "teacher_id": rng.choice(user_ids),
+            "topic": f"Lesson {i}",
+            "created_at": now,
+        } for i, day in enumerate(sundays[-12:]) for class_id in class_ids
+    )))
+
+    first_event = _max_id(Event) + 1
+    first_media = _max_id(MediaItem) + 1
+    media_per_event = [rng.randint(1, 4) for _ in range(events)]
+
+    def event_rows():
+        for i in range(events):
+            start = datetime.combine(rng.choice(sundays), datetime.min.time()) + timedelta(hours=9)
+            yield {
+                "headline": f"{rng.choice(['Camp', 'Conference', 'Fun Day', 'Outreach'])} {i + 1}",
+                "message": "Synthetic event",
+                "start_date": start,
+                "end_date": start + timedelta(days=rng.randint(0, 3)),
+                "created_by": rng.choice(user_ids),
+                "created_at": now,
+            }
+
+    def media_rows():
+        for i, n in enumerate(media_per_event):
+            for j in range(n):
+                is_video = rng.random() < 0.2
+                yield {
+                    "filename": f"event{i + 1}_{j + 1}.{'mp4' if is_video else 'jpg'}",
+                    "url": f"/uploads/synthetic/event{i + 1}_{j + 1}",
+                    "mimetype": "video/mp4" if is_video else "image/jpeg",
+                    "description": "Synthetic media",
+                    "uploaded_by": rng.choice(user_ids),
+                    "uploaded_at": now,
+                    "is_featured": rng.random() < 0.1,
+                }
+
+    def link_rows():
+        media_id = first_media
+        for i, n in enumerate(media_per_event):
+            for _ in range(n):
+                yield {"event_id": first_event + i, "media_id": media_id}
+                media_id += 1
+
+    step("events", lambda: _bulk(Event, event_rows()))
+    step("media_items", lambda: _bulk(MediaItem, media_rows()))
+    step("event_media", lambda: _bulk(event_media, link_rows()))
+
+    existing_depts = {d.name for d in Department.query.all()}
+    step("departments", lambda: _bulk(Department, (
+        {"name": name, "description": f"{name} department"} for name in DEPARTMENTS if name not in existing_depts
+    )))
+    dept_ids = [d for (d,) in db.session.query(Department.id)] or [None]
+
+    step("visitors", lambda: _bulk(Visitor, (
+        {
+            "full_name": _name(rng),
+            "phone": _phone(rng),
+            "residence": rng.choice(PLACES),
+            "date_of_visit": rng.choice(sundays),
+            "follow_up_status": rng.choice(["pending", "contacted", "joined"]),
+            "created_at": now,
+        } for _ in range(visitors)
+    )))
+
+    step("members", lambda: _bulk(Member, (
+        {
+            "full_name": _name(rng),
+            "phone": _phone(rng),
+            "residence": rng.choice(PLACES),
+            "date_joined": rng.choice(sundays),
+            "department_id": rng.choice(dept_ids),
+            "created_at": now,
+        } for _ in range(members)
+    )))
+
+    step("new_members", lambda: _bulk(NewMember, (
+        {
+            "name": _name(rng),
+            "phone": _phone(rng),
+            "join_date": rng.choice(sundays),
+            "residence": rng.choice(PLACES),
+            "department_id": rng.choice(dept_ids),
+        } for _ in range(new_members)
+    )))
+
+    # bulk inserts skip the ORM flush hooks, so tell change-log readers to reload
+    for table in (Child, Attendance, Offering):
+        changes.record_bulk(table.__tablename__)
+    db.session.commit()
+    return counts
@@ -0,0 +1,108 @@
+# benchmarks/money_aggregates.py
+"""
+Ledger aggregates with amounts stored as NUMERIC(12,2) (before) and as
+integer cents through app.money.MoneyType (after).
+
+The same random ledger goes into two tables of a SQLite file, one per
+storage. For each it times:
+    sum         SELECT SUM(amount)
+    monthly     SUM(amount) GROUP BY month, as the dashboards do
+    python      load every amount and sum in Python (the old export path:
+                sum(float(x) for x in ...))
+and reports whether the total equals the exact sum of the generated cents
+(SQLite keeps NUMERIC as REAL, so the "before" sum is a float sum rounded
+back to cents).
+
+    python -m benchmarks.money_aggregates
+    python -m benchmarks.money_aggregates --rows 1000000 --repeat 3
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import Column, Date, Integer, MetaData, Numeric, Table, create_engine, func, select
+
+from app.money import Money, MoneyType
+
+metadata = MetaData()
+TABLES = {
+    "before": Table("ledger_numeric", metadata, Column("id", Integer, primary_key=True),
+                    Column("date", Date, nullable=False), Column("amount", Numeric(12, 2), nullable=False)),
+    "after": Table("ledger_cents", metadata, Column("id", Integer, primary_key=True),
+                   Column("date", Date, nullable=False), Column("amount", MoneyType, nullable=False)),
+}
+
+
+def _ledger(rows, seed):
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=365 * 5)
+    return [
+        {"date": start + timedelta(days=rng.randrange(365 * 5)), "cents": rng.randrange(5_000, 8_000_000)}
+        for _ in range(rows)
+    ]
+
+
+def _timed(fn, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), result
+
+
+def run(rows, repeat, seed):
+    ledger = _ledger(rows, seed)
+    exact = sum(r["cents"] for r in ledger)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, 'ledger.sqlite')}")
+        metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(TABLES["before"].insert(),
+                         [{"date": r["date"], "amount": Decimal(r["cents"]).scaleb(-2)} for r in ledger])
+            conn.execute(TABLES["after"].insert(), [{"date": r["date"], "amount": Money.from_cents(r["cents"])}
+                                                    for r in ledger])
+
+        with engine.connect() as conn:
+            for name, table in TABLES.items():
+                month = func.strftime("%Y-%m", table.c.date)
+                total_ms, total = _timed(lambda: conn.execute(select(func.sum(table.c.amount))).scalar(), repeat)
+                monthly_ms, _ = _timed(
+                    lambda: conn.execute(select(month, func.sum(table.c.amount)).group_by(month)).all(), repeat)
+                python_ms, _ = _timed(
+                    lambda: sum(float(a) for (a,) in conn.execute(select(table.c.amount))), repeat)
+                results[name] = {
+                    "sum_ms": round(total_ms, 2),
+                    "monthly_ms": round(monthly_ms, 2),
+                    "python_ms": round(python_ms, 2),
+                    "exact": Money(total) == Money.from_cents(exact),
+                }
+        engine.dispose()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    for name, stats in run(args.rows, args.repeat, args.seed).items():
+        print(
+            f"{name:<7} sum {stats['sum_ms']:>8.2f} ms  monthly {stats['monthly_ms']:>8.2f} ms  "
+            f"python {stats['python_ms']:>8.2f} ms  exact total: {'yes' if stats['exact'] else 'no'}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# benchmarks/run.py
+"""
+Endpoint benchmarks: latency and queries-per-request at several data sizes.
+
+Each size gets a fresh SQLite file seeded with app.synthetic, then every hot
+endpoint is called through the Flask test client while QueryCounter records
+the SQL it runs.
+
+    python -m benchmarks.run                        # compare with benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline      # record a new baseline
+    python -m benchmarks.run --sizes 100,1000 --repeat 10 --output results.json
+
+A run fails (exit 1) when an endpoint issues more queries than the baseline
+at the same size (a new N+1 shows up as growth), or when its median latency
+exceeds the baseline by more than --latency-tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.diagnostics import QueryCounter
+from app.extensions import db
+from app.models import Child, User
+from app.synthetic import generate
+from config import TestConfig
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+LATENCY_FLOOR_MS = 5.0  # differences below this are noise
+
+
+def _child_ids(state):
+    ids = state["child_ids"]
+    state["cursor"] = (state.get("cursor", -1) + 1) % len(ids)
+    return ids[state["cursor"]]
+
+
+ENDPOINTS = [
+    {"name": "list_children", "method": "GET", "path": lambda s: "/api/children/"},
+    {
+        "name": "mark_attendance", "method": "POST", "auth": True,
+        "path": lambda s: f"/api/children/{_child_ids(s)}/attendance",
+        "json": lambda s: {"date": date.today().isoformat(), "present": True},
+    },
+    {"name": "kpi", "method": "GET", "path": lambda s: "/api/reports/kpi"},
+    {"name": "get_events", "method": "GET", "path": lambda s: "/api/events"},
+    {"name": "get_all_finances", "method": "GET", "auth": True, "path": lambda s: "/api/finance/all"},
+    {"name": "export_finance_pdf", "method": "GET", "path": lambda s: "/api/finance/export/pdf"},
+    {"name": "list_timetable", "method": "GET", "path": lambda s: "/api/timetable"},
+    {"name": "gallery_photos", "method": "GET", "path": lambda s: "/api/gallery/photos"},
+]
+
+
+def _build(size, years, seed, workdir):
+    class BenchConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, f'bench_{size}.sqlite')}"
+        CACHE_BACKEND = "none"  # measure the endpoint, not the aggregate cache
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        generate(
+            children=size, years=years, teachers=max(5, size // 100), visitors=size // 2,
+            members=size // 2, new_members=size // 10, events=max(10, size // 100), seed=seed,
+        )
+        admin = User(username="bench_admin", name="Bench Admin", role="admin", must_change_password=False)
+        admin.set_password("bench")
+        db.session.add(admin)
+        db.session.commit()
+        state = {
+            "token": create_access_token(identity=str(admin.id)),
+            "child_ids": [cid for (cid,) in db.session.query(Child.id).order_by(Child.id)],
+        }
+    return app, state
+
+
+def _measure(client, endpoint, state, repeat):
+    timings, queries, status = [], 0, None
+    for i in range(repeat + 1):
+        headers = {"Authorization": f"Bearer {state['token']}"} if endpoint.get("auth") else {}
+        body = endpoint["json"](state) if "json" in endpoint else None
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            resp = client.open(endpoint["path"](state), method=endpoint["method"], json=body, headers=headers)
+            elapsed = (time.perf_counter() - started) * 1000
+        status = resp.status_code
+        if i == 0:
+            continue  # warm-up: first-request imports, statement caches
+        timings.append(elapsed)
+        queries = max(queries, counter.count)
+    return {
+        "status": status,
+        "queries": queries,
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def run(sizes, years, repeat, seed):
+    results = {e["name"]: {} for e in ENDPOINTS}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            print(f"== size {size}: seeding...", file=sys.stderr)
+            app, state = _build(size, years, seed, workdir)
+            client = app.test_client()
+            for endpoint in ENDPOINTS:
+                stats = _measure(client, endpoint, state, repeat)
+                results[endpoint["name"]][str(size)] = stats
+                print(
+                    f"   {endpoint['name']:<20} {stats['median_ms']:>9.2f} ms  "
+                    f"{stats['queries']:>4} queries  [{stats['status']}]",
+                    file=sys.stderr,
+                )
+            with app.app_context():
+                db.engine.dispose()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "sizes": sizes,
+            "years": years,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, latency_tolerance):
+    """Return a list of human-readable regressions (empty when clean)."""
+    problems = []
+    for name, by_size in current["results"].items():
+        for size, stats in by_size.items():
+            if stats["status"] >= 400:
+                problems.append(f"{name}@{size}: HTTP {stats['status']}")
+            base = baseline.get("results", {}).get(name, {}).get(size)
+            if base is None:
+                continue
+            if stats["queries"] > base["queries"]:
+                problems.append(f"{name}@{size}: {stats['queries']} queries (baseline {base['queries']})")
+            if latency_tolerance:
+                limit = max(base["median_ms"] * latency_tolerance, base["median_ms"] + LATENCY_FLOOR_MS)
+                if stats["median_ms"] > limit:
+                    problems.append(
+                        f"{name}@{size}: {stats['median_ms']:.1f} ms median "
+                        f"(baseline {base['median_ms']:.1f} ms, limit {limit:.1f} ms)"
+                    )
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,5000", help="comma-separated child counts")
+    parser.add_argument("--years", type=float, default=1.0, help="years of weekly history per size")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--latency-tolerance", type=float, default=3.0,
+                        help="fail when median latency exceeds baseline x this (0 disables)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    current = run(sizes, args.years, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(current, fh, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as fh:
+            json.dump(current, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first.")
+        return 1
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+
+    problems = compare(current, baseline, args.latency_tolerance)
+    if problems:
+        print("Benchmark regressions:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print("Benchmarks within baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
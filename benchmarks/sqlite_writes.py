@@ -0,0 +1,125 @@
+# benchmarks/sqlite_writes.py
+"""
+Concurrent attendance writes against a SQLite file, with and without the
+production profile in app/sqlite.py (WAL + pragmas + retried writes).
+
+Several threads, each standing in for a teacher's phone, POST attendance
+marks at the same time through their own test client. Reported per profile:
+completed writes per second, failed requests ("database is locked" comes
+back as a 500) and the slowest request.
+
+    python -m benchmarks.sqlite_writes
+    python -m benchmarks.sqlite_writes --threads 16 --writes 100 --timeout 1
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import db
+from app.models import Child, User
+from app.sqlite import PRAGMAS
+from app.synthetic import generate
+from config import TestConfig
+
+PROFILES = {
+    "before": {"SQLITE_PROFILE": False, "SQLITE_WRITE_RETRIES": 0},
+    "after": {"SQLITE_PROFILE": True},
+}
+
+
+def _build(workdir, name, settings, children, timeout):
+    class WriteBenchConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, f'writes_{name}.sqlite')}"
+        # pysqlite's own lock wait; the profile's busy_timeout replaces it
+        SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {"timeout": timeout}}
+        SQLITE_PRAGMAS = dict(PRAGMAS, busy_timeout=int(timeout * 1000))
+        CACHE_BACKEND = "none"
+        PROPAGATE_EXCEPTIONS = False  # a locked write is a 500, as in production
+
+    for key, value in settings.items():
+        setattr(WriteBenchConfig, key, value)
+    app = create_app(WriteBenchConfig)
+    with app.app_context():
+        db.create_all()
+        generate(children=children, years=0, teachers=5, visitors=0, members=0, new_members=0, events=0, seed=7)
+        admin = User(username="bench_admin", name="Bench Admin", role="admin", must_change_password=False)
+        admin.set_password("bench")
+        db.session.add(admin)
+        db.session.commit()
+        token = create_access_token(identity=str(admin.id))
+        child_ids = [cid for (cid,) in db.session.query(Child.id).order_by(Child.id)]
+    return app, token, child_ids
+
+
+def _teacher(app, token, child_ids, writes, offset, results):
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    ok = failed = 0
+    slowest = 0.0
+    for i in range(writes):
+        child_id = child_ids[(offset + i) % len(child_ids)]
+        # a fresh (child, date) pair per write so every request inserts
+        day = (date.today() - timedelta(weeks=offset * writes + i)).isoformat()
+        started = time.perf_counter()
+        resp = client.post(f"/api/children/{child_id}/attendance", json={"date": day, "present": True},
+                           headers=headers)
+        slowest = max(slowest, time.perf_counter() - started)
+        if resp.status_code == 201:
+            ok += 1
+        else:
+            failed += 1
+    results.append((ok, failed, slowest))
+
+
+def run_profile(name, settings, threads, writes, children, timeout):
+    with tempfile.TemporaryDirectory() as workdir:
+        app, token, child_ids = _build(workdir, name, settings, children, timeout)
+        results = []
+        workers = [
+            threading.Thread(target=_teacher, args=(app, token, child_ids, writes, n, results))
+            for n in range(threads)
+        ]
+        started = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - started
+        with app.app_context():
+            db.engine.dispose()
+    ok = sum(r[0] for r in results)
+    return {
+        "writes_per_s": round(ok / elapsed, 1),
+        "ok": ok,
+        "failed": sum(r[1] for r in results),
+        "slowest_ms": round(max(r[2] for r in results) * 1000, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=50, help="attendance marks per thread")
+    parser.add_argument("--children", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds a writer waits for the lock")
+    args = parser.parse_args(argv)
+
+    for name, settings in PROFILES.items():
+        stats = run_profile(name, settings, args.threads, args.writes, args.children, args.timeout)
+        print(
+            f"{name:<7} {stats['writes_per_s']:>8.1f} writes/s  {stats['ok']:>5} ok  "
+            f"{stats['failed']:>4} failed  slowest {stats['slowest_ms']:.0f} ms",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
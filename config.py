@@ -1,5 +1,6 @@
 # config.py
 import os
+import tempfile
 from datetime import timedelta
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -9,8 +10,9 @@ BASE_UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
 PROGRAMS_UPLOAD_FOLDER = os.path.join(BASE_UPLOAD_FOLDER, "programs")
 CHILDREN_UPLOAD_FOLDER = os.path.join(BASE_UPLOAD_FOLDER, "children")
 
-os.makedirs(PROGRAMS_UPLOAD_FOLDER, exist_ok=True)
-os.makedirs(CHILDREN_UPLOAD_FOLDER, exist_ok=True)
+UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads", "programs")
+
+# upload folders are created in create_app(), not as an import side effect
 
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret")
@@ -21,30 +23,83 @@ class Config:
             "postgresql://", "postgresql+psycopg2://", 1
         )
 
+    # optional read replica (app/replica.py): GET traffic reads from it
+    SQLALCHEMY_BINDS = {}
+    if os.environ.get("DATABASE_REPLICA_URL"):
+        SQLALCHEMY_BINDS["replica"] = os.environ["DATABASE_REPLICA_URL"].replace(
+            "postgresql://", "postgresql+psycopg2://", 1
+        )
+    REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 10))
+
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "jwt-secret-dev")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=7)
     BASE_UPLOAD_FOLDER = BASE_UPLOAD_FOLDER
     PROGRAMS_UPLOAD_FOLDER = PROGRAMS_UPLOAD_FOLDER
     CHILDREN_UPLOAD_FOLDER = CHILDREN_UPLOAD_FOLDER
-
-
-
-
-#for testing cloudinary integration
-
-import cloudinary
-
-cloudinary.config(
-    cloud_name=os.environ.get("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.environ.get("CLOUDINARY_API_KEY"),
-    api_secret=os.environ.get("CLOUDINARY_API_SECRET")
-)  
-    
-
-UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads", "programs")
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-    # other config values if needed
-
-
+    UPLOAD_FOLDER = UPLOAD_FOLDER
+    # cloudinary is configured lazily from these (app.extensions.cloudinary_uploader)
+    CLOUDINARY_CLOUD_NAME = os.environ.get("CLOUDINARY_CLOUD_NAME")
+    CLOUDINARY_API_KEY = os.environ.get("CLOUDINARY_API_KEY")
+    CLOUDINARY_API_SECRET = os.environ.get("CLOUDINARY_API_SECRET")
+    # how often each worker re-reads the children change counter for autocomplete
+    AUTOCOMPLETE_REFRESH_SECONDS = float(os.environ.get("AUTOCOMPLETE_REFRESH_SECONDS", 1.0))
+    # gzip/brotli for JSON and text bodies of at least this many bytes
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_LEVEL = 6
+    COMPRESS_BR_QUALITY = 5
+    # aggregate cache (app/cache.py): memory | redis | none
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_DEFAULT_TTL = int(os.environ.get("CACHE_DEFAULT_TTL", 300))
+    CACHE_MAX_ENTRIES = 1024
+    # how often each worker re-reads the shared generation counters (memory backend)
+    CACHE_GENERATION_REFRESH_SECONDS = float(os.environ.get("CACHE_GENERATION_REFRESH_SECONDS", 1.0))
+    # precomputed homepage document (app/snapshots.py); shared by all workers
+    SNAPSHOT_FOLDER = os.environ.get("SNAPSHOT_FOLDER", os.path.join(BASE_DIR, "instance", "snapshots"))
+    # most sub-requests one /api/batch call may carry
+    BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", 20))
+    # how much attendance history a full /api/sync copy carries
+    SYNC_ATTENDANCE_DAYS = int(os.environ.get("SYNC_ATTENDANCE_DAYS", 90))
+    # change_log (app/changes.py): readers re-read this many seconds behind the
+    # newest row, since ids can commit out of order; rows older than the
+    # retention are pruned daily and a sync token from before them resets
+    CHANGE_LOG_SETTLE_SECONDS = int(os.environ.get("CHANGE_LOG_SETTLE_SECONDS", 60))
+    CHANGE_LOG_RETENTION_DAYS = int(os.environ.get("CHANGE_LOG_RETENTION_DAYS", 30))
+    # live KPI stream (app/live.py): local | redis (fan-out across workers)
+    LIVE_BUS = os.environ.get("LIVE_BUS", "local")
+    LIVE_REDIS_URL = os.environ.get("LIVE_REDIS_URL", "redis://localhost:6379/0")
+    LIVE_HEARTBEAT_SECONDS = 15
+    # SQLite fallback (app/sqlite.py): WAL + pragmas on connect, retried writes
+    SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "1") != "0"
+    SQLITE_WRITE_RETRIES = int(os.environ.get("SQLITE_WRITE_RETRIES", 5))
+    # background jobs (app/jobs.py), run by `flask worker`
+    JOBS_VISIBILITY_TIMEOUT = int(os.environ.get("JOBS_VISIBILITY_TIMEOUT", 300))
+    JOBS_MAX_ATTEMPTS = int(os.environ.get("JOBS_MAX_ATTEMPTS", 5))
+    JOBS_RETRY_DELAY = 10
+    JOB_RESULTS_FOLDER = os.environ.get("JOB_RESULTS_FOLDER", os.path.join(BASE_DIR, "instance", "job_results"))
+    # periodic maintenance (app/scheduler.py, app/maintenance.py); cron in UTC,
+    # e.g. SCHEDULES = {"classes.reassign": "0 5 * * 0", "homepage.rebuild": None}
+    SCHEDULES = {}
+    HISTORY_RETENTION_DAYS = 30
+    # uploads.prune_orphans is off until SCHEDULES gives it a cron; it only lists
+    # orphans unless UPLOADS_ORPHAN_ACTION is "quarantine", which moves them
+    # aside (never deletes)
+    UPLOADS_ORPHAN_GRACE_HOURS = 24
+    UPLOADS_ORPHAN_ACTION = os.environ.get("UPLOADS_ORPHAN_ACTION", "report")
+    UPLOADS_QUARANTINE_FOLDER = os.environ.get(
+        "UPLOADS_QUARANTINE_FOLDER", os.path.join(BASE_DIR, "instance", "upload_quarantine")
+    )
+    # oldest age the daily birthday promotion keeps current (app/class_bands.py)
+    PROMOTION_MAX_AGE = 21
+
+
+class TestConfig(Config):
+    """Benchmarks and tests: throwaway database, never the one in DATABASE_URL."""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get("TEST_DATABASE_URL", "sqlite://")
+    SQLALCHEMY_BINDS = {}
+    SNAPSHOT_FOLDER = os.path.join(tempfile.gettempdir(), "cm_test_snapshots")
+    JOB_RESULTS_FOLDER = os.path.join(tempfile.gettempdir(), "cm_test_job_results")
+    UPLOADS_QUARANTINE_FOLDER = os.path.join(tempfile.gettempdir(), "cm_test_upload_quarantine")
+    CHANGE_LOG_SETTLE_SECONDS = 0  # tests read their own writes straight back
@@ -0,0 +1,34 @@
+# gunicorn.conf.py
+"""
+Read by `gunicorn wsgi:app` when started from this directory.
+
+/api/live/kpi (app/live.py) keeps its response open for the whole service.
+Under gunicorn's default sync worker every open dashboard would take a whole
+worker process, and the worker timeout would kill the stream. Threaded
+workers fix both: a stream holds one thread, and the timeout only watches the
+worker's main loop.
+
+    GUNICORN_WORKERS       processes (default 2)
+    GUNICORN_THREADS       threads per process (default 32); open dashboards
+                           plus ordinary requests in flight must fit in
+                           workers * threads
+    GUNICORN_WORKER_CLASS  gthread (default) or gevent (needs gevent installed)
+
+Starting with a sync worker (e.g. `-k sync --threads 1`) is refused.
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get("GUNICORN_WORKERS", 2))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 32))
+timeout = 60
+
+
+def on_starting(server):
+    from gunicorn.workers.sync import SyncWorker
+
+    if issubclass(server.cfg.worker_class, SyncWorker):
+        raise RuntimeError(
+            "/api/live/kpi needs a threaded or async worker: use -k gthread --threads N or -k gevent"
+        )
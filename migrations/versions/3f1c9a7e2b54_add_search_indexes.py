@@ -0,0 +1,28 @@
+"""add search indexes (pg_trgm on postgres, fts5 on sqlite)
+
+Revision ID: 3f1c9a7e2b54
+Revises: 1aae129b1934
+Create Date: 2026-10-19 09:12:40.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app import search
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7e2b54'
+down_revision = '1aae129b1934'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GIN trigram indexes on postgres; FTS5 table + sync triggers on sqlite,
+    # backfilled from the existing rows
+    search.install(op.get_bind(), rebuild_index=True)
+
+
+def downgrade():
+    search.uninstall(op.get_bind())
@@ -0,0 +1,73 @@
+"""one offering row per class and date
+
+Revision ID: b4d1f6a8c2e9
+Revises: a3c9e5f7b1d8
+Create Date: 2026-10-19 20:03:51.774120
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d1f6a8c2e9'
+down_revision = 'a3c9e5f7b1d8'
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+UNASSIGNED = sa.text("class_id IS NULL")
+
+
+def _merge_duplicates(bind):
+    """
+    Fold every (class_id, date) group with several rows into its newest row:
+    the old POST added a row per save, so the day's total is their SUM (what
+    the additive POST now writes). Unassigned offerings (class_id NULL) are
+    one group per date. Returns the number of rows folded away.
+    """
+    groups = bind.execute(sa.text(
+        "SELECT class_id, date, MAX(id), SUM(amount), COUNT(*) FROM offerings"
+        " GROUP BY class_id, date HAVING COUNT(*) > 1"
+    )).all()
+    merged = 0
+    for class_id, day, keep, total, count in groups:
+        same_group = "class_id IS NULL" if class_id is None else "class_id = :class_id"
+        params = {"class_id": class_id, "date": day, "keep": keep}
+        ids = [row[0] for row in bind.execute(
+            sa.text(f"SELECT id FROM offerings WHERE {same_group} AND date = :date AND id <> :keep ORDER BY id"),
+            params,
+        )]
+        bind.execute(sa.text(
+            "UPDATE offerings SET amount = :total, note = COALESCE(note, ("
+            f" SELECT MAX(note) FROM offerings WHERE {same_group} AND date = :date)) WHERE id = :keep"
+        ), {**params, "total": total})
+        bind.execute(sa.text(f"DELETE FROM offerings WHERE {same_group} AND date = :date AND id <> :keep"), params)
+        log.info("offerings: merged ids %s into %s (class %s, %s): %s rows, total %s",
+                 ids, keep, class_id, day, count, total)
+        merged += len(ids)
+    return merged
+
+
+def upgrade():
+    merged = _merge_duplicates(op.get_bind())
+    if merged:
+        log.info("offerings: folded %s duplicate rows", merged)
+        # sync clients reload offerings in full
+        op.execute(
+            "INSERT INTO change_log (table_name, op, changed_at) VALUES ('offerings', 'bulk', CURRENT_TIMESTAMP)"
+        )
+
+    with op.batch_alter_table('offerings', schema=None) as batch_op:
+        batch_op.create_index('uq_offerings_class_id_date', ['class_id', 'date'], unique=True)
+        # NULLs never collide in the index above: unassigned offerings get their own
+        batch_op.create_index('uq_offerings_unassigned_date', ['date'], unique=True,
+                              postgresql_where=UNASSIGNED, sqlite_where=UNASSIGNED)
+
+
+def downgrade():
+    with op.batch_alter_table('offerings', schema=None) as batch_op:
+        batch_op.drop_index('uq_offerings_unassigned_date')
+        batch_op.drop_index('uq_offerings_class_id_date')
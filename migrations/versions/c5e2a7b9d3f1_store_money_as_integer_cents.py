@@ -0,0 +1,55 @@
+"""store money as integer cents
+
+Revision ID: c5e2a7b9d3f1
+Revises: b4d1f6a8c2e9
+Create Date: 2026-10-19 20:48:27.316054
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e2a7b9d3f1'
+down_revision = 'b4d1f6a8c2e9'
+branch_labels = None
+depends_on = None
+
+# (table, column, nullable, type before)
+MONEY_COLUMNS = [
+    ('offerings', 'amount', False, sa.Numeric(precision=12, scale=2)),
+    ('finance_entries', 'main_church', True, sa.Numeric(precision=12, scale=2)),
+    ('finance_entries', 'children_ministry', True, sa.Numeric(precision=12, scale=2)),
+    ('expenditures', 'amount', False, sa.Numeric(precision=12, scale=2)),
+    ('mission_partners', 'support', True, sa.Float()),
+]
+
+
+def upgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for table, column, nullable, old_type in MONEY_COLUMNS:
+        if postgres:
+            op.alter_column(table, column, existing_type=old_type, type_=sa.BigInteger(),
+                            existing_nullable=nullable,
+                            postgresql_using=f'ROUND({column}::numeric * 100)::bigint')
+        else:
+            # SQLite: rewrite the values first; the INTEGER affinity keeps whole numbers as they are
+            op.execute(f'UPDATE {table} SET {column} = CAST(ROUND({column} * 100) AS INTEGER) '
+                       f'WHERE {column} IS NOT NULL')
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.alter_column(column, existing_type=old_type, type_=sa.BigInteger(),
+                                      existing_nullable=nullable)
+
+
+def downgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for table, column, nullable, old_type in reversed(MONEY_COLUMNS):
+        if postgres:
+            op.alter_column(table, column, existing_type=sa.BigInteger(), type_=old_type,
+                            existing_nullable=nullable,
+                            postgresql_using=f'({column} / 100.0)::{old_type.compile(dialect=op.get_bind().dialect)}')
+        else:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.alter_column(column, existing_type=sa.BigInteger(), type_=old_type,
+                                      existing_nullable=nullable)
+            op.execute(f'UPDATE {table} SET {column} = {column} / 100.0 WHERE {column} IS NOT NULL')
@@ -1,20 +1,13 @@
 # scripts/seed.py
 from app import create_app
 from app.extensions import db
-from app.models import SundayClass, User
+from app.models import AGE_RANGES, SundayClass, User
 
 app = create_app()
 app.app_context().push()
 
 # create classes if missing
-classes = [
-    ("Gifted Brains", 0, 3),
-    ("Beginners", 3, 6),
-    ("Shinners", 6, 9),
-    ("Conquerors", 9, 13),
-    ("Teens", 13, 17),
-]
-for name, min_age, max_age in classes:
+for name, (min_age, max_age) in AGE_RANGES.items():
     if not SundayClass.query.filter_by(name=name).first():
         c = SundayClass(name=name, min_age=min_age, max_age=max_age)
         db.session.add(c)
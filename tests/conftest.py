@@ -0,0 +1,68 @@
+# tests/conftest.py
+from datetime import date
+import pytest
+from flask_jwt_extended import create_access_token
+from werkzeug.security import generate_password_hash
+from app import create_app
+from app.extensions import db
+from app.models import User, Department, Mission, MissionPartner, Program, ProgramFile
+from app.synthetic import generate
+from config import TestConfig
+
+
+# hashing is deliberately slow; every seeded account shares one hash
+PASSWORD_HASH = generate_password_hash("admin123")
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(TestConfig)
+    app.config["SNAPSHOT_FOLDER"] = str(tmp_path / "snapshots")
+    app.config["JOB_RESULTS_FOLDER"] = str(tmp_path / "job_results")
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def seeded(app):
+    """
+    A small but non-trivial dataset: every listing has several rows, and every
+    row has related rows, so a per-row lazy load shows up as extra queries.
+    It runs up to today: promotion, live totals and sync windows count from it.
+    """
+    with app.app_context():
+        generate(children=40, years=0.25, teachers=3, visitors=8, members=8,
+                 new_members=5, events=5, seed=1, end=date.today())
+        admin = User(username="admin", name="Administrator", role="admin",
+                     must_change_password=False, password_hash=PASSWORD_HASH)
+        db.session.add(admin)
+
+        for dept in Department.query.all():
+            for i in range(2):
+                db.session.add(User(username=f"{dept.name}-{i}", role="teacher",
+                                    department=dept, password_hash=PASSWORD_HASH))
+        for i in range(4):
+            mission = Mission(title=f"Mission {i}", location="Karama", souls_won=i)
+            mission.partners = [MissionPartner(name=f"Partner {i}-{j}", support=100.0 * j) for j in range(3)]
+            db.session.add(mission)
+            program = Program(description=f"Program {i}", coordinator="Coordinator", date="2026-01-01")
+            program.files = [ProgramFile(filename=f"program{i}_{j}.pdf", file_type="application/pdf") for j in range(2)]
+            db.session.add(program)
+        db.session.commit()
+        token = create_access_token(identity=str(admin.id))
+    return {"token": token}
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(seeded):
+    return {"Authorization": f"Bearer {seeded['token']}"}
@@ -0,0 +1,56 @@
+# tests/test_autocomplete.py
+from unittest import mock
+import pytest
+from app import autocomplete
+from app.autocomplete import PrefixIndex
+
+
+@pytest.fixture
+def names(client, seeded):
+    autocomplete._state.update(seq=None, checked_at=0.0)  # the index outlives each test's database
+
+    def lookup(q, **params):
+        resp = client.get("/api/children/autocomplete", query_string={"q": q, **params})
+        assert resp.status_code == 200
+        return resp.get_json()
+    return lookup
+
+
+def test_prefix_index_builds_sorted_and_patches_copies():
+    index = PrefixIndex.build([(1, "Mary Wanjiru", 1), (2, "Émile Otieno", 2), (3, "Mark Otieno", 1)])
+    assert [h["id"] for h in index.lookup("otie")] == [2, 3]
+    assert [h["id"] for h in index.lookup("emile")] == [2]
+    assert [h["id"] for h in index.lookup("ma", class_id=1)] == [3, 1]
+
+    patched = index.patched([(3, "Mark Kamau", 2)], removed={1})
+    assert [h["id"] for h in index.lookup("otie")] == [2, 3]  # the published index is untouched
+    assert [h["id"] for h in patched.lookup("otie")] == [2]
+    assert patched.lookup("kam") == [{"id": 3, "name": "Mark Kamau", "class_id": 2}]
+    assert patched.lookup("ma", class_id=1) == []
+    assert patched.patched([(3, "Mark Kamau", 2)]) is patched
+
+
+def test_autocomplete_endpoint(names, client):
+    child = client.get("/api/children/").get_json()[0]
+    first, last = child["name"].split()[:2]
+    hits = names(last[:3].lower())
+    assert child["id"] in [h["id"] for h in hits]
+    assert all(last[:3].lower() in h["name"].lower() for h in hits)
+    assert all(h["class_id"] == child["class_id"] for h in names(first[:2], class_id=child["class_id"]))
+    assert len(names(first[:1], limit=2)) <= 2
+    assert names("") == []
+
+
+def test_writes_are_patched_in_without_a_reload(names, client, auth_headers):
+    names("a")  # first lookup loads the index
+    with mock.patch.object(autocomplete, "_reload", wraps=autocomplete._reload) as reload:
+        created = client.post("/api/children/", json={"name": "Xena Quartey", "age": 7}).get_json()
+        assert [h["name"] for h in names("quar")] == ["Xena Quartey"]
+
+        client.patch(f"/api/children/{created['id']}", json={"name": "Xena Yeboah"}, headers=auth_headers)
+        assert names("quar") == []
+        assert [h["name"] for h in names("xena")] == ["Xena Yeboah"]
+
+        client.delete(f"/api/children/{created['id']}", headers=auth_headers)
+        assert names("xena") == []
+    assert reload.call_count == 0
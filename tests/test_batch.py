@@ -0,0 +1,84 @@
+# tests/test_batch.py
+from unittest import mock
+from flask_jwt_extended import JWTManager
+from sqlalchemy import event
+from app.extensions import BatchJWTManager, db
+
+
+def test_batch_preserves_order_and_statuses(client, auth_headers):
+    paths = ["/api/classes", "/api/teachers", "/api/teachers/999", "/api/reports/kpi?class_id=1"]
+    resp = client.post("/api/batch", json={"requests": paths}, headers=auth_headers)
+    assert resp.status_code == 200
+    items = resp.get_json()["responses"]
+    assert [i["path"] for i in items] == paths
+    for item in items:
+        single = client.get(item["path"], headers=auth_headers)
+        assert item["status"] == single.status_code
+        assert item["body"] == single.get_json()
+    assert items[2]["status"] == 404
+
+
+def test_batch_verifies_the_token_once_on_one_connection(app, client, auth_headers):
+    paths = ["/api/teachers", "/api/dashboard?sections=visitors", "/api/teachers?fields=id"]
+    checkouts = []
+
+    def count_checkout(*args):
+        checkouts.append(args)
+
+    with app.app_context():
+        engine = db.engine
+    decode = JWTManager._decode_jwt_from_config
+    event.listen(engine, "checkout", count_checkout)
+    try:
+        with mock.patch.object(JWTManager, "_decode_jwt_from_config", autospec=True, side_effect=decode) as decoded:
+            resp = client.post("/api/batch", json={"requests": paths}, headers=auth_headers)
+    finally:
+        event.remove(engine, "checkout", count_checkout)
+    assert [i["status"] for i in resp.get_json()["responses"]] == [200, 200, 200]
+    assert decoded.call_count == 1
+    assert len(checkouts) == 1  # one session, one connection for every sub-request
+
+
+def test_batch_jwt_manager_still_matches_the_private_decode():
+    # BatchJWTManager overrides a private method; an upgrade that renames or
+    # reshapes it would silently switch the shared decode off
+    import inspect
+    from flask_jwt_extended import utils
+
+    def shape(method):
+        return [(p.name, p.default) for p in inspect.signature(method).parameters.values()]
+
+    assert shape(JWTManager._decode_jwt_from_config) == shape(BatchJWTManager._decode_jwt_from_config) == [
+        ("self", inspect.Parameter.empty), ("encoded_token", inspect.Parameter.empty),
+        ("csrf_value", None), ("allow_expired", False),
+    ]
+    assert "jwt_manager._decode_jwt_from_config(" in inspect.getsource(utils.decode_token)
+
+
+def test_batch_without_token_reaches_public_endpoints_only(client, seeded):
+    items = client.post("/api/batch", json={"requests": ["/api/classes", "/api/teachers"]}).get_json()["responses"]
+    assert [i["status"] for i in items] == [200, 401]
+
+
+def test_batch_limits(app, client, seeded):
+    app.config["BATCH_MAX_REQUESTS"] = 2
+    assert client.post("/api/batch", json={"requests": ["/api/classes"] * 3}).status_code == 400
+    assert client.post("/api/batch", json={"requests": ["/api/batch"]}).status_code == 400
+    assert client.post("/api/batch", json={"requests": [{"path": "/api/classes", "method": "DELETE"}]}).status_code == 400
+    assert client.post("/api/batch", json={"requests": ["https://example.com/"]}).status_code == 400
+
+
+def test_batch_refuses_streams(app, client, auth_headers):
+    @app.route("/api/test-stream")
+    def endless():
+        def forever():
+            while True:
+                yield "tick\n"
+        return app.response_class(forever(), mimetype="text/plain")
+
+    resp = client.post("/api/batch", json={"requests": ["/api/classes", "/api/live/kpi"]}, headers=auth_headers)
+    assert resp.status_code == 400
+    assert resp.get_json()["request"] == "/api/live/kpi"
+
+    resp = client.post("/api/batch", json={"requests": ["/api/test-stream", "/api/classes"]}, headers=auth_headers)
+    assert [i["status"] for i in resp.get_json()["responses"]] == [501, 200]
@@ -0,0 +1,110 @@
+# tests/test_cache.py
+from datetime import date
+import pytest
+from app import cache
+from app.cache import DatabaseGenerations, MemoryBackend, RedisBackend
+from app.diagnostics import QueryCounter
+
+
+class FakeRedis:
+    """The slice of the redis-py client RedisBackend uses, kept in a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+
+def test_memory_backend_evicts_least_recently_used():
+    store = MemoryBackend(max_entries=2)
+    store.set("a", 1, ttl=60)
+    store.set("b", 2, ttl=60)
+    store.get("a")
+    store.set("c", 3, ttl=60)
+    assert (store.get("a"), store.get("b"), store.get("c")) == (1, None, 3)
+
+
+def test_memory_backend_expires_entries():
+    store = MemoryBackend()
+    store.set("a", 1, ttl=-1)
+    assert store.get("a") is None and len(store) == 0
+
+
+def test_kpi_is_cached_until_attendance_changes(client, auth_headers):
+    first = client.get("/api/reports/kpi").get_json()
+    with QueryCounter() as queries:
+        again = client.get("/api/reports/kpi").get_json()
+    assert again == first and queries.count == 0
+
+    # same args in a different order and with a blank value share the entry
+    today = date.today().isoformat()
+    client.get(f"/api/reports/kpi?date={today}&class_id=1")
+    with QueryCounter() as queries:
+        client.get(f"/api/reports/kpi?class_id=1&date={today}&unused=")
+    assert queries.count == 0
+
+    client.post("/api/children/1/attendance", json={"present": True}, headers=auth_headers)
+    after = client.get("/api/reports/kpi").get_json()
+    assert after["todays_attendance"] == first["todays_attendance"] + 1
+
+
+def test_finance_export_is_cached(client, auth_headers):
+    first = client.get("/api/finance/export/pdf")
+    with QueryCounter() as queries:
+        again = client.get("/api/finance/export/pdf")
+    assert queries.count == 0
+    assert again.status_code == 200 and again.data == first.data
+    assert again.headers["Content-Type"] == "application/pdf"
+
+    client.post("/api/finance/expenditure", json={"date": "2026-01-04", "amount": 10, "details": "Chalk"},
+                headers=auth_headers)
+    with QueryCounter() as queries:
+        client.get("/api/finance/export/pdf")
+    assert queries.count > 0
+
+
+@pytest.mark.parametrize("make_store", [MemoryBackend, lambda: RedisBackend(FakeRedis())])
+def test_department_counts_invalidated_by_user_writes(app, client, auth_headers, make_store):
+    from app.extensions import db
+    from app.models import User
+
+    cache.init_app(app, backend=make_store())
+    before = {d["id"]: d["member_count"] for d in client.get("/api/departments").get_json()}
+    dept_id = next(iter(before))
+    with app.app_context():
+        db.session.add(User(username="late-joiner", role="teacher", department_id=dept_id,
+                            password_hash="x"))
+        db.session.commit()
+    after = {d["id"]: d["member_count"] for d in client.get("/api/departments").get_json()}
+    assert after[dept_id] == before[dept_id] + 1
+
+
+def test_redis_backend_generations_are_shared_between_workers():
+    shared = FakeRedis()
+    worker_a, worker_b = RedisBackend(shared), RedisBackend(shared)
+    assert worker_b.generations(["users"]) == [0]
+    worker_a.bump("users")
+    assert worker_b.generations(["users", "departments"]) == [1, 0]
+
+
+def test_database_generations_reach_other_workers_on_refresh(app):
+    with app.app_context():
+        writer, reader = DatabaseGenerations(refresh_seconds=0), DatabaseGenerations(refresh_seconds=60)
+        assert reader.generations(["widgets"]) == [0]
+        writer.bump("widgets")
+        writer.bump("widgets")
+        assert writer.generations(["widgets"]) == [2]
+        assert reader.generations(["widgets"]) == [0]  # until its next refresh
+        reader.refresh_seconds = 0
+        assert reader.generations(["widgets", "gadgets"]) == [2, 0]
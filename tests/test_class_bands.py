@@ -0,0 +1,139 @@
+# tests/test_class_bands.py
+from datetime import date, timedelta
+from sqlalchemy import select, update
+from app import changes, class_bands, scheduler
+from app.diagnostics import QueryCounter
+from app.extensions import db
+from app.models import Child, SundayClass, age_on
+
+
+def _shift_beginners_band(app):
+    """Beginners becomes 3-7 and Shinners 7-9: every 6-year-old should move."""
+    with app.app_context():
+        classes = {c.name: c for c in SundayClass.query}
+        classes["Beginners"].max_age = 7
+        classes["Shinners"].min_age = 7
+        db.session.commit()
+        sixes = Child.query.filter_by(age=6).count()
+        return classes["Beginners"].id, classes["Shinners"].id, sixes
+
+
+def test_reassign_moves_children_in_one_update(app, seeded):
+    beginners, shinners, sixes = _shift_beginners_band(app)
+    assert sixes > 0
+    with app.app_context():
+        before = changes.latest("children")
+        preview = class_bands.reassign(dry_run=True)
+        assert preview["moved"] == sixes
+        assert Child.query.filter_by(age=6, class_id=beginners).count() == 0
+
+        with QueryCounter() as queries:
+            report = class_bands.reassign()
+        assert report == preview
+        assert {c["class_id"]: (c["joined"], c["left"]) for c in report["classes"]} == {
+            beginners: (sixes, 0), shinners: (0, sixes),
+        }
+        assert len(queries.matching("UPDATE children")) == 1
+        assert queries.count <= 5  # bands, counts, change log, update, commit
+
+        assert Child.query.filter_by(age=6, class_id=beginners).count() == sixes
+        assert len(changes.since("children", before)) == sixes  # sync sees only the movers
+        assert class_bands.reassign()["moved"] == 0
+
+
+def test_new_child_is_placed_without_a_class_lookup(app, seeded):
+    with app.app_context():
+        beginners = SundayClass.query.filter_by(name="Beginners").one().id
+        with QueryCounter() as queries:
+            child = Child(name="New", age=4)
+            db.session.add(child)
+            db.session.flush()
+        assert not [s for s in queries.statements if s.lstrip().upper().startswith("SELECT")]
+        assert child.class_id == beginners
+
+        adult = Child(name="Helper", age=30, class_id=beginners)  # outside every band
+        db.session.add(adult)
+        db.session.commit()
+        assert adult.class_id == beginners
+
+
+def test_reassign_endpoint_is_admin_only(app, client, auth_headers):
+    _shift_beginners_band(app)
+    resp = client.post("/api/classes/reassign?dry_run=1", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.get_json()["dry_run"] is True and resp.get_json()["moved"] > 0
+    assert client.post("/api/classes/reassign").status_code == 401
+
+
+def _born_turning(age, day):
+    return class_bands.years_before(day, age)
+
+
+def test_promote_moves_only_children_crossing_a_band_edge(app, seeded):
+    today = date.today()
+    with app.app_context():
+        classes = {c.name: c.id for c in SundayClass.query}
+        six, seven = (Child(name=n, age=1) for n in ("Turning Six", "Turning Seven"))
+        db.session.add_all([six, seven])
+        db.session.commit()
+        # as they stood yesterday; Core UPDATE so the listeners leave them be
+        db.session.execute(update(Child).where(Child.id == six.id).values(
+            date_of_birth=_born_turning(6, today), age=5, class_id=classes["Beginners"]))
+        db.session.execute(update(Child).where(Child.id == seven.id).values(
+            date_of_birth=_born_turning(7, today), age=6, class_id=classes["Shinners"]))
+        db.session.commit()
+
+        report = class_bands.promote(since=today - timedelta(days=1), through=today)
+        assert report["aged"] >= 2
+        assert report["moved"] == 1
+        assert report["children"] == [{
+            "id": six.id, "name": "Turning Six", "age": 6,
+            "from_class_id": classes["Beginners"], "to_class_id": classes["Shinners"],
+        }]
+        db.session.expire_all()
+        assert (six.age, six.class_id) == (6, classes["Shinners"])
+        assert (seven.age, seven.class_id) == (7, classes["Shinners"])
+
+        assert class_bands.promote(since=today, through=today)["aged"] == 0
+
+
+def test_birthday_window_is_an_index_range(app):
+    with app.app_context():
+        today = date.today()
+        sql = str(select(Child.id).where(class_bands.turning(6, today - timedelta(days=1), today))
+                  .compile(db.engine, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(str(row[-1]) for row in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")))
+        assert "ix_children_date_of_birth" in plan and "date_of_birth>" in plan.replace(" ", "")
+
+
+def test_leap_day_birthday_counts_on_first_of_march(app):
+    with app.app_context():
+        born = date(2016, 2, 29)
+        assert age_on(born, date(2023, 2, 28)) == 6
+        assert age_on(born, date(2023, 3, 1)) == 7
+        assert class_bands.years_before(date(2023, 3, 1), 7) == date(2016, 3, 1)
+        assert class_bands.years_before(date(2024, 2, 29), 1) == date(2023, 2, 28)
+
+
+def test_scheduled_promotion_picks_up_from_the_last_run(app, seeded):
+    with app.app_context():
+        first = scheduler.run_job("children.promote", trigger="manual")
+        assert first.status == "done" and first.result["since"] is None
+        assert first.result["moved"] == 0  # the generator already placed everyone
+        second = scheduler.run_job("children.promote", trigger="manual")
+        assert second.result["since"] == first.result["through"]
+
+
+def test_child_age_follows_date_of_birth(app, client, auth_headers):
+    born = _born_turning(4, date.today()).isoformat()
+    resp = client.post("/api/children/", json={"name": "Dob", "age": 11, "date_of_birth": born},
+                       headers=auth_headers)
+    assert resp.status_code == 201
+    with app.app_context():
+        child = db.session.get(Child, resp.get_json()["id"])
+        beginners = SundayClass.query.filter_by(name="Beginners").one().id
+        assert (child.age, child.class_id) == (4, beginners)
+        assert child.to_dict(["date_of_birth"]) == {"date_of_birth": born}
+
+    bad = client.put(f"/api/children/{child.id}", json={"date_of_birth": "4/5/2020"}, headers=auth_headers)
+    assert bad.status_code == 400
@@ -0,0 +1,36 @@
+# tests/test_dashboard.py
+from datetime import date
+from app.diagnostics import QueryCounter
+from app.routes.dashboard import SECTIONS
+
+
+def test_dashboard_matches_kpi_in_a_few_queries(client, auth_headers):
+    today = date.today().isoformat()
+    with QueryCounter() as queries:
+        resp = client.get(f"/api/dashboard?date={today}", headers=auth_headers)
+    assert resp.status_code == 200
+    # admin lookup + one grouped query per section
+    assert queries.count <= 1 + len(SECTIONS), "\n\n".join(queries.statements)
+
+    data = resp.get_json()
+    kpi = client.get(f"/api/reports/kpi?date={today}").get_json()
+    assert data["attendance"] == {"today": kpi["todays_attendance"], "month": kpi["month_attendance"]}
+    assert data["offerings"]["month"] == kpi["month_offering"]
+    assert sum(c["children"] for c in data["classes"]) == 40
+    assert data["visitors"]["total"] == len(client.get("/api/visitors").get_json())
+    finance = data["finance"]
+    assert round(finance["total_income"] - finance["total_expense"], 2) == round(finance["net_balance"], 2)
+
+
+def test_dashboard_partial_refresh(client, auth_headers):
+    with QueryCounter() as queries:
+        data = client.get("/api/dashboard?sections=visitors,events", headers=auth_headers).get_json()
+    assert set(data) == {"date", "visitors", "events"}
+    assert queries.count <= 3
+
+    resp = client.get("/api/dashboard?sections=weather", headers=auth_headers)
+    assert resp.status_code == 400
+
+
+def test_dashboard_requires_admin(client):
+    assert client.get("/api/dashboard").status_code == 401
@@ -0,0 +1,119 @@
+# tests/test_jobs.py
+import io
+import os
+from datetime import datetime, timedelta
+import pytest
+from openpyxl import Workbook
+from app import jobs
+from app.extensions import db
+from app.models import Child, Job
+
+FLAKY_CALLS = []
+
+
+@jobs.task("tests.flaky", max_attempts=2)
+def flaky(fail_times):
+    FLAKY_CALLS.append(fail_times)
+    if len(FLAKY_CALLS) <= fail_times:
+        raise RuntimeError("try again")
+    return {"calls": len(FLAKY_CALLS)}
+
+
+@pytest.fixture(autouse=True)
+def _reset_flaky():
+    FLAKY_CALLS.clear()
+
+
+def _job(app, job_id):
+    with app.app_context():
+        return db.session.get(Job, job_id).to_dict()
+
+
+def _enqueue(app, name, **payload):
+    with app.app_context():
+        job = jobs.enqueue(name, **payload)
+        db.session.commit()
+        return job.id
+
+
+def _make_due(app, job_id):
+    with app.app_context():
+        db.session.get(Job, job_id).run_at = datetime.utcnow()
+        db.session.commit()
+
+
+def test_upload_children_imports_in_the_background(app, client, auth_headers):
+    book = Workbook()
+    book.active.append(["Name", "Age", "Gender", "Parent", "Contact"])
+    book.active.append(["Queued Child", 6, "F", "Parent", "0700"])
+    book.active.append(["", 7, "M", "", ""])
+    upload = io.BytesIO()
+    book.save(upload)
+    upload.seek(0)
+
+    resp = client.post("/api/children/upload", headers=auth_headers,
+                       data={"file": (upload, "roster.xlsx")}, content_type="multipart/form-data")
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+    status = client.get(resp.get_json()["status_url"], headers=auth_headers).get_json()
+    assert status["status"] == "queued"
+
+    assert jobs.work(app, burst=True) == 1
+    status = client.get(f"/api/jobs/{job_id}", headers=auth_headers).get_json()
+    assert (status["status"], status["result"]) == ("done", {"created": 1, "skipped": 1})
+    with app.app_context():
+        assert Child.query.filter_by(name="Queued Child").count() == 1
+        assert not any(f.endswith("_roster.xlsx") for f in os.listdir(app.config["CHILDREN_UPLOAD_FOLDER"]))
+
+
+def test_failures_back_off_then_fail(app):
+    retried = _enqueue(app, "tests.flaky", fail_times=1)
+    jobs.work(app, burst=True)
+    job = _job(app, retried)
+    assert (job["status"], job["attempts"]) == ("queued", 1)
+    assert "try again" in job["error"]
+    assert datetime.fromisoformat(job["run_at"]) > datetime.utcnow()  # backoff: not due yet
+    assert jobs.work(app, burst=True) == 0
+
+    _make_due(app, retried)
+    jobs.work(app, burst=True)
+    assert _job(app, retried)["status"] == "done"
+
+    FLAKY_CALLS.clear()
+    doomed = _enqueue(app, "tests.flaky", fail_times=5)
+    jobs.work(app, burst=True)
+    _make_due(app, doomed)
+    jobs.work(app, burst=True)
+    job = _job(app, doomed)
+    assert (job["status"], job["attempts"]) == ("failed", 2)
+
+
+def test_expired_lock_is_reclaimed(app):
+    job_id = _enqueue(app, "tests.flaky", fail_times=0)
+    with app.app_context():
+        stale = jobs.claim("dead-worker")
+        assert stale.id == job_id
+        assert jobs.claim("other-worker") is None  # still locked
+        db.session.get(Job, job_id).locked_until = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+        fresh = jobs.claim("other-worker")
+        assert (fresh.id, fresh.attempts) == (job_id, 2)
+        assert jobs.execute(fresh, "other-worker")
+        jobs.execute(stale, "dead-worker")  # finishing late must not overwrite the result
+    job = _job(app, job_id)
+    assert (job["status"], job["result"]) == ("done", {"calls": 1})
+
+
+def test_export_can_be_offloaded(app, client, auth_headers):
+    inline = client.get("/api/finance/export/pdf?start=2026-01-01")
+    resp = client.get("/api/finance/export/pdf?start=2026-01-01&async=1")
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+    assert client.get(f"/api/jobs/{job_id}/download", headers=auth_headers).status_code == 409
+
+    jobs.work(app, burst=True)
+    download = client.get(f"/api/jobs/{job_id}/download", headers=auth_headers)
+    assert download.status_code == 200
+    assert download.mimetype == "application/pdf"
+    assert "finance_report_2026-01-01_to_now.pdf" in download.headers["Content-Disposition"]
+    assert download.data[:5] == inline.data[:5] == b"%PDF-"
@@ -0,0 +1,106 @@
+# tests/test_ledger.py
+from datetime import date, timedelta
+from sqlalchemy import delete, update
+from app import ledger
+from app.diagnostics import QueryCounter
+from app.extensions import db
+from app.models import Expenditure, FinanceEntry, LedgerPeriod
+from app.money import Money
+
+
+def _brute_balance(day):
+    income = sum(((e.main_church or 0) + (e.children_ministry or 0)
+                  for e in FinanceEntry.query.filter(FinanceEntry.date <= day)), Money())
+    spent = sum((e.amount for e in Expenditure.query.filter(Expenditure.date <= day)), Money())
+    return income - spent
+
+
+def test_running_balance_accumulates_over_the_view(app, seeded):
+    with app.app_context():
+        opening, rows = ledger.running()
+        assert opening == 0 and len(rows) == FinanceEntry.query.count() + Expenditure.query.count()
+        total = Money()
+        for row in rows:
+            total += row["amount"]
+            assert row["balance"] == total
+        assert total == _brute_balance(date.today())
+
+        start = rows[len(rows) // 2]["date"]
+        opening, window = ledger.running(start=start)
+        assert opening == _brute_balance(start - timedelta(days=1))
+        assert window[-1]["balance"] == total
+
+
+def test_balance_reads_last_close_plus_tail(app, seeded):
+    with app.app_context():
+        closed = ledger.close_periods()
+        assert closed and closed[-1]["period_end"] < date.today().isoformat()
+        assert ledger.close_periods() == []  # nothing new to close
+
+        last = LedgerPeriod.query.order_by(LedgerPeriod.period_end.desc()).first()
+        for day in (last.period_end - timedelta(days=40), last.period_end, date.today()):
+            with QueryCounter() as queries:
+                result = ledger.balance_on(day)
+            assert result["balance"] == _brute_balance(day)
+            assert queries.count == 2  # the period, then the tail
+        tail = ledger.balance_on(date.today())
+        assert tail["closed_through"] == last.period_end
+        assert tail["tail_entries"] == (
+            FinanceEntry.query.filter(FinanceEntry.date > last.period_end).count()
+            + Expenditure.query.filter(Expenditure.date > last.period_end).count()
+        )
+
+
+def test_entry_in_closed_month_reopens_it(app, seeded):
+    with app.app_context():
+        ledger.close_periods()
+        periods = LedgerPeriod.query.order_by(LedgerPeriod.period_start).all()
+        back_dated = periods[-2].period_start + timedelta(days=3)
+        db.session.add(Expenditure(date=back_dated, amount="123.45", details="Late receipt"))
+        db.session.commit()
+        assert LedgerPeriod.query.count() == len(periods) - 2
+        assert ledger.balance_on(date.today())["balance"] == _brute_balance(date.today())
+        assert len(ledger.close_periods()) == 2
+
+
+def test_edits_in_a_closed_month_change_later_balances(app, seeded):
+    with app.app_context():
+        ledger.close_periods()
+        first = LedgerPeriod.query.order_by(LedgerPeriod.period_start).first()
+        later = date.today()
+        entry = Expenditure.query.filter(Expenditure.date <= first.period_end).first()
+        before = ledger.balance_on(later)["balance"]
+
+        entry.amount = entry.amount + 10  # ORM edit
+        db.session.commit()
+        assert ledger.balance_on(later)["balance"] == before - 10 == _brute_balance(later)
+
+        ledger.close_periods()
+        db.session.execute(update(Expenditure).where(Expenditure.id == entry.id)
+                           .values(amount=Expenditure.amount + 5))  # bulk edit
+        db.session.commit()
+        assert ledger.balance_on(later)["balance"] == before - 15 == _brute_balance(later)
+
+        ledger.close_periods()
+        db.session.execute(delete(Expenditure).where(Expenditure.id == entry.id))
+        db.session.commit()
+        assert ledger.balance_on(later)["balance"] == _brute_balance(later)
+
+        ledger.close_periods()
+        kept = LedgerPeriod.query.count()
+        db.session.execute(delete(Expenditure).where(Expenditure.id == -1))  # matches nothing
+        db.session.commit()
+        assert LedgerPeriod.query.count() == kept
+
+
+def test_ledger_endpoints(client, seeded, auth_headers):
+    resp = client.get("/api/finance/ledger", headers=auth_headers)
+    body = resp.get_json()
+    assert resp.status_code == 200 and body["closing_balance"] == body["entries"][-1]["balance"]
+
+    closed = client.post("/api/finance/periods/close", headers=auth_headers)
+    assert closed.status_code == 200 and closed.get_json()
+    assert client.get("/api/finance/periods", headers=auth_headers).get_json()[0]["closing_balance"] is not None
+    balance = client.get("/api/finance/balance", headers=auth_headers).get_json()
+    assert balance["balance"] == body["closing_balance"]
+    assert client.post("/api/finance/periods/close").status_code == 401
@@ -0,0 +1,132 @@
+# tests/test_live.py
+import json
+import queue
+from datetime import date
+from app import live
+from app.live import Broker, RedisBus
+
+
+def _events(chunks, count):
+    """Next `count` SSE events (heartbeats skipped) as (event, data) pairs."""
+    out = []
+    while len(out) < count:
+        chunk = next(chunks)
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if chunk.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+        out.append((fields["event"], json.loads(fields["data"])))
+    return out
+
+
+def test_broker_fans_out_and_resyncs_slow_consumers():
+    broker = Broker(queue_size=2)
+    fast, slow = broker.subscribe(), broker.subscribe()
+    broker.fanout("a")
+    assert fast.get_nowait()[1] == "a"
+    broker.fanout("b")
+    broker.fanout("c")  # slow is now over its limit
+    assert [slow.get_nowait()[1] for _ in range(slow.qsize())] == [live.RESYNC]
+    broker.unsubscribe(fast)
+    broker.unsubscribe(slow)
+    assert len(broker) == 0
+
+
+def test_kpi_stream_pushes_committed_changes(app, client, auth_headers):
+    app.config["LIVE_HEARTBEAT_SECONDS"] = 0.01
+    resp = client.get("/api/live/kpi", headers=auth_headers, buffered=False)
+    assert resp.mimetype == "text/event-stream"
+    chunks = iter(resp.response)
+    (kind, snapshot), = _events(chunks, 1)
+    assert kind == "snapshot" and snapshot["date"] == date.today().isoformat()
+
+    child = client.get("/api/children/").get_json()[0]
+    client.post(f"/api/children/{child['id']}/attendance", json={"present": True}, headers=auth_headers)
+    client.post(f"/api/children/{child['id']}/attendance", json={"present": True}, headers=auth_headers)  # no change
+    client.patch("/api/children/offerings/2/today", json={"amount": 150})
+    client.patch("/api/children/offerings/2/today", json={"amount": 100})
+
+    events = [data for _, data in _events(chunks, 3)]
+    assert events[0] == {"kind": "attendance", "date": date.today().isoformat(),
+                         "class_id": child["class_id"], "delta": 1}
+    # offerings carry the stored total, newest version last
+    assert [(e["kind"], e["class_id"], e["amount"]) for e in events[1:]] == [("offering", 2, 150), ("offering", 2, 100)]
+    assert events[1]["version"] < events[2]["version"]
+    resp.close()
+
+
+def test_kpi_stream_keeps_changes_committed_during_the_snapshot(app, client, auth_headers):
+    from unittest import mock
+    from app.routes import live as live_routes
+
+    app.config["LIVE_HEARTBEAT_SECONDS"] = 0.01
+    today = date.today().isoformat()
+    totals = live_routes._todays_totals
+
+    def snapshot_with_a_write_racing_it(*args):
+        live.bus().broker.fanout(json.dumps({"kind": "offering", "date": today, "class_id": 1, "amount": 5, "version": 1}))
+        return totals(*args)
+
+    with mock.patch.object(live_routes, "_todays_totals", side_effect=snapshot_with_a_write_racing_it):
+        resp = client.get("/api/live/kpi", headers=auth_headers, buffered=False)
+    chunks = iter(resp.response)
+    child = client.get("/api/children/").get_json()[0]
+    client.post(f"/api/children/{child['id']}/attendance", json={"date": "2020-01-05"}, headers=auth_headers)
+    client.patch("/api/children/offerings/2/today", json={"amount": 30})
+
+    events = _events(chunks, 3)
+    assert [(kind, data.get("class_id"), data.get("amount")) for kind, data in events] == [
+        ("snapshot", None, None), ("delta", 1, 5), ("delta", 2, 30),  # the 2020 attendance is skipped
+    ]
+    resp.close()
+    with app.app_context():
+        assert len(live.bus().broker) == 0
+
+
+def test_rolled_back_writes_publish_nothing(app):
+    from app.extensions import db
+
+    with app.app_context():
+        subscription = live.bus().broker.subscribe()
+        db.session.execute(db.text("SELECT 1"))  # open a transaction to roll back
+        live.queue_event("attendance", date=date.today(), class_id=1, delta=1)
+        db.session.rollback()
+        db.session.commit()
+        assert subscription.empty()
+
+
+class FakeRedis:
+    """publish()/pubsub() over in-process queues, enough for RedisBus."""
+
+    def __init__(self):
+        self.listeners = []
+
+    def publish(self, channel, message):
+        for q in self.listeners:
+            q.put({"type": "message", "data": message.encode()})
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        fake = self
+
+        class PubSub:
+            def subscribe(self, channel):
+                self.q = queue.Queue()
+                fake.listeners.append(self.q)
+
+            def listen(self):
+                while True:
+                    yield self.q.get()
+
+        return PubSub()
+
+
+def test_redis_bus_reaches_every_worker():
+    shared = FakeRedis()
+    workers = [RedisBus(Broker(), shared, "cm:live") for _ in range(2)]
+    subscriptions = [w.broker.subscribe() for w in workers]
+    for w in workers:
+        w.start()
+    while len(shared.listeners) < 2:
+        pass
+    workers[0].publish('{"kind": "offering"}')
+    assert [s.get(timeout=2)[1] for s in subscriptions] == ['{"kind": "offering"}'] * 2
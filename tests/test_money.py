@@ -0,0 +1,68 @@
+# tests/test_money.py
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import func, select
+from app.extensions import db
+from app.models import Expenditure, FinanceEntry, MissionPartner, Offering
+from app.money import Money, to_cents
+
+
+def test_money_is_exact_cents():
+    assert to_cents("12.5") == to_cents(12.5) == to_cents(Decimal("12.50")) == 1250
+    assert to_cents(0.1) == 10 and to_cents(3) == 300
+    assert sum([Money("0.10")] * 3) == Money("0.30")  # 0.1 + 0.1 + 0.1 != 0.3 in floats
+    assert Money("19.99") - 20 == Money("-0.01")
+    assert f"{Money('1234.5'):,.2f}" == "1,234.50" and str(Money(7)) == "7.00"
+    assert float(Money("2.25")) == 2.25 and not Money() and Money(1) > 0
+
+
+def test_amounts_are_stored_as_integer_cents(app, seeded):
+    with app.app_context():
+        db.session.add(Expenditure(date=date(2026, 10, 18), amount="1999.99",
+                                   details="Projector"))
+        db.session.commit()
+        stored = db.session.execute(db.text(
+            "SELECT amount, typeof(amount) FROM expenditures WHERE details = 'Projector'")).one()
+        assert tuple(stored) == (199999, "integer")
+
+        for column in (Offering.amount, FinanceEntry.main_church, Expenditure.amount, MissionPartner.support):
+            total = db.session.execute(select(func.sum(column))).scalar()
+            raw = db.session.execute(db.text(
+                f"SELECT typeof(SUM({column.key})) FROM {column.class_.__tablename__}")).scalar()
+            assert isinstance(total, Money) and raw == "integer"
+
+
+def test_money_serializes_as_a_number(app, client, seeded, auth_headers):
+    resp = client.get("/api/finance/all", headers=auth_headers)
+    entry = next(e for e in resp.get_json() if e["type"] == "expenditure")
+    assert isinstance(entry["amount"], float)
+    with app.app_context():
+        assert Money(entry["amount"]) == db.session.get(Expenditure, entry["id"]).amount
+
+
+def test_money_hashes_what_it_equals():
+    assert Money("250") == 250 and hash(Money("250")) == hash(250)
+    assert Money("2.50") == Decimal("2.5") and hash(Money("2.50")) == hash(Decimal("2.5"))
+    assert {Money("250"): "x"}[250] == "x"
+    assert Money("250") != "250" and Money("0.10") != 0.1  # as Decimal("0.10") != 0.1
+
+
+def test_malformed_amounts_are_rejected(client, seeded, auth_headers):
+    for path, body in (
+        ("/api/finance/income", {"date": "2026-10-18", "main_church": "12,50"}),
+        ("/api/finance/expenditure", {"date": "2026-10-18", "amount": "abc", "details": "x"}),
+        ("/api/finance/expenditure", {"date": "2026-10-18", "amount": "NaN", "details": "x"}),
+        ("/api/children/offerings", {"class_id": 1, "amount": "lots"}),
+        ("/api/children/offerings", {"class_id": 1, "amount": [5]}),
+    ):
+        resp = client.post(path, json=body, headers=auth_headers)
+        assert resp.status_code == 400, (path, body)
+    assert client.patch("/api/children/offerings/1/today", json={"amount": "1.2.3"}).status_code == 400
+    bulk = {"offerings": [{"class_id": 1, "amount": "x"}]}
+    assert client.put("/api/children/offerings/bulk", json=bulk, headers=auth_headers).status_code == 400
+
+    resp = client.post("/api/finance/expenditure", json={"date": "2026-10-18", "amount": "19.99", "details": "x"},
+                       headers=auth_headers)
+    assert resp.status_code == 201 and resp.get_json()["amount"] == 19.99
+    entry = resp.get_json()["id"]
+    assert client.patch(f"/api/finance/entry/{entry}", json={"amount": "?"}, headers=auth_headers).status_code == 400
@@ -0,0 +1,93 @@
+# tests/test_offerings.py
+from datetime import date
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app import changes, offerings
+from app.diagnostics import QueryCounter
+from app.extensions import db
+from app.models import Offering, SundayClass
+
+DAY = "2026-10-20"
+
+
+def _rows(app, day=DAY):
+    with app.app_context():
+        return sorted(
+            (o.class_id, float(o.amount))
+            for o in Offering.query.filter_by(date=date.fromisoformat(day))
+        )
+
+
+def test_saving_today_twice_keeps_one_row(app, client):
+    with app.app_context():
+        before = changes.latest("offerings")
+    assert client.patch("/api/children/offerings/2/today", json={"amount": 150}).status_code == 200
+    resp = client.patch("/api/children/offerings/2/today", json={"amount": 100})
+    assert resp.get_json()["amount"] == 100
+    assert _rows(app, date.today().isoformat()) == [(2, 100.0)]
+    with app.app_context():
+        assert [op for _, _, op in changes.since("offerings", before)] == ["update", "update"]
+
+
+def test_unique_index_rejects_a_second_row(app):
+    with app.app_context():
+        offerings.upsert([{"class_id": 1, "date": date(2026, 10, 20), "amount": 10}])
+        db.session.commit()
+        db.session.add(Offering(class_id=1, date=date(2026, 10, 20), amount=5))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+
+
+def test_post_adds_to_the_days_total(client, app, auth_headers):
+    for amount in (40, 60):
+        resp = client.post("/api/children/offerings", json={"class_id": 3, "date": DAY, "amount": amount},
+                           headers=auth_headers)
+        assert resp.status_code == 201
+    assert resp.get_json()["amount"] == 100
+    assert _rows(app) == [(3, 100.0)]
+
+
+def test_bulk_records_every_class_in_one_statement(app, client, seeded, auth_headers):
+    with app.app_context():
+        class_ids = [c.id for c in SundayClass.query.order_by(SundayClass.id)]
+    client.patch(f"/api/children/offerings/{class_ids[0]}/today", json={"amount": 5})
+
+    payload = {"offerings": [{"class_id": cid, "amount": 100 + cid} for cid in class_ids]}
+    with QueryCounter() as queries:
+        resp = client.put("/api/children/offerings/bulk", json=payload, headers=auth_headers)
+    assert resp.status_code == 200
+    assert [row["amount"] for row in resp.get_json()] == [100 + cid for cid in class_ids]
+    assert len(queries.matching("INSERT INTO offerings")) == 1
+    assert _rows(app, date.today().isoformat()) == [(cid, 100.0 + cid) for cid in class_ids]
+
+    dup = {"offerings": [{"class_id": class_ids[0], "amount": 1}, {"class_id": class_ids[0], "amount": 2}]}
+    assert client.put("/api/children/offerings/bulk", json=dup, headers=auth_headers).status_code == 400
+
+
+def test_delete_offering(app, client):
+    client.patch("/api/children/offerings/4/today", json={"amount": 30})
+    body = {"class_id": 4, "date": date.today().isoformat()}
+    with app.app_context():
+        before = changes.latest("offerings")
+    assert client.delete("/api/children/offerings", json=body).status_code == 200
+    assert client.delete("/api/children/offerings", json=body).status_code == 404
+    with app.app_context():
+        assert [op for _, _, op in changes.since("offerings", before)] == ["delete"]
+
+
+def test_unassigned_offerings_are_one_row_per_day(app, client, auth_headers):
+    for amount in (15, 25):
+        resp = client.post("/api/children/offerings", json={"date": DAY, "amount": amount}, headers=auth_headers)
+        assert resp.status_code == 201
+    assert resp.get_json()["amount"] == 40
+    with app.app_context():
+        assert [float(o.amount) for o in Offering.query.filter_by(class_id=None)] == [40.0]
+        written = offerings.upsert([{"class_id": None, "date": date(2026, 10, 20), "amount": 10},
+                                    {"class_id": 1, "date": date(2026, 10, 20), "amount": 5}])
+        assert sorted((row["class_id"] or 0, float(row["amount"])) for row in written) == [(0, 10.0), (1, 5.0)]
+        [again] = offerings.upsert([{"class_id": None, "date": date(2026, 10, 20), "amount": 12}])
+        assert again["version"] > max(row["version"] for row in written)
+        db.session.commit()
+        db.session.add(Offering(class_id=None, date=date(2026, 10, 20), amount=1))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
@@ -0,0 +1,60 @@
+# tests/test_query_counts.py
+"""
+Query budgets per endpoint. The seeded dataset has several rows per listing
+and related rows under each, so a lazy relationship touched inside a loop
+(an N+1) pushes an endpoint over its budget.
+"""
+import pytest
+from app.diagnostics import QueryCounter
+
+BUDGETS = [
+    # (path, max queries)
+    ("/api/children/", 1),
+    ("/api/children/?format=columns", 1),
+    ("/api/children/attendance?start=2000-01-01&end=2100-01-01", 1),
+    ("/api/children/offerings", 1),
+    ("/api/reports/kpi", 5),  # cached views: +1 for the cache generations
+    ("/api/finance/all", 2),
+    ("/api/finance/export/pdf", 3),
+    ("/api/gallery/photos", 1),
+    ("/api/gallery/featured", 1),
+    ("/api/media/featured", 1),
+    ("/api/visitors", 1),
+    ("/api/members", 1),
+    ("/api/new-members", 1),
+    ("/api/classes", 1),
+    ("/api/teachers", 2),
+    ("/api/search?q=kamau", 1),
+    ("/api/events", 2),
+    ("/api/timetable", 1),
+    ("/api/departments", 2),
+    ("/api/missions", 2),
+    ("/api/programs/", 2),
+]
+
+
+@pytest.mark.parametrize("path,budget", BUDGETS)
+def test_list_endpoint_query_budget(client, auth_headers, path, budget):
+    with QueryCounter() as queries:
+        resp = client.get(path, headers=auth_headers)
+    assert resp.status_code == 200
+    assert queries.count <= budget, "\n\n".join(queries.statements)
+
+
+def test_mark_attendance_query_budget(client, auth_headers):
+    # child lookup, existing-row lookup, insert, change_log insert, refresh,
+    # cache generation bump
+    with QueryCounter() as queries:
+        resp = client.post("/api/children/1/attendance", json={"present": True}, headers=auth_headers)
+    assert resp.status_code == 201
+    assert queries.count <= 6, "\n\n".join(queries.statements)
+
+
+def test_department_member_count_is_counted_in_sql(app, client, auth_headers):
+    from app.models import User
+
+    departments = client.get("/api/departments", headers=auth_headers).get_json()
+    with app.app_context():
+        for dept in departments:
+            assert dept["member_count"] == User.query.filter_by(department_id=dept["id"]).count()
+    assert any(dept["member_count"] for dept in departments)
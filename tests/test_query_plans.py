@@ -0,0 +1,60 @@
+# tests/test_query_plans.py
+"""
+The hot lookups must be answered from an index. Each test runs the real
+endpoint, captures the SQL it issued, and checks the database's plan for it.
+"""
+from datetime import date
+from app import ledger
+from app.diagnostics import QueryCounter, explain, uses_index
+from app.extensions import db
+
+
+def _assert_indexed(app, queries, table, *fragments):
+    captured = queries.matching(f"FROM {table}", *fragments)
+    assert captured, f"no query on {table} was issued"
+    with app.app_context():
+        connection = db.session.connection()
+        for statement, params in captured:
+            plan = explain(connection, statement, params)
+            assert uses_index(plan, table), f"{statement}\n" + "\n".join(plan)
+        db.session.rollback()
+
+
+def test_attendance_by_child_and_date(app, client, auth_headers):
+    with QueryCounter() as queries:
+        client.post("/api/children/1/attendance", json={"present": True}, headers=auth_headers)
+    _assert_indexed(app, queries, "attendance", "child_id", "date")
+
+
+def test_attendance_by_date(app, client, seeded):
+    with QueryCounter() as queries:
+        client.get(f"/api/reports/kpi?date={date.today().isoformat()}&class_id=1")
+    _assert_indexed(app, queries, "attendance", "WHERE")
+
+
+def test_offerings_by_date_and_class(app, client, seeded):
+    with QueryCounter() as queries:
+        client.get("/api/children/offerings?start=2026-01-01&end=2026-03-31&class_id=1")
+    _assert_indexed(app, queries, "offerings", "date", "class_id")
+
+
+def test_finance_by_date(app, client, seeded):
+    with QueryCounter() as queries:
+        client.get("/api/finance/export/pdf?start=2026-01-01&end=2026-03-31")
+    _assert_indexed(app, queries, "finance_entries", "WHERE")
+    _assert_indexed(app, queries, "expenditures", "WHERE")
+
+
+
+def test_ledger_balance_tail(app, client, seeded):
+    with app.app_context():
+        ledger.close_periods()
+    with QueryCounter() as queries:
+        client.get(f"/api/finance/balance?date={date.today().isoformat()}",
+                   headers={"Authorization": f"Bearer {seeded['token']}"})
+    [(statement, params)] = queries.matching("FROM finance_ledger", "WHERE")
+    with app.app_context():
+        plan = explain(db.session.connection(), statement, params)
+        # the view's date filter reaches both tables' date indexes
+        assert uses_index(plan, "finance_entries") and uses_index(plan, "expenditures"), "\n".join(plan)
+        db.session.rollback()
@@ -0,0 +1,76 @@
+# tests/test_replica.py
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import REPLICA_BIND, db
+from app.models import Child, SundayClass, User
+from app.replica import STICKY_COOKIE, replica_reads
+from config import TestConfig
+from tests.conftest import PASSWORD_HASH
+
+
+@pytest.fixture
+def replicated(tmp_path):
+    """
+    Primary and replica as two SQLite files. Nothing copies rows between
+    them, which stands in for replication lag: a row only on the replica
+    proves a read went there.
+    """
+    class ReplicaConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.sqlite'}"
+        SQLALCHEMY_BINDS = {REPLICA_BIND: f"sqlite:///{tmp_path / 'replica.sqlite'}"}
+
+    app = create_app(ReplicaConfig)
+    app.config["SNAPSHOT_FOLDER"] = str(tmp_path / "snapshots")
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+        admin = User(username="admin", role="admin", must_change_password=False, password_hash=PASSWORD_HASH)
+        db.session.add_all([admin, SundayClass(id=1, name="Beginners", min_age=3, max_age=5)])
+        db.session.commit()
+        token = create_access_token(identity=str(admin.id))
+        with db.engines[REPLICA_BIND].begin() as conn:
+            conn.execute(SundayClass.__table__.insert(), {"id": 1, "name": "Beginners", "min_age": 3, "max_age": 5})
+            conn.execute(Child.__table__.insert(), {"id": 1, "name": "Only On Replica", "age": 4, "class_id": 1})
+    yield app, {"Authorization": f"Bearer {token}"}
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    # init_app registered an (empty) metadata for the bind on the shared db;
+    # apps without a replica would otherwise try to create_all() on it
+    db.metadatas.pop(REPLICA_BIND, None)
+
+
+def _names(resp):
+    return [c["name"] for c in resp.get_json()]
+
+
+def test_gets_read_from_the_replica(replicated):
+    app, _ = replicated
+    client = app.test_client()
+    assert _names(client.get("/api/children/")) == ["Only On Replica"]
+
+
+def test_writes_go_to_the_primary_and_stick(replicated):
+    app, headers = replicated
+    client = app.test_client()
+    resp = client.post("/api/children/", json={"name": "New Child", "age": 4}, headers=headers)
+    assert resp.status_code == 201
+    assert client.get_cookie(STICKY_COOKIE) is not None
+
+    # read-your-writes: the same client now reads the primary
+    assert _names(client.get("/api/children/")) == ["New Child"]
+    # other clients keep reading the (lagging) replica
+    assert _names(app.test_client().get("/api/children/")) == ["Only On Replica"]
+
+
+def test_replica_reads_outside_requests(replicated):
+    app, _ = replicated
+    with app.app_context():
+        assert Child.query.count() == 0
+        with replica_reads():
+            assert [c.name for c in Child.query] == ["Only On Replica"]
+        db.session.add(Child(name="Written", age=4, class_id=1))
+        db.session.flush()
+        with replica_reads():
+            assert [c.name for c in Child.query] == ["Written"]  # this session wrote: stay on the primary
@@ -0,0 +1,90 @@
+# tests/test_responses.py
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from app.compression import brotli
+from app.diagnostics import QueryCounter
+
+
+def test_json_provider_serializes_decimal_and_dates(app):
+    with app.app_context():
+        body = app.json.dumps({"amount": Decimal("12.50"), "day": date(2026, 3, 1),
+                               "at": datetime(2026, 3, 1, 9, 30)})
+    assert json.loads(body) == {"amount": 12.5, "day": "2026-03-01", "at": "2026-03-01T09:30:00"}
+
+
+def test_large_list_is_gzipped_when_accepted(client, seeded):
+    plain = client.get("/api/finance/all", headers={"Authorization": f"Bearer {seeded['token']}"})
+    packed = client.get("/api/finance/all", headers={
+        "Authorization": f"Bearer {seeded['token']}", "Accept-Encoding": "gzip",
+    })
+    assert "Content-Encoding" not in plain.headers
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in packed.headers["Vary"]
+    assert json.loads(gzip.decompress(packed.data)) == plain.get_json()
+    assert len(packed.data) * 4 < len(plain.data)
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli not installed")
+def test_brotli_preferred_when_offered(client, seeded):
+    resp = client.get("/api/children/", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(resp.data))
+
+
+def test_small_responses_are_not_compressed(client):
+    resp = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+
+
+@pytest.mark.parametrize("path", [
+    "/api/children/",
+    "/api/children/attendance?start=2000-01-01&end=2100-01-01",
+    "/api/children/offerings",
+    "/api/visitors",
+    "/api/members",
+])
+def test_columns_format_matches_object_format(client, seeded, path):
+    objects = client.get(path).get_json()
+    sep = "&" if "?" in path else "?"
+    table = client.get(f"{path}{sep}format=columns").get_json()
+    assert objects, path
+    assert [dict(zip(table["columns"], row)) for row in table["rows"]] == objects
+
+
+def test_fields_narrow_the_select(client, seeded):
+    with QueryCounter() as queries:
+        items = client.get("/api/children/?fields=id,class_name").get_json()
+    assert items and all(set(item) == {"id", "class_name"} for item in items)
+    assert "parent_contact" not in queries.statements[0]
+
+
+def test_fields_load_only_orm_columns(client, auth_headers):
+    with QueryCounter() as queries:
+        missions = client.get("/api/missions?fields=id,title", headers=auth_headers).get_json()
+    assert missions and all(set(m) == {"id", "title"} for m in missions)
+    assert queries.count == 1
+    assert "location" not in queries.statements[0]
+
+
+def test_teacher_list_leaves_out_bio_unless_asked(client, auth_headers):
+    with QueryCounter() as queries:
+        teachers = client.get("/api/teachers", headers=auth_headers).get_json()
+    assert teachers and all("bio" not in t for t in teachers)
+    listing, = queries.matching("WHERE users.role")
+    assert "users.bio" not in listing[0]
+    teachers = client.get("/api/teachers?fields=id,bio", headers=auth_headers).get_json()
+    assert all(set(t) == {"id", "bio"} for t in teachers)
+
+
+def test_unknown_field_is_rejected(client, seeded):
+    resp = client.get("/api/visitors?fields=id,password")
+    assert resp.status_code == 400
+    assert "password" in resp.get_json()["error"]
+    for path in ("/api/events?fields=bogus",
+                 "/api/children/attendance?start=2026-01-01&end=2026-12-31&fields=bogus"):
+        resp = client.get(path)
+        assert resp.status_code == 400, path
+        assert "bogus" in resp.get_json()["error"]
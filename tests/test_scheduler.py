@@ -0,0 +1,90 @@
+# tests/test_scheduler.py
+from datetime import datetime
+import pytest
+from app import scheduler
+from app.models import ScheduledRun
+from app.scheduler import Cron
+
+
+@pytest.fixture
+def broken_schedule():
+    """A failing schedule, registered for one test only."""
+    def broken():
+        raise RuntimeError("disk full")
+
+    scheduler.periodic("tests.broken", "0 0 1 1 *")(broken)
+    yield "tests.broken"
+    scheduler.SCHEDULES.pop("tests.broken", None)
+
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("*/15 * * * *", datetime(2026, 10, 21, 9, 7, 30), datetime(2026, 10, 21, 9, 15)),
+    ("0 4 * * 0", datetime(2026, 10, 21, 9, 7), datetime(2026, 10, 25, 4, 0)),   # Wed -> Sun
+    ("30 3 * * 1-5", datetime(2026, 10, 23, 3, 30), datetime(2026, 10, 26, 3, 30)),  # Fri -> Mon
+    ("0 0 1,15 * 1", datetime(2026, 10, 1, 0, 0), datetime(2026, 10, 5, 0, 0)),  # either day field
+    ("0 12 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29, 12, 0)),
+])
+def test_cron_next_after(expression, after, expected):
+    assert Cron(expression).next_after(after) == expected
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "0 0 * 13 *", "*/0 * * * *"])
+def test_cron_rejects_bad_expressions(expression):
+    with pytest.raises(ValueError):
+        Cron(expression)
+
+
+def test_each_tick_runs_once(app):
+    tick = datetime(2026, 10, 25, 4, 0)
+    with app.app_context():
+        first = scheduler.run_job("classes.reassign", tick)
+        assert first.status == "done"
+        assert scheduler.run_job("classes.reassign", tick) is None  # another worker's turn lost
+        assert ScheduledRun.query.filter_by(name="classes.reassign").count() == 1
+
+
+def test_failures_are_recorded(app, broken_schedule):
+    with app.app_context():
+        run = scheduler.run_job(broken_schedule, trigger="manual")
+        assert (run.status, run.error, run.trigger) == ("failed", "RuntimeError: disk full", "manual")
+        assert run.finished_at is not None
+
+
+def test_schedules_endpoint(app, client, auth_headers):
+    app.config["SCHEDULES"] = {"homepage.rebuild": None}
+    with app.app_context():
+        scheduler.run_job("history.prune", trigger="manual")
+    listed = {s["name"]: s for s in client.get("/api/jobs/schedules", headers=auth_headers).get_json()}
+    assert listed["homepage.rebuild"]["cron"] is None
+    assert listed["history.prune"]["runs"][0]["status"] == "done"
+    assert listed["classes.reassign"]["next_run"].endswith("04:00:00")
+
+
+def test_worker_warns_when_schedules_go_unrun(app):
+    result = app.test_cli_runner(mix_stderr=False).invoke(args=["worker", "--burst", "--threads", "1"])
+    assert result.exit_code == 0, result.output
+    assert "schedule(s) active but this worker does not run them (--burst)" in result.stderr
+
+    app.config["SCHEDULES"] = {name: None for name in scheduler.SCHEDULES}
+    result = app.test_cli_runner(mix_stderr=False).invoke(args=["worker", "--burst", "--threads", "1"])
+    assert "Warning" not in result.stderr
+
+
+def test_orphan_uploads_are_opt_in_and_only_moved_aside(app, tmp_path):
+    import os
+
+    assert "uploads.prune_orphans" not in scheduler.active_schedules(app)
+    app.config.update(BASE_UPLOAD_FOLDER=str(tmp_path / "uploads"), CHILDREN_UPLOAD_FOLDER=str(tmp_path / "rosters"),
+                      UPLOADS_QUARANTINE_FOLDER=str(tmp_path / "quarantine"), UPLOADS_ORPHAN_GRACE_HOURS=0)
+    os.makedirs(tmp_path / "uploads")
+    (tmp_path / "uploads" / "mid-week service.png").write_bytes(b"png")
+
+    with app.app_context():
+        report = scheduler.run_job("uploads.prune_orphans", trigger="manual")
+        assert report.result == {"action": "report", "orphans": ["mid-week service.png"]}
+        assert (tmp_path / "uploads" / "mid-week service.png").exists()
+
+        app.config["UPLOADS_ORPHAN_ACTION"] = "quarantine"
+        moved = scheduler.run_job("uploads.prune_orphans", trigger="manual").result
+    assert not (tmp_path / "uploads" / "mid-week service.png").exists()
+    assert open(os.path.join(moved["moved_to"], "mid-week service.png"), "rb").read() == b"png"
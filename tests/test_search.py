@@ -0,0 +1,55 @@
+# tests/test_search.py
+from app.extensions import db
+from app.models import Child, Visitor
+
+
+def _search(client, auth_headers, q, **params):
+    resp = client.get("/api/search", query_string={"q": q, **params}, headers=auth_headers)
+    assert resp.status_code == 200
+    return resp.get_json()["items"]
+
+
+def _add(app, *rows):
+    with app.app_context():
+        db.session.add_all(rows)
+        db.session.commit()
+        return [row.id for row in rows]
+
+
+def test_search_requires_a_token(client):
+    assert client.get("/api/search?q=xolani").status_code == 401
+
+
+def test_closer_names_rank_first(app, client, auth_headers):
+    _add(app, Visitor(full_name="Xolani Quaye", phone="0700000001"),
+         Visitor(full_name="Grace Xolani Ntombi Quaye Otieno", phone="0700000002"),
+         Child(name="Peter Odhiambo", age=8))
+    hits = _search(client, auth_headers, "xolani quaye")
+    assert [h["name"] for h in hits] == ["Xolani Quaye", "Grace Xolani Ntombi Quaye Otieno"]
+    assert hits[0]["score"] >= hits[1]["score"]
+    assert hits[0]["type"] == "visitor" and hits[0]["detail"] == "0700000001"
+    assert _search(client, auth_headers, "xolani", types="child") == []
+
+
+def test_short_terms_fall_back_to_like(app, client, auth_headers):
+    _add(app, Visitor(full_name="Qi Mwangi"), Visitor(full_name="Qiana Mwangi"), Visitor(full_name="Ann Otieno"))
+    # "qi" is under the trigram tokenizer's three characters
+    assert [h["name"] for h in _search(client, auth_headers, "qi")] == ["Qi Mwangi", "Qiana Mwangi"]
+
+
+def test_triggers_follow_inserts_updates_and_deletes(app, client, auth_headers):
+    [visitor_id] = _add(app, Visitor(full_name="Yaretzi Quispe", phone="0711"))
+    assert [h["id"] for h in _search(client, auth_headers, "yaretzi")] == [visitor_id]
+
+    with app.app_context():
+        visitor = db.session.get(Visitor, visitor_id)
+        visitor.full_name, visitor.phone = "Yaretzi Quarshie", "0722"
+        db.session.commit()
+    assert _search(client, auth_headers, "quispe") == []
+    hits = _search(client, auth_headers, "yaretzi")
+    assert [(h["name"], h["detail"]) for h in hits] == [("Yaretzi Quarshie", "0722")]
+
+    with app.app_context():
+        db.session.delete(db.session.get(Visitor, visitor_id))
+        db.session.commit()
+    assert _search(client, auth_headers, "yaretzi") == []
@@ -0,0 +1,47 @@
+# tests/test_snapshots.py
+import gzip
+import os
+from app.diagnostics import QueryCounter
+from app.extensions import db
+from app.models import HomeMedia
+from app.snapshots import HOMEPAGE_SECTIONS
+
+
+def test_homepage_matches_the_individual_endpoints(client, seeded):
+    document = client.get("/api/homepage").get_json()
+    assert set(document) == set(HOMEPAGE_SECTIONS)
+    assert document["events"] == client.get("/api/events").get_json()
+    assert document["programs"] == client.get("/api/programs/").get_json()
+    assert document["gallery_featured"] == client.get("/api/gallery/featured").get_json()
+
+
+def test_homepage_is_served_from_disk_with_etag(client, seeded):
+    client.get("/api/homepage")  # first request builds the snapshot
+    with QueryCounter() as queries:
+        plain = client.get("/api/homepage")
+        packed = client.get("/api/homepage", headers={"Accept-Encoding": "gzip"})
+        cached = client.get("/api/homepage", headers={"If-None-Match": plain.headers["ETag"]})
+        switched = client.get("/api/homepage", headers={"If-None-Match": packed.headers["ETag"]})
+    assert queries.count == 0
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(packed.data) == plain.data
+    assert packed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+    assert cached.status_code == 304 and not cached.data
+    # a gzip copy still validates without Accept-Encoding, and keeps its own tag
+    assert switched.status_code == 304 and switched.headers["ETag"] == packed.headers["ETag"]
+
+
+def test_write_rebuilds_snapshot_and_prunes_old_versions(app, client, seeded):
+    before = client.get("/api/homepage")
+    with app.app_context():
+        db.session.add(HomeMedia(headline="Easter", media_type="image",
+                                 file_url="https://example.com/easter.jpg", is_featured=True))
+        db.session.commit()
+    folder = app.config["SNAPSHOT_FOLDER"]
+    with QueryCounter() as queries:
+        after = client.get("/api/homepage")
+    assert queries.count == 0
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert [m["headline"] for m in after.get_json()["featured_media"]] == ["Easter"]
+    versions = {name.split(".")[0] for name in os.listdir(folder) if name.startswith("homepage-")}
+    assert len(versions) <= 2
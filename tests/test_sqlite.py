@@ -0,0 +1,79 @@
+# tests/test_sqlite.py
+import sqlite3
+import threading
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from app.extensions import db
+from app.models import Child, User
+from app.sqlite import PRAGMAS
+from app.synthetic import generate
+from config import TestConfig
+from tests.conftest import PASSWORD_HASH
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    path = tmp_path / "cm.sqlite"
+
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLITE_PRAGMAS = dict(PRAGMAS, busy_timeout=50)  # give up on the lock quickly
+        SQLITE_RETRY_DELAY = 0.05
+
+    app = create_app(FileConfig)
+    app.config["SNAPSHOT_FOLDER"] = str(tmp_path / "snapshots")
+    with app.app_context():
+        db.create_all()
+        generate(children=5, years=0, teachers=1, visitors=0, members=0, new_members=0, events=0, seed=3)
+        admin = User(username="admin", role="admin", must_change_password=False, password_hash=PASSWORD_HASH)
+        db.session.add(admin)
+        db.session.commit()
+        app.test_state = {
+            "headers": {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"},
+            "child_id": db.session.query(Child.id).first()[0],
+        }
+    yield app, path
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_connections_get_the_profile(file_app):
+    app, _ = file_app
+    with app.app_context():
+        pragma = lambda name: db.session.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == 50
+        assert pragma("cache_size") == PRAGMAS["cache_size"]
+
+
+def _hold_write_lock(path, seconds):
+    blocker = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    blocker.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(seconds, lambda: (blocker.execute("COMMIT"), blocker.close()))
+    release.start()
+    return release
+
+
+def test_locked_write_is_retried(file_app):
+    app, path = file_app
+    client = app.test_client()
+    release = _hold_write_lock(path, 0.2)  # longer than busy_timeout, shorter than the backoff
+    resp = client.post(f"/api/children/{app.test_state['child_id']}/attendance",
+                       json={"present": True}, headers=app.test_state["headers"])
+    release.join()
+    assert resp.status_code == 201
+
+
+def test_locked_write_fails_without_retries(file_app):
+    app, path = file_app
+    app.config["SQLITE_WRITE_RETRIES"] = 0
+    client = app.test_client()
+    release = _hold_write_lock(path, 0.2)
+    with pytest.raises(OperationalError, match="database is locked"):
+        client.post(f"/api/children/{app.test_state['child_id']}/attendance",
+                    json={"present": True}, headers=app.test_state["headers"])
+    release.join()
@@ -0,0 +1,18 @@
+# tests/test_startup.py
+import os
+import subprocess
+import sys
+
+HEAVY = ("docx", "openpyxl", "reportlab", "cloudinary")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_create_app_does_not_import_heavy_libraries():
+    # a fresh interpreter: this test process may already have them loaded
+    code = (
+        "import sys; from app import create_app; from config import TestConfig; "
+        "create_app(TestConfig); "
+        f"print('loaded=' + ','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert "loaded=\n" in proc.stdout, proc.stdout
@@ -0,0 +1,100 @@
+# tests/test_sync.py
+from datetime import date
+from app.diagnostics import QueryCounter
+
+
+def _sync(client, auth_headers, since=None, tables=None):
+    params = []
+    if since is not None:
+        params.append(f"since={since}")
+    if tables:
+        params.append(f"tables={tables}")
+    resp = client.get("/api/sync?" + "&".join(params), headers=auth_headers)
+    assert resp.status_code == 200
+    return resp.get_json()
+
+
+def test_first_sync_is_a_full_copy(client, auth_headers):
+    data = _sync(client, auth_headers)
+    children = data["changes"]["children"]
+    assert children["reset"] and len(children["upserts"]) == 40
+    assert all("updated_at" in row for row in children["upserts"])
+    assert set(data["changes"]) == {"sunday_classes", "children", "attendance", "offerings"}
+
+
+def test_delta_carries_only_changed_rows_and_tombstones(client, auth_headers):
+    token = _sync(client, auth_headers)["token"]
+
+    client.patch("/api/children/3", json={"name": "Renamed Child"}, headers=auth_headers)
+    client.delete("/api/children/5", headers=auth_headers)
+    client.post("/api/children/7/attendance", json={"date": date.today().isoformat()}, headers=auth_headers)
+
+    with QueryCounter() as queries:
+        data = _sync(client, auth_headers, since=token)
+    assert queries.count <= 6, "\n\n".join(queries.statements)
+    children, attendance = data["changes"]["children"], data["changes"]["attendance"]
+    assert not children["reset"]
+    assert [row["name"] for row in children["upserts"]] == ["Renamed Child"]
+    assert children["deletes"] == [5]
+    assert [(row["child_id"], row["present"]) for row in attendance["upserts"]] == [(7, True)]
+    assert data["changes"]["offerings"] == {"reset": False, "upserts": [], "deletes": []}
+
+    again = _sync(client, auth_headers, since=data["token"])
+    assert all(not t["upserts"] and not t["deletes"] for t in again["changes"].values())
+    assert again["token"] == data["token"]
+
+
+def test_bulk_writes_and_foreign_tokens_reset(app, client, auth_headers):
+    from app import changes
+    from app.extensions import db
+
+    token = int(_sync(client, auth_headers)["token"])
+    with app.app_context():
+        changes.record_bulk("offerings")
+        db.session.commit()
+    data = _sync(client, auth_headers, since=token)
+    assert data["changes"]["offerings"]["reset"] and not data["changes"]["children"]["reset"]
+
+    ahead = _sync(client, auth_headers, since=token + 1000, tables="children")
+    assert list(ahead["changes"]) == ["children"] and ahead["changes"]["children"]["reset"]
+
+
+def test_bad_sync_requests(client, auth_headers):
+    assert client.get("/api/sync?since=abc", headers=auth_headers).status_code == 400
+    assert client.get("/api/sync?tables=users", headers=auth_headers).status_code == 400
+    assert client.get("/api/sync").status_code == 401
+
+
+def test_recent_rows_are_read_again_until_settled(app, client, auth_headers):
+    token = _sync(client, auth_headers)["token"]
+    app.config["CHANGE_LOG_SETTLE_SECONDS"] = 60
+    client.patch("/api/children/3", json={"name": "Renamed Child"}, headers=auth_headers)
+
+    first = _sync(client, auth_headers, since=token)
+    assert first["token"] == token  # the rename is not settled yet: the token stays behind it
+    again = _sync(client, auth_headers, since=first["token"])
+    assert [row["name"] for row in again["changes"]["children"]["upserts"]] == ["Renamed Child"]
+
+    app.config["CHANGE_LOG_SETTLE_SECONDS"] = 0
+    settled = _sync(client, auth_headers, since=again["token"])
+    assert int(settled["token"]) > int(token)
+    assert not _sync(client, auth_headers, since=settled["token"])["changes"]["children"]["upserts"]
+
+
+def test_pruned_log_resets_older_tokens(app, client, auth_headers):
+    from datetime import datetime, timedelta
+    from app import changes
+    from app.extensions import db
+
+    old = int(_sync(client, auth_headers)["token"])
+    client.patch("/api/children/3", json={"name": "Renamed Child"}, headers=auth_headers)
+    client.patch("/api/children/4", json={"name": "Other Child"}, headers=auth_headers)
+    with app.app_context():
+        assert changes.prune(datetime.utcnow() + timedelta(seconds=1)) > 0
+        db.session.commit()
+        oldest, _, newest = changes.bounds()
+    assert oldest == newest
+
+    assert _sync(client, auth_headers, since=old, tables="children")["changes"]["children"]["reset"]
+    recent = _sync(client, auth_headers, since=oldest - 1, tables="children")["changes"]["children"]
+    assert not recent["reset"] and [row["name"] for row in recent["upserts"]] == ["Other Child"]
@@ -0,0 +1,30 @@
+# tests/test_synthetic.py
+from datetime import date
+from sqlalchemy import select
+from app import create_app
+from app.extensions import db
+from app.models import Child, FinanceEntry
+from app.synthetic import END, generate
+from config import TestConfig
+
+
+def _dataset(**kwargs):
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        generate(children=20, years=0.2, teachers=2, visitors=3, members=3, new_members=2, events=2, seed=5, **kwargs)
+        children = db.session.execute(select(Child.name, Child.age, Child.date_of_birth, Child.created_at)).all()
+        finance = db.session.execute(select(FinanceEntry.date, FinanceEntry.main_church)).all()
+        db.session.remove()
+        db.drop_all()
+    return children, finance
+
+
+def test_same_seed_same_data_on_any_day():
+    children, finance = _dataset()
+    assert (children, finance) == _dataset()
+    assert max(day for day, _ in finance) == END  # every date counts back from the fixed anchor
+    assert all(created.date() == END for *_, created in children)
+
+    _, later = _dataset(end=date(2027, 1, 3))
+    assert max(day for day, _ in later) == date(2027, 1, 3)